@@ -1,9 +1,10 @@
 // This file is the entry point for the Node.js package. It contains the logic for generating PDFs using Puppeteer.
 
 const puppeteer = require("puppeteer");
+const readline = require("readline");
 
-async function generatePDF(htmlPath, pdfPath) {
-  const browser = await puppeteer.launch({
+function launchBrowser() {
+  return puppeteer.launch({
     args: [
       "--no-sandbox",
       "--disable-setuid-sandbox",
@@ -13,11 +14,56 @@ async function generatePDF(htmlPath, pdfPath) {
     headless: true,
     executablePath: process.env.PUPPETEER_EXECUTABLE_PATH,
   });
+}
+
+// "load" is enough for documents whose assets are inlined; networkidle0 adds
+// at least 500ms of idle waiting and is kept for documents with remote assets.
+const WAIT_CONDITIONS = ["load", "domcontentloaded", "networkidle0", "networkidle2"];
+
+function waitCondition(waitUntil) {
+  return WAIT_CONDITIONS.includes(waitUntil) ? waitUntil : "networkidle0";
+}
+
+// Inlined fonts are decoded asynchronously after "load"
+function fontsReady(page) {
+  return page.evaluate(() => document.fonts.ready.then(() => undefined));
+}
+
+// Produce several outputs from one loaded page, keyed by target name:
+//   {"name": "pdf:letter", "type": "pdf", "options": {"format": "letter"}}
+//   {"name": "thumbnail", "type": "screenshot", "viewport": {"width", "height", "deviceScaleFactor"}}
+// Screenshots show the first page-sized area of the document in print media.
+async function renderOutputs(page, targets) {
+  const outputs = {};
+  for (const target of targets) {
+    if (target.type === "screenshot") {
+      const { width, height } = target.viewport;
+      await page.emulateMediaType("print");
+      await page.setViewport(target.viewport);
+      outputs[target.name] = await page.screenshot({
+        type: "png",
+        clip: { x: 0, y: 0, width, height },
+      });
+    } else {
+      outputs[target.name] = await page.pdf({
+        format: "A4",
+        printBackground: true,
+        timeout: 60000,
+        ...(target.options || {}),
+      });
+    }
+  }
+  return outputs;
+}
+
+async function generatePDF(htmlPath, pdfPath, waitUntil) {
+  const browser = await launchBrowser();
   const page = await browser.newPage();
   await page.goto("file://" + htmlPath, {
-    waitUntil: "networkidle0",
+    waitUntil: waitCondition(waitUntil),
     timeout: 60000,
   });
+  await fontsReady(page);
   await page.pdf({
     path: pdfPath,
     format: "A4",
@@ -27,20 +73,118 @@ async function generatePDF(htmlPath, pdfPath) {
   await browser.close();
 }
 
-module.exports = { generatePDF };
+// Persistent worker: one browser serves many jobs read as JSON lines from stdin.
+// Request:  {"id": 1, "html": "<html>...", "path": "/out.pdf", "waitUntil": "load", "options": {...}}
+// Response: {"id": 1, "ok": true, "pdf": "<base64, only when no path>"}
+// A job with "targets" (see renderOutputs) is answered with {"id": 1, "ok": true, "outputs": {name: base64}}
+//           {"id": 1, "ok": false, "error": "..."}
+async function serve(concurrency) {
+  const browser = await launchBrowser();
+  const queue = [];
+  let active = 0;
+  let closing = false;
+
+  const reply = (message) => process.stdout.write(JSON.stringify(message) + "\n");
+
+  async function handle(job) {
+    const page = await browser.newPage();
+    try {
+      await page.setContent(job.html, {
+        waitUntil: waitCondition(job.waitUntil),
+        timeout: 60000,
+      });
+      await fontsReady(page);
+      if (job.targets) {
+        const outputs = await renderOutputs(page, job.targets);
+        for (const name of Object.keys(outputs)) {
+          outputs[name] = Buffer.from(outputs[name]).toString("base64");
+        }
+        reply({ id: job.id, ok: true, outputs });
+        return;
+      }
+      const pdf = await page.pdf({
+        format: "A4",
+        printBackground: true,
+        timeout: 60000,
+        ...(job.options || {}),
+        path: job.path || undefined,
+      });
+      const message = { id: job.id, ok: true };
+      if (!job.path) {
+        message.pdf = Buffer.from(pdf).toString("base64");
+      }
+      reply(message);
+    } catch (err) {
+      reply({ id: job.id, ok: false, error: String((err && err.message) || err) });
+    } finally {
+      await page.close().catch(() => {});
+    }
+  }
+
+  async function shutdown() {
+    if (closing && active === 0 && queue.length === 0) {
+      await browser.close();
+      process.exit(0);
+    }
+  }
+
+  function pump() {
+    while (active < concurrency && queue.length > 0) {
+      const job = queue.shift();
+      active++;
+      handle(job).finally(() => {
+        active--;
+        pump();
+        shutdown();
+      });
+    }
+  }
+
+  const input = readline.createInterface({ input: process.stdin });
+  input.on("line", (line) => {
+    if (!line.trim()) return;
+    let job;
+    try {
+      job = JSON.parse(line);
+    } catch (err) {
+      console.error("Invalid job:", err.message);
+      return;
+    }
+    queue.push(job);
+    pump();
+  });
+  input.on("close", () => {
+    closing = true;
+    shutdown();
+  });
+}
+
+module.exports = { generatePDF, renderOutputs, serve, waitCondition };
 
 // CLI usage
 if (require.main === module) {
-  const [, , htmlPath, pdfPath] = process.argv;
-  if (!htmlPath || !pdfPath) {
-    console.error("Usage: node index.js <input.html> <output.pdf>");
-    process.exit(1);
-  }
+  const args = process.argv.slice(2);
 
-  generatePDF(htmlPath, pdfPath)
-    .then(() => console.log("PDF generated:", pdfPath))
-    .catch((err) => {
-      console.error("Error generating PDF:", err);
+  if (args[0] === "--serve") {
+    const index = args.indexOf("--concurrency");
+    const concurrency = index >= 0 ? parseInt(args[index + 1], 10) || 1 : 4;
+    serve(concurrency).catch((err) => {
+      console.error("Error starting PDF worker:", err);
       process.exit(1);
     });
+  } else {
+    const [htmlPath, pdfPath, waitUntil] = args;
+    if (!htmlPath || !pdfPath) {
+      console.error("Usage: node index.js <input.html> <output.pdf> [waitUntil]");
+      console.error("       node index.js --serve [--concurrency N]");
+      process.exit(1);
+    }
+
+    generatePDF(htmlPath, pdfPath, waitUntil)
+      .then(() => console.log("PDF generated:", pdfPath))
+      .catch((err) => {
+        console.error("Error generating PDF:", err);
+        process.exit(1);
+      });
+  }
 }
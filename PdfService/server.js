@@ -3,6 +3,7 @@ const express = require("express");
 const puppeteer = require("puppeteer");
 const fs = require("fs").promises;
 const path = require("path");
+const { renderOutputs, waitCondition } = require("./index");
 
 const app = express();
 const PORT = process.env.PORT || 3000;
@@ -11,8 +12,8 @@ const PORT = process.env.PORT || 3000;
 // app.use(express.json());
 app.use(express.text({ type: "text/html" }));
 
-async function generatePDF(html, options = {}) {
-  const browser = await puppeteer.launch({
+function launchBrowser() {
+  return puppeteer.launch({
     args: [
       "--no-sandbox",
       "--disable-setuid-sandbox",
@@ -26,13 +27,26 @@ async function generatePDF(html, options = {}) {
     headless: "new",
     executablePath: process.env.PUPPETEER_EXECUTABLE_PATH,
   });
+}
+
+// "load" is enough for documents whose assets are inlined; networkidle0 adds
+// at least 500ms of idle waiting and is kept for documents with remote assets.
+async function loadPage(browser, html, waitUntil) {
+  const page = await browser.newPage();
+  await page.setContent(html, {
+    waitUntil: waitCondition(waitUntil),
+    timeout: 60000,
+  });
+  // Inlined fonts are decoded asynchronously after "load"
+  await page.evaluate(() => document.fonts.ready.then(() => undefined));
+  return page;
+}
+
+async function generatePDF(html, options = {}, waitUntil = "networkidle0") {
+  const browser = await launchBrowser();
 
   try {
-    const page = await browser.newPage();
-    await page.setContent(html, {
-      waitUntil: "networkidle0",
-      timeout: 60000,
-    });
+    const page = await loadPage(browser, html, waitUntil);
 
     const pdfBuffer = await page.pdf({
       format: options.format || "A4",
@@ -47,21 +61,32 @@ async function generatePDF(html, options = {}) {
   }
 }
 
+// Several outputs (paper sizes, thumbnails) from one page load
+async function generateOutputs(html, targets, waitUntil = "networkidle0") {
+  const browser = await launchBrowser();
+  try {
+    const page = await loadPage(browser, html, waitUntil);
+    return await renderOutputs(page, targets);
+  } finally {
+    await browser.close();
+  }
+}
+
 // Health check endpoint
 app.get("/health", (req, res) => {
   res.json({ status: "healthy", service: "PDF Generator" });
 });
 
 // Generate PDF from HTML content
-app.post("/generate-pdf", express.json(), async (req, res) => {
+app.post("/generate-pdf", express.json({ limit: "10mb" }), async (req, res) => {
   try {
-    const { html, options } = req.body;
+    const { html, options, waitUntil } = req.body;
 
     if (!html) {
       return res.status(400).json({ error: "HTML content is required" });
     }
 
-    const pdfBuffer = await generatePDF(html, options);
+    const pdfBuffer = await generatePDF(html, options, waitUntil);
 
     res.setHeader("Content-Type", "application/pdf");
     res.setHeader("Content-Disposition", 'attachment; filename="document.pdf"');
@@ -74,6 +99,29 @@ app.post("/generate-pdf", express.json(), async (req, res) => {
   }
 });
 
+// Generate several outputs from one HTML document; the response holds each as base64
+// Request: {"html": "...", "waitUntil": "load", "targets": [{"name", "type", ...}]}
+app.post("/generate-outputs", express.json({ limit: "10mb" }), async (req, res) => {
+  try {
+    const { html, targets, waitUntil } = req.body;
+
+    if (!html || !Array.isArray(targets) || targets.length === 0) {
+      return res.status(400).json({ error: "HTML content and targets are required" });
+    }
+
+    const outputs = await generateOutputs(html, targets, waitUntil);
+    for (const name of Object.keys(outputs)) {
+      outputs[name] = Buffer.from(outputs[name]).toString("base64");
+    }
+    res.json({ outputs });
+  } catch (error) {
+    console.error("Error generating outputs:", error);
+    res
+      .status(500)
+      .json({ error: "Failed to generate outputs", details: error.message });
+  }
+});
+
 // Generate PDF from HTML file path
 app.post("/generate-pdf-from-file", express.json(), async (req, res) => {
   try {
@@ -106,4 +154,4 @@ app.listen(PORT, () => {
 });
 
 // Export for module usage
-module.exports = { generatePDF };
+module.exports = { generatePDF, generateOutputs };
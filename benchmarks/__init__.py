@@ -0,0 +1 @@
+"""Performance benchmarks for resumegen (run with `python -m benchmarks`)."""
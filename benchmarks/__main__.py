@@ -0,0 +1,160 @@
+"""
+Command line for the benchmark suite.
+
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks run --suite render --quick --compare baseline.json
+    python -m benchmarks compare baseline.json benchmarks/results/latest.json
+"""
+
+import json
+from pathlib import Path
+from typing import Annotated, List
+
+from rich import print
+from rich.markup import escape
+from rich.table import Table
+from typer import Argument, Exit, Option, Typer
+
+from benchmarks.runner import (
+    QUICK_SIZES,
+    SUITES,
+    compare,
+    default_output,
+    has_regressions,
+    run_suites,
+)
+from benchmarks.workloads import SIZES
+
+app = Typer(no_args_is_help=True)
+
+
+def _load(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_report(report: dict) -> None:
+    table = Table(title="Benchmarks")
+    table.add_column("Benchmark")
+    table.add_column("median ms", justify="right")
+    table.add_column("p90 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("ops/s", justify="right")
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            table.add_row(escape(name), "skipped", "", "", "", style="dim")
+            continue
+        rate = result.get("throughput_rps", result.get("ops_per_sec", 0.0))
+        table.add_row(
+            escape(name),
+            f"{result['median_ms']:.3f}",
+            f"{result['p90_ms']:.3f}",
+            f"{result['p99_ms']:.3f}",
+            f"{rate:.1f}",
+        )
+    print(table)
+
+
+def print_comparison(rows: List[dict], threshold: float) -> None:
+    styles = {"regression": "red", "improvement": "green", "missing": "dim", "ok": ""}
+    table = Table(title=f"Comparison (threshold {threshold:.0%})")
+    table.add_column("Benchmark")
+    table.add_column("baseline ms", justify="right")
+    table.add_column("current ms", justify="right")
+    table.add_column("change", justify="right")
+    table.add_column("status")
+    for row in rows:
+        table.add_row(
+            escape(row["name"]),
+            "" if row["baseline"] is None else f"{row['baseline']:.3f}",
+            "" if row["current"] is None else f"{row['current']:.3f}",
+            "" if row["change"] is None else f"{row['change']:+.1%}",
+            row["status"],
+            style=styles[row["status"]],
+        )
+    print(table)
+
+
+@app.command()
+def run(
+    suite: Annotated[
+        List[str] | None,
+        Option(help=f"Suite to run (repeatable): {', '.join(SUITES)}. Defaults to all."),
+    ] = None,
+    size: Annotated[
+        List[str] | None,
+        Option(help=f"Input size (repeatable): {', '.join(SIZES)}. Defaults to all."),
+    ] = None,
+    quick: Annotated[
+        bool,
+        Option("--quick", help="Small inputs and short timings, for smoke runs."),
+    ] = False,
+    min_time: Annotated[
+        float, Option(help="Minimum seconds spent timing each benchmark.")
+    ] = 0.5,
+    api_requests: Annotated[int, Option(help="Requests per API benchmark.")] = 200,
+    api_concurrency: Annotated[int, Option(help="Concurrent API clients.")] = 8,
+    api_output_format: Annotated[
+        str, Option(help="output_format for API requests: html, pdf or both.")
+    ] = "html",
+    output: Annotated[
+        str | None,
+        Option(help="Where to save the JSON results. Defaults to benchmarks/results/<timestamp>.json."),
+    ] = None,
+    compare_to: Annotated[
+        str | None,
+        Option("--compare", help="Baseline results to compare against; exits with 1 on regressions."),
+    ] = None,
+    threshold: Annotated[
+        float, Option(help="Relative slowdown of the median that counts as a regression.")
+    ] = 0.10,
+) -> None:
+    """
+    Run the benchmark suites and save the results as JSON.
+    """
+    suites = suite or list(SUITES)
+    sizes = size or (list(QUICK_SIZES) if quick else list(SIZES))
+    if quick:
+        min_time = min(min_time, 0.1)
+        api_requests = min(api_requests, 20)
+
+    report = run_suites(
+        suites,
+        sizes,
+        min_time=min_time,
+        api_requests=api_requests,
+        api_concurrency=api_concurrency,
+        api_output_format=api_output_format,
+    )
+    output_path = Path(output) if output else default_output()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print_report(report)
+    print(f"Results saved to {output_path}")
+
+    if compare_to is not None:
+        rows = compare(_load(Path(compare_to)), report, threshold)
+        print_comparison(rows, threshold)
+        if has_regressions(rows):
+            raise Exit(code=1)
+
+
+@app.command(name="compare")
+def compare_command(
+    baseline: Annotated[str, Argument(help="Baseline results JSON.")],
+    current: Annotated[str, Argument(help="Results JSON to check.")],
+    threshold: Annotated[
+        float, Option(help="Relative slowdown of the median that counts as a regression.")
+    ] = 0.10,
+) -> None:
+    """
+    Compare two result files and exit with 1 if any benchmark regressed.
+    """
+    rows = compare(_load(Path(baseline)), _load(Path(current)), threshold)
+    print_comparison(rows, threshold)
+    if has_regressions(rows):
+        raise Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
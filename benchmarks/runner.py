@@ -0,0 +1,316 @@
+"""Benchmark measurement, the benchmark suites, and baseline comparison."""
+
+import gc
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from benchmarks.workloads import SIZES, personal_info, scaled_cover_letter, scaled_resume
+
+SUITES = ("validation", "render", "pdf", "api")
+QUICK_SIZES = ("example", "medium")
+
+Result = Dict[str, Any]
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float]) -> Result:
+    return {
+        "rounds": len(samples_ms),
+        "mean_ms": statistics.fmean(samples_ms),
+        "median_ms": statistics.median(samples_ms),
+        "p90_ms": _percentile(samples_ms, 0.90),
+        "p99_ms": _percentile(samples_ms, 0.99),
+        "min_ms": min(samples_ms),
+        "stdev_ms": statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0,
+    }
+
+
+def measure(
+    func: Callable[[], Any],
+    min_time: float = 0.5,
+    min_rounds: int = 5,
+    max_rounds: int = 10_000,
+    warmup: int = 1,
+) -> Result:
+    """
+    Call `func` repeatedly until both `min_time` seconds and `min_rounds`
+    calls have passed, and summarize the per-call durations. The garbage
+    collector is paused during timed calls to reduce noise.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    started = time.perf_counter()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(samples) < max_rounds and (
+            len(samples) < min_rounds or time.perf_counter() - started < min_time
+        ):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    result = summarize(samples)
+    result["ops_per_sec"] = 1000 / result["mean_ms"] if result["mean_ms"] else 0.0
+    return result
+
+
+def _inputs(sizes: Iterable[str]):
+    info = personal_info()
+    for size in sizes:
+        yield size, scaled_resume(SIZES[size]), scaled_cover_letter(SIZES[size]), info
+
+
+def bench_validation(sizes: Iterable[str], min_time: float) -> Dict[str, Result]:
+    from resumegen.utils import (
+        create_cover_letter_with_personal_info,
+        create_resume_with_personal_info,
+    )
+
+    results = {}
+    for size, resume, letter, info in _inputs(sizes):
+        results[f"validation.resume[{size}]"] = measure(
+            lambda: create_resume_with_personal_info(resume, info), min_time
+        )
+        results[f"validation.cover_letter[{size}]"] = measure(
+            lambda: create_cover_letter_with_personal_info(letter, info), min_time
+        )
+    return results
+
+
+def bench_render(sizes: Iterable[str], min_time: float) -> Dict[str, Result]:
+    from resumegen.jinja_render import render_cover_letter, render_resume
+    from resumegen.utils import (
+        create_cover_letter_with_personal_info,
+        create_resume_with_personal_info,
+    )
+
+    results = {}
+    for size, resume, letter, info in _inputs(sizes):
+        resume_model = create_resume_with_personal_info(resume, info)
+        letter_model = create_cover_letter_with_personal_info(letter, info)
+        results[f"render.resume[{size}]"] = measure(lambda: render_resume(resume_model), min_time)
+        results[f"render.cover_letter[{size}]"] = measure(
+            lambda: render_cover_letter(letter_model), min_time
+        )
+    return results
+
+
+def _pdf_backends() -> Dict[str, Callable[[], Any]]:
+    """
+    Factories for every PDF backend that can be configured here. Each factory
+    returns a (convert(html, pdf_path), close()) pair.
+    """
+    from resumegen.pdf_service import (
+        HttpPdfBackend,
+        NodePdfWorker,
+        generate_pdf_subprocess,
+    )
+
+    def subprocess_backend():
+        workdir = Path(tempfile.mkdtemp(prefix="resumegen-bench-"))
+
+        def convert(html_content: str, pdf_path: Path) -> None:
+            html_path = workdir / "input.html"
+            html_path.write_text(html_content, encoding="utf-8")
+            generate_pdf_subprocess(html_path, pdf_path)
+
+        return convert, lambda: shutil.rmtree(workdir, ignore_errors=True)
+
+    def worker_backend():
+        worker = NodePdfWorker(concurrency=1)
+        return worker.render, worker.close
+
+    backends = {"subprocess": subprocess_backend, "node-worker": worker_backend}
+    pdf_service_url = os.getenv("PDF_SERVICE_URL")
+    if pdf_service_url:
+
+        def http_backend():
+            backend = HttpPdfBackend(pdf_service_url, concurrency=1)
+            return backend.render, backend.close
+
+        backends["http"] = http_backend
+    return backends
+
+
+def bench_pdf(sizes: Iterable[str], min_time: float) -> Dict[str, Result]:
+    """
+    Time each PDF backend. Backends that cannot run here (no Node.js, no
+    Chromium, no PDF service) are reported as skipped with the reason.
+    """
+    from resumegen.jinja_render import render_resume
+    from resumegen.utils import create_resume_with_personal_info
+
+    html = {
+        size: render_resume(create_resume_with_personal_info(resume, info))
+        for size, resume, _, info in _inputs(sizes)
+    }
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="resumegen-bench-") as out_dir:
+        pdf_path = Path(out_dir) / "output.pdf"
+        for name, factory in _pdf_backends().items():
+            try:
+                convert, close = factory()
+            except Exception as e:
+                results[f"pdf.{name}"] = {"skipped": str(e)}
+                continue
+            try:
+                for size, content in html.items():
+                    try:
+                        results[f"pdf.{name}[{size}]"] = measure(
+                            lambda: convert(content, pdf_path), min_time, min_rounds=3
+                        )
+                    except Exception as e:
+                        results[f"pdf.{name}[{size}]"] = {"skipped": str(e).strip()[:500]}
+                        break
+            finally:
+                close()
+    return results
+
+
+def bench_api(
+    sizes: Iterable[str],
+    requests: int = 200,
+    concurrency: int = 8,
+    output_format: str = "html",
+) -> Dict[str, Result]:
+    """
+    End-to-end API throughput and latency with an in-process client,
+    `requests` calls spread over `concurrency` threads per input size.
+    """
+    from fastapi.testclient import TestClient
+
+    from resumegen.api import app
+
+    results = {}
+    with TestClient(app) as client:
+        for size, resume, letter, info in _inputs(sizes):
+            for endpoint, payload in (
+                ("/generate-resume", {"resume_data": resume}),
+                ("/generate-cover-letter", {"cover_letter_data": letter}),
+            ):
+                body = dict(payload, personal_info=info, output_format=output_format)
+                client.post(endpoint, json=body)  # Warm up
+
+                def call() -> float:
+                    start = time.perf_counter()
+                    response = client.post(endpoint, json=body)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{endpoint} returned {response.status_code}")
+                    return elapsed
+
+                started = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    latencies = list(pool.map(lambda _: call(), range(requests)))
+                wall = time.perf_counter() - started
+
+                result = summarize(latencies)
+                result["throughput_rps"] = requests / wall
+                result["concurrency"] = concurrency
+                results[f"api{endpoint}[{size}]"] = result
+    return results
+
+
+def run_suites(
+    suites: Iterable[str] = SUITES,
+    sizes: Iterable[str] = tuple(SIZES),
+    min_time: float = 0.5,
+    api_requests: int = 200,
+    api_concurrency: int = 8,
+    api_output_format: str = "html",
+) -> Dict[str, Any]:
+    """
+    Run the selected suites and return a JSON-serializable report.
+    """
+    from resumegen.build_cache import resumegen_version
+
+    sizes = list(sizes)
+    results: Dict[str, Result] = {}
+    for suite in suites:
+        if suite == "validation":
+            results.update(bench_validation(sizes, min_time))
+        elif suite == "render":
+            results.update(bench_render(sizes, min_time))
+        elif suite == "pdf":
+            results.update(bench_pdf(sizes, min_time))
+        elif suite == "api":
+            results.update(
+                bench_api(sizes, api_requests, api_concurrency, api_output_format)
+            )
+        else:
+            raise ValueError(f"Unknown suite: {suite} (choose from {', '.join(SUITES)})")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "resumegen": resumegen_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "suites": list(suites),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    metric: str = "median_ms",
+) -> List[Dict[str, Any]]:
+    """
+    Compare two reports benchmark by benchmark.
+
+    Each row has the benchmark name, both values, the relative change and a
+    status: "regression" when `metric` grew by more than `threshold`,
+    "improvement" when it shrank by more than `threshold`, otherwise "ok".
+    Benchmarks missing or skipped on either side are reported as "missing".
+    """
+    rows = []
+    baseline_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    for name in sorted(set(baseline_results) | set(current_results)):
+        before = baseline_results.get(name, {}).get(metric)
+        after = current_results.get(name, {}).get(metric)
+        row: Dict[str, Any] = {"name": name, "baseline": before, "current": after}
+        if before is None or after is None or before <= 0:
+            row.update(change=None, status="missing")
+        else:
+            change = after / before - 1
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improvement"
+            else:
+                status = "ok"
+            row.update(change=change, status=status)
+        rows.append(row)
+    return rows
+
+
+def has_regressions(rows: List[Dict[str, Any]]) -> bool:
+    return any(row["status"] == "regression" for row in rows)
+
+
+def default_output(directory: Optional[Path] = None) -> Path:
+    directory = directory or Path(__file__).parent / "results"
+    return directory / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
@@ -0,0 +1,65 @@
+"""Synthetic inputs of scaling size, derived from the example data files."""
+
+import copy
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+DATA_PATH = Path(__file__).parent.parent / "data"
+
+# Entries per list section: the examples as-is, then progressively larger resumes
+SIZES = {"example": None, "medium": 20, "large": 100, "huge": 400}
+
+
+def load_example(name: str) -> Dict[str, Any]:
+    with open(DATA_PATH / f"{name}_example.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _repeat(entries: list, count: int) -> list:
+    """
+    Cycle through `entries` until there are `count`, numbering the copies so
+    every entry is distinct (no accidental caching of identical values).
+    """
+    repeated = []
+    for i in range(count):
+        entry = copy.deepcopy(entries[i % len(entries)])
+        if i >= len(entries) and isinstance(entry, str):
+            entry = f"{entry} ({i})"
+        elif i >= len(entries) and isinstance(entry, dict):
+            for key, value in entry.items():
+                if isinstance(value, str) and value:
+                    entry[key] = f"{value} ({i})"
+                    break
+        repeated.append(entry)
+    return repeated
+
+
+def scaled_resume(entries: int | None) -> Dict[str, Any]:
+    """
+    The example resume with every list section grown to `entries` items
+    (unchanged for None).
+    """
+    resume = load_example("resume")
+    if entries is None:
+        return resume
+    for key, value in resume.items():
+        if isinstance(value, list) and value:
+            resume[key] = _repeat(value, entries)
+    return resume
+
+
+def scaled_cover_letter(paragraphs: int | None) -> Dict[str, Any]:
+    """
+    The example cover letter with `paragraphs` body paragraphs (unchanged for None).
+    """
+    letter = load_example("cover_letter")
+    if paragraphs is None:
+        return letter
+    body = letter.get("body_paragraphs") or [letter["opening_paragraph"]]
+    letter["body_paragraphs"] = _repeat(body, paragraphs)
+    return letter
+
+
+def personal_info() -> Dict[str, Any]:
+    return load_example("personal_info")
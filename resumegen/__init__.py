@@ -1,5 +1,38 @@
 # ResumeGen/resumegen/__init__.py
 
 # This file initializes the Python package for ResumeGen.
+# Submodules and the CLI commands are loaded lazily on first access (PEP 562),
+# so `import resumegen` stays cheap for the API, worker processes and the CLI.
 
-from resumegen.cli import generate_resume, generate_cover_letter
+import importlib
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _submodules() -> frozenset:
+    """Every module and subpackage of the package, so new ones need no registration here"""
+    import pkgutil  # Imports inspect; only paid when a submodule is looked up
+
+    return frozenset(module.name for module in pkgutil.iter_modules(__path__))
+
+
+_LAZY_ATTRIBUTES = {
+    "generate_resume": "resumegen.cli",
+    "generate_cover_letter": "resumegen.cli",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    if name in _submodules():
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _submodules() | set(_LAZY_ATTRIBUTES))
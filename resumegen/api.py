@@ -1,178 +1,972 @@
 # Resume Generation API Server
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
-from pydantic import BaseModel
-from typing import Optional
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, BeforeValidator, Field, ValidationError, WrapValidator
+from typing import Annotated, Optional, Callable, Any, Dict, List, Tuple, Union
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from functools import lru_cache
+import anyio
+import anyio.from_thread
+import asyncio
+import json
 import os
-from pathlib import Path
 import tempfile
-import uuid
+import threading
+import time
+import weakref
 import base64
 
-from resumegen.jinja_render import render_resume, render_cover_letter
+from resumegen.artifacts import ArtifactStore, artifact_store_from_env, map_file
+from resumegen.cache import pdf_cache_key, result_cache_from_env
+from resumegen.compression import CompressionMiddleware
+from resumegen.jinja_render import preload, render_resume, render_cover_letter
+from resumegen import memory
+from resumegen.metrics import (
+    CONTENT_TYPE_LATEST,
+    INFLIGHT_RENDERS,
+    PDF_ERRORS,
+    QUEUE_DEPTH,
+    REGISTRY,
+    REQUEST_SECONDS,
+    REQUESTS,
+    REQUEST_PEAK_MEMORY,
+    RESPONSE_BYTES,
+)
 from resumegen.models.resume import Resume
 from resumegen.models.cover_letter import CoverLetter
 from resumegen.models.personal_info import PersonalInfo
-from resumegen.pdf_service import generate_pdf
-from resumegen.utils import create_resume_with_personal_info, create_cover_letter_with_personal_info
+from resumegen.outputs import OutputTarget, is_legacy, parse_targets
+from resumegen.pdf_service import generate_pdf, open_pdf_backend, pdf_backend_name
+from resumegen import pdf_optimize
+from resumegen import profiling
+from resumegen.profiling import ProfilingMiddleware, run_profiled
+from resumegen.storage import check_output_name, open_sink
+from resumegen.timings import Timings, server_timing_header, stage
+from resumegen.variants import Variant, VariantBuilder
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # No-op when the server already preloaded templates before forking workers
+    preload()
+    _pdf_stores()
+    if memory.TRACE_MEMORY:
+        memory.start()
+    yield
+    _close_pdf_backend()
+
 
 app = FastAPI(
     title="Resume Generator API",
     description="Generate resumes and cover letters from JSON data",
     version="1.0.0",
+    lifespan=lifespan,
 )
+# Negotiated gzip/brotli for HTML and JSON responses above the size threshold
+app.add_middleware(CompressionMiddleware)
+# Opt-in per-request CPU profiling; a pass-through unless RESUMEGEN_PROFILE_TOKEN is set
+app.add_middleware(ProfilingMiddleware)
 
 
 # API Models
+def _pdf_optimizations(value: Any) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    optimizations = pdf_optimize.parse_optimizations(value)
+    if optimizations and not pdf_optimize.PYPDF_AVAILABLE:
+        raise ValueError("PDF optimization is not available on this server")
+    return optimizations
+
+
+# Post-processing of the PDF: list of "compress", "dedupe", "metadata", or "all";
+# None uses the server default (RESUMEGEN_PDF_OPTIMIZE)
+PdfOptimizations = Annotated[Optional[Tuple[str, ...]], BeforeValidator(_pdf_optimizations)]
+
+
+def _output_format(value: Any) -> Any:
+    parse_targets(value)
+    return value
+
+
+# "html", "pdf", "both", or a list of targets produced from one render: "html", "pdf",
+# "pdf:<paper>" (e.g. "pdf:letter"), "thumbnail[:<width>]" (see resumegen.outputs)
+OutputFormat = Annotated[Union[str, List[str]], BeforeValidator(_output_format)]
+
+
+class ResumeData(Resume):
+    """Resume of a request; the personal information is sent separately"""
+
+    personal_information: Any = Field(
+        None, description="Ignored: the request's personal_info is used instead."
+    )
+
+
+class CoverLetterData(CoverLetter):
+    """Cover letter of a request; the personal information is sent separately"""
+
+    personal_information: Any = Field(
+        None, description="Ignored: the request's personal_info is used instead."
+    )
+
+
 class ResumeRequest(BaseModel):
-    resume_data: dict
-    personal_info: dict
-    output_format: str = "both"  # "html", "pdf", "both"
+    resume_data: ResumeData
+    personal_info: PersonalInfo
+    output_format: OutputFormat = "both"
+    include_timings: bool = False  # Add per-stage timings to the response body
+    pdf_optimize: PdfOptimizations = None
+
+    def document(self) -> Resume:
+        """The validated resume with the request's personal information, without revalidation"""
+        return _construct_with_personal_info(Resume, self.resume_data, self.personal_info)
 
 
 class CoverLetterRequest(BaseModel):
-    cover_letter_data: dict
-    personal_info: dict
-    output_format: str = "both"  # "html", "pdf", "both"
+    cover_letter_data: CoverLetterData
+    personal_info: PersonalInfo
+    output_format: OutputFormat = "both"
+    include_timings: bool = False  # Add per-stage timings to the response body
+    pdf_optimize: PdfOptimizations = None
+
+    def document(self) -> CoverLetter:
+        """The validated cover letter with the request's personal information, without revalidation"""
+        return _construct_with_personal_info(CoverLetter, self.cover_letter_data, self.personal_info)
+
+
+def _construct_with_personal_info(
+    model: type[BaseModel], data: BaseModel, personal_info: PersonalInfo
+):
+    """A document model from validated parts, built without validating them again"""
+    fields = dict(data)
+    fields["personal_information"] = personal_info
+    return model.model_construct(
+        _fields_set=data.model_fields_set | {"personal_information"}, **fields
+    )
+
+
+def _parse_request(model: type[BaseModel], body: bytes | dict | BaseModel) -> BaseModel:
+    """
+    Validate a request in one pass, from the raw JSON body where there is one.
+
+    A malformed body or a missing or mistyped top-level field is a client
+    error (422); invalid document content fails the generation (500).
+    """
+    if isinstance(body, model):
+        return body
+    try:
+        if isinstance(body, (bytes, str)):
+            return model.model_validate_json(body)
+        return model.model_validate(body)
+    except ValidationError as e:
+        if any(len(error["loc"]) <= 1 for error in e.errors()):
+            raise HTTPException(status_code=422, detail=json.loads(e.json(include_url=False)))
+        raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
+
+
+# Request bodies that are validated from the raw JSON instead of by FastAPI,
+# documented in OpenAPI from the models; schema definitions go to components
+_openapi_schemas: Dict[str, Any] = {}
+
+
+def _request_body(model: type[BaseModel]) -> Dict[str, Any]:
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    _openapi_schemas.update(schema.pop("$defs", {}))
+    _openapi_schemas[model.__name__] = schema
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/{model.__name__}"}}
+            },
+        }
+    }
+
+
+def _openapi() -> Dict[str, Any]:
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_openapi_schemas)
+    return app.openapi_schema
+
+
+app.openapi = _openapi
 
 
 class GenerationResponse(BaseModel):
     html_content: Optional[str] = None
     pdf_content: Optional[str] = None  # Base64 encoded PDF content
+    pdf_bytes_saved: Optional[int] = None  # Bytes removed by PDF post-processing
+    # For a list output_format: target -> HTML, or base64 PDF / PNG
+    outputs: Optional[Dict[str, str]] = None
+    message: str
+    timings: Optional[Dict[str, float]] = None  # Milliseconds spent per stage
+
+
+class BothRequest(BaseModel):
+    resume_data: ResumeData
+    cover_letter_data: CoverLetterData
+    personal_info: PersonalInfo
+    output_format: OutputFormat = "both"
+    include_timings: bool = False  # Add per-stage timings to each response body
+    pdf_optimize: PdfOptimizations = None
+
+    def resume_request(self) -> ResumeRequest:
+        """The resume half of the request, without revalidation"""
+        return ResumeRequest.model_construct(
+            resume_data=self.resume_data,
+            personal_info=self.personal_info,
+            output_format=self.output_format,
+            include_timings=self.include_timings,
+            pdf_optimize=self.pdf_optimize,
+        )
+
+    def cover_letter_request(self) -> CoverLetterRequest:
+        """The cover letter half of the request, without revalidation"""
+        return CoverLetterRequest.model_construct(
+            cover_letter_data=self.cover_letter_data,
+            personal_info=self.personal_info,
+            output_format=self.output_format,
+            include_timings=self.include_timings,
+            pdf_optimize=self.pdf_optimize,
+        )
+
+
+class BothGenerationResponse(BaseModel):
+    resume: GenerationResponse
+    cover_letter: GenerationResponse
     message: str
 
 
-# Temporary file storage (in production, use proper storage)
-TEMP_DIR = Path("/tmp/resumegen")
-TEMP_DIR.mkdir(exist_ok=True)
+class VariantOverlay(BaseModel):
+    name: str
+    merge: Optional[dict] = None  # RFC 7396 merge patch, applied first
+    patch: Optional[List[dict]] = None  # RFC 6902 JSON Patch operations
 
 
-@app.get("/")
-def root():
-    return {"message": "Resume Generator API", "docs": "/docs"}
+class VariantsRequest(BaseModel):
+    resume_data: ResumeData  # Base resume, validated once for all variants
+    personal_info: PersonalInfo
+    variants: List[VariantOverlay]
+    output_format: OutputFormat = "both"
+    include_timings: bool = False  # Add per-stage timings to each variant
+    pdf_optimize: PdfOptimizations = None
 
+    def document(self) -> Resume:
+        """The validated base resume with the request's personal information"""
+        return _construct_with_personal_info(Resume, self.resume_data, self.personal_info)
 
-@app.get("/health")
-def health_check():
-    return {"status": "healthy", "service": "Resume Generator"}
 
+class VariantsGenerationResponse(BaseModel):
+    variants: Dict[str, GenerationResponse]  # Keyed by variant name, in request order
+    message: str
 
-@app.post("/generate-resume", response_model=GenerationResponse)
-async def generate_resume_api(request: ResumeRequest):
-    """Generate resume from JSON data"""
-    try:
-        # Create resume using utility function that handles personal info properly
-        resume = create_resume_with_personal_info(request.resume_data, request.personal_info)
 
-        # Render HTML
-        html_content = render_resume(resume)
+class InvalidPart:
+    """A part of an archive document that failed validation, reported in errors.json"""
+
+    def __init__(self, error: ValidationError):
+        self.error = error
 
-        # Initialize response
-        response = GenerationResponse(message="Resume generated successfully")
 
-        # Generate outputs based on format
-        if request.output_format in ["html", "both"]:
-            response.html_content = html_content
+def _keep_invalid(value: Any, handler: Callable[[Any], Any]) -> Any:
+    try:
+        return handler(value)
+    except ValidationError as e:
+        return InvalidPart(e)
+
+
+# Validated with the request, but an invalid document only fails itself, not the archive
+ArchivePart = WrapValidator(_keep_invalid)
+
+
+class ArchiveDocument(BaseModel):
+    # Exactly one of resume_data / cover_letter_data
+    resume_data: Annotated[Optional[ResumeData], ArchivePart] = None
+    cover_letter_data: Annotated[Optional[CoverLetterData], ArchivePart] = None
+    personal_info: Annotated[PersonalInfo, ArchivePart]
+    name: Optional[str] = None  # File name in the archive; defaults to "<type>-<index>"
+
+    def document(self) -> Resume | CoverLetter:
+        """
+        The validated document with the request's personal information, without revalidation.
+
+        Raises:
+            ValidationError: If the document's data or personal information is invalid.
+        """
+        if self.resume_data is not None:
+            model, data = Resume, self.resume_data
+        else:
+            model, data = CoverLetter, self.cover_letter_data
+        for part in (data, self.personal_info):
+            if isinstance(part, InvalidPart):
+                raise part.error
+        return _construct_with_personal_info(model, data, self.personal_info)
+
+
+class ArchiveRequest(BaseModel):
+    documents: List[ArchiveDocument]
+    archive_format: str = "zip"  # "zip", "tar", "tar.gz"
+    output_format: OutputFormat = "both"
+    pdf_optimize: PdfOptimizations = None
+
+
+ARCHIVE_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "tar": "application/x-tar",
+    "tar.gz": "application/gzip",
+}
+# Archive bytes are sent to the client in chunks of at least this size
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+
+
+
+@lru_cache(maxsize=None)
+def _pdf_stores() -> Tuple[Optional[ArtifactStore], ArtifactStore]:
+    """
+    PDF results shared by all worker processes, keyed by the rendered HTML
+    (RESUMEGEN_CACHE_DIR), and the store of PDF jobs' scratch files: the
+    result cache when there is one, else RESUMEGEN_ARTIFACT_DIR.
+
+    Opened on first use (at the latest on startup), not on import: opening a
+    store removes what crashed workers left behind and scans it for eviction.
+    """
+    cache = result_cache_from_env("pdf")
+    return cache, cache if cache is not None else artifact_store_from_env("pdf")
+
+# Maximum number of documents generated concurrently; further requests wait in a queue
+RENDER_CONCURRENCY = int(os.getenv("RESUMEGEN_RENDER_CONCURRENCY", str(os.cpu_count() or 4)))
+# One semaphore per event loop: a semaphore is bound to the loop it first waits on,
+# and tests and the load-test harness run the app on several loops in one process
+_render_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
 
-        if request.output_format in ["pdf", "both"]:
-            # Generate unique temporary files for PDF generation
-            job_id = str(uuid.uuid4())[:8]
-            html_file = TEMP_DIR / f"resume_{job_id}.html"
-            pdf_file = TEMP_DIR / f"resume_{job_id}.pdf"
 
-            # Save HTML temporarily
-            with open(html_file, "w", encoding="utf-8") as f:
-                f.write(html_content)
+def _get_render_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _render_slots.get(loop)
+    if slots is None:
+        slots = _render_slots[loop] = asyncio.Semaphore(RENDER_CONCURRENCY)
+    return slots
+
+# Document type label for each instrumented endpoint
+ENDPOINT_DOCUMENT_TYPES = {
+    "/generate-resume": "resume",
+    "/generate-cover-letter": "cover_letter",
+    "/generate-both": "both",
+    "/generate-variants": "resume",
+    "/generate-archive": "archive",
+}
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Record request counts, latency and payload size for generation endpoints"""
+    endpoint = request.url.path
+    document_type = ENDPOINT_DOCUMENT_TYPES.get(endpoint)
+    if document_type is None:
+        return await call_next(request)
+
+    start = time.perf_counter()
+    status = "500"
+    usage = None
+    tracker = memory.REQUEST_TRACKER.track() if memory.TRACE_MEMORY else nullcontext()
+    try:
+        with tracker as usage:
+            response = await call_next(request)
+        status = str(response.status_code)
+        content_length = response.headers.get("content-length")
+        if content_length is not None:
+            RESPONSE_BYTES.observe(int(content_length), document_type=document_type)
+        return response
+    finally:
+        REQUESTS.inc(endpoint=endpoint, document_type=document_type, status=status)
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start, endpoint=endpoint, document_type=document_type
+        )
+        if usage is not None:
+            REQUEST_PEAK_MEMORY.observe(
+                usage.peak_bytes, endpoint=endpoint, document_type=document_type
+            )
+            memory.logger.info(
+                "%s %s: peak %s, retained %s, process peak RSS %s",
+                endpoint,
+                status,
+                memory.format_bytes(usage.peak_bytes),
+                memory.format_bytes(usage.retained_bytes),
+                memory.format_bytes(usage.peak_rss_bytes),
+            )
+
+
+def _build_pdf(html_content: str, document_type: str) -> bytes | memoryview:
+    """
+    Convert rendered HTML to PDF through a scratch directory of the artifact
+    store. Cached PDFs are returned as memory-mapped views, not copied.
+    """
+    result_cache, artifacts = _pdf_stores()
+    if result_cache is not None:
+        cache_key = pdf_cache_key(result_cache, html_content)
+        with stage("cache"):
+            cached = result_cache.read(cache_key)
+        if cached is not None:
+            return cached
+
+    with artifacts.scratch() as scratch:
+        html_file = scratch / f"{document_type}.html"
+        pdf_file = scratch / f"{document_type}.pdf"
+        html_file.write_text(html_content, encoding="utf-8")
+
+        generate_pdf(str(html_file), str(pdf_file))
+
+        if result_cache is None:
+            return pdf_file.read_bytes()
+        # Renamed into the cache instead of written a second time, then mapped from there
+        return map_file(result_cache.put_file(cache_key, pdf_file))
+
+
+def _optimize_pdf(
+    pdf_bytes: bytes, document_type: str, optimizations: Optional[Tuple[str, ...]]
+) -> Optional[pdf_optimize.OptimizeResult]:
+    """Post-process a PDF with the request's optimizations, or the server default"""
+    if optimizations is None:
+        optimizations = pdf_optimize.DEFAULT_OPTIMIZATIONS
+    if not optimizations:
+        return None
+    with stage("optimize"):
+        return pdf_optimize.optimize_pdf(pdf_bytes, optimizations, document_type)
+
+
+# PDF backend for multi-target outputs (a Node.js/Chromium worker or an HTTP
+# session), opened on first use and shared by every request of this process
+_pdf_backend = None
+_pdf_backend_lock = threading.Lock()
+
+
+def _get_pdf_backend():
+    global _pdf_backend
+    with _pdf_backend_lock:
+        if _pdf_backend is None:
+            _pdf_backend = open_pdf_backend(RENDER_CONCURRENCY)
+        return _pdf_backend
+
+
+def _close_pdf_backend(backend=None) -> None:
+    """Shut the shared backend down; with `backend`, only if it is still the shared one"""
+    global _pdf_backend
+    with _pdf_backend_lock:
+        if _pdf_backend is None or (backend is not None and backend is not _pdf_backend):
+            return
+        backend, _pdf_backend = _pdf_backend, None
+    backend.close()
+
+
+def generate_outputs(html_content: str, targets: List[dict]) -> Dict[str, bytes]:
+    """Produce several outputs from one page load with the shared PDF backend"""
+    backend = _get_pdf_backend()
+    try:
+        return backend.render_outputs(html_content, targets)
+    except Exception:
+        if not backend.running:
+            # The worker died: the next request starts a new one
+            _close_pdf_backend(backend)
+        raise
+
+
+def _build_outputs(
+    html_content: str, document_type: str, targets: Tuple[OutputTarget, ...]
+) -> Dict[str, bytes | memoryview]:
+    """
+    Produce the PDF and thumbnail targets of one document in a single PDF
+    backend session, reusing cached outputs; keyed by target name.
+    """
+    results: Dict[str, bytes | memoryview] = {}
+    # Spellings of the same output ("pdf", "pdf:a4") are produced once
+    by_id: Dict[str, OutputTarget] = {}
+    for target in targets:
+        by_id.setdefault(target.cache_id, target)
+    keys = {}
+    result_cache = _pdf_stores()[0]
+    if result_cache is not None:
+        with stage("cache"):
+            for cache_id in list(by_id):
+                keys[cache_id] = result_cache.key(pdf_backend_name(), html_content, cache_id)
+                cached = result_cache.read(keys[cache_id])
+                if cached is not None:
+                    results[cache_id] = cached
+                    del by_id[cache_id]
+
+    if by_id:
+        jobs = [target.browser_job() for target in by_id.values()]
+        rendered = generate_outputs(html_content, jobs)
+        for cache_id, target in by_id.items():
+            results[cache_id] = rendered[target.name]
+            if result_cache is not None:
+                result_cache.put(keys[cache_id], rendered[target.name])
+    return {target.name: results[target.cache_id] for target in targets}
+
+
+def _target_contents(
+    timings: Timings,
+    html_content: str,
+    document_type: str,
+    output_format: str | List[str],
+    optimizations: Optional[Tuple[str, ...]] = None,
+) -> List[Tuple[OutputTarget, str | bytes | memoryview, Optional[int]]]:
+    """
+    Each target of an output_format with its content, and the bytes PDF
+    post-processing saved on it (None if it did not run). The PDF of the
+    original formats ("pdf", "both") is converted from the HTML alone, the
+    targets of a list in one multi-output backend session.
+    """
+    targets = parse_targets(output_format)
+    browser_targets = tuple(target for target in targets if target.kind != "html")
+    rendered: Dict[str, bytes | memoryview] = {}
+    if browser_targets:
+        try:
+            with timings.stage("pdf"):
+                if is_legacy(output_format):
+                    rendered = {"pdf": _build_pdf(html_content, document_type)}
+                else:
+                    rendered = _build_outputs(html_content, document_type, browser_targets)
+        except Exception:
+            PDF_ERRORS.inc(backend=pdf_backend_name(), document_type=document_type)
+            raise
+
+    contents = []
+    for target in targets:
+        if target.kind == "html":
+            contents.append((target, html_content, None))
+            continue
+        data, saved = rendered[target.name], None
+        if target.kind == "pdf":
+            optimized = _optimize_pdf(data, document_type, optimizations)
+            if optimized is not None:
+                data, saved = optimized.pdf, optimized.saved_bytes
+        contents.append((target, data, saved))
+    return contents
+
+
+def _document_outputs(
+    response: GenerationResponse,
+    timings: Timings,
+    html_content: str,
+    document_type: str,
+    output_format: str | List[str],
+    optimizations: Optional[Tuple[str, ...]] = None,
+) -> None:
+    """
+    Fill in the outputs requested by output_format: html_content and the
+    base64 pdf_content for the original formats, per-target outputs for a list
+    """
+    legacy = is_legacy(output_format)
+    if not legacy:
+        response.outputs = {}
+    for target, content, saved in _target_contents(
+        timings, html_content, document_type, output_format, optimizations
+    ):
+        if saved is not None:
+            response.pdf_bytes_saved = (response.pdf_bytes_saved or 0) + saved
+        if not isinstance(content, str):
+            with timings.stage("encoding"):
+                content = base64.b64encode(content).decode("utf-8")
+        if not legacy:
+            response.outputs[target.name] = content
+        elif target.kind == "html":
+            response.html_content = content
+        else:
+            response.pdf_content = content
+
+
+def _generate_document(
+    document_type: str,
+    request_model: type[BaseModel],
+    render: Callable[[Any], str],
+    body: bytes | dict | BaseModel,
+    message: str,
+) -> tuple[GenerationResponse, Timings]:
+    """Validate, render and convert one document, timing every stage"""
+    timings = Timings(document_type)
+    INFLIGHT_RENDERS.inc(document_type=document_type)
+    try:
+        with timings.activate():
+            with timings.stage("validation"):
+                request = _parse_request(request_model, body)
+                document = request.document()
+
+            with timings.stage("render"):
+                html_content = render(document)
+
+            response = GenerationResponse(message=message)
+            _document_outputs(
+                response,
+                timings,
+                html_content,
+                document_type,
+                request.output_format,
+                request.pdf_optimize,
+            )
+
+        if request.include_timings:
+            response.timings = timings.as_dict()
+        return response, timings
+    finally:
+        INFLIGHT_RENDERS.dec(document_type=document_type)
+
+
+def _generate_variants(body: bytes | dict | VariantsRequest) -> tuple[VariantsGenerationResponse, Timings]:
+    """Validate the request and base resume once, then apply, render and convert each overlay"""
+    timings = Timings("resume")
+    INFLIGHT_RENDERS.inc(document_type="resume")
+    try:
+        with timings.activate():
+            with timings.stage("validation"):
+                request = _parse_request(VariantsRequest, body)
+                names = [overlay.name for overlay in request.variants]
+                if len(set(names)) != len(names):
+                    raise HTTPException(status_code=422, detail="Variant names must be unique")
+                for name in names:
+                    try:
+                        check_output_name(name)
+                    except ValueError as e:
+                        raise HTTPException(status_code=422, detail=str(e))
+                builder = VariantBuilder.from_document(request.document(), "resume")
+
+            variants: Dict[str, GenerationResponse] = {}
+            for overlay in request.variants:
+                variant_timings = Timings("resume")
+                with variant_timings.activate():
+                    with variant_timings.stage("overlay"):
+                        document = builder.build(Variant(overlay.name, overlay.merge, overlay.patch))
+                    with variant_timings.stage("render"):
+                        html_content = render_resume(document)
+                    response = GenerationResponse(message=f"Variant '{overlay.name}' generated")
+                    _document_outputs(
+                        response,
+                        variant_timings,
+                        html_content,
+                        "resume",
+                        request.output_format,
+                        request.pdf_optimize,
+                    )
+                if request.include_timings:
+                    response.timings = variant_timings.as_dict()
+                for name, duration in variant_timings.stages.items():
+                    timings.stages[name] = timings.stages.get(name, 0.0) + duration
+                variants[overlay.name] = response
+
+        result = VariantsGenerationResponse(
+            variants=variants, message=f"{len(variants)} variants generated successfully"
+        )
+        return result, timings
+    finally:
+        INFLIGHT_RENDERS.dec(document_type="resume")
+
+
+class _ArchiveChannel:
+    """
+    Write-only binary stream that forwards archive bytes from the generating
+    worker thread to the response, blocking while the client falls behind.
+    """
+
+    def __init__(self, send):
+        self._send = send
+        self._buffer = bytearray()
+
+    def write(self, data) -> int:
+        self._buffer += data
+        if len(self._buffer) >= ARCHIVE_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buffer:
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            anyio.from_thread.run(self._send.send, chunk)
+
+
+def _archive_name(index: int, document: ArchiveDocument) -> str:
+    document_type = "resume" if document.resume_data is not None else "cover_letter"
+    return document.name or f"{document_type}-{index}"
+
+
+def _archive_contents(
+    request: ArchiveRequest, document: ArchiveDocument, name: str
+) -> List[Tuple[str, str | bytes | memoryview]]:
+    """Generate one archive document: its member names and contents"""
+    if document.resume_data is not None:
+        document_type, render = "resume", render_resume
+    else:
+        document_type, render = "cover_letter", render_cover_letter
+
+    timings = Timings(document_type)
+    INFLIGHT_RENDERS.inc(document_type=document_type)
+    try:
+        with timings.activate():
+            # Validated with the request; raises for a document that was invalid
+            model = document.document()
+            with timings.stage("render"):
+                html_content = render(model)
+            contents = _target_contents(
+                timings, html_content, document_type, request.output_format, request.pdf_optimize
+            )
+    finally:
+        INFLIGHT_RENDERS.dec(document_type=document_type)
+    return [(target.filename(name), content) for target, content, _ in contents]
+
+
+@contextmanager
+def _render_slot_from_thread():
+    """Hold a render slot of the event loop while a worker thread generates a document"""
+    slots = anyio.from_thread.run_sync(_get_render_slots)
+    QUEUE_DEPTH.inc()
+    try:
+        anyio.from_thread.run(slots.acquire)
+    finally:
+        QUEUE_DEPTH.dec()
+    try:
+        yield
+    finally:
+        anyio.from_thread.run_sync(slots.release)
+
+
+def _write_archive(request: ArchiveRequest, stream: _ArchiveChannel) -> None:
+    """
+    Generate every document straight into the archive; failures go to
+    errors.json. A render slot is held while each document is generated, not
+    while its bytes wait for the client.
+    """
+    errors: Dict[str, str] = {}
+    with open_sink(None, request.archive_format, stream=stream) as sink:
+        for index, document in enumerate(request.documents, start=1):
+            name = _archive_name(index, document)
+            try:
+                with _render_slot_from_thread():
+                    contents = _archive_contents(request, document, name)
+                for filename, content in contents:
+                    sink.write(filename, content)
+            except Exception as e:
+                errors[name] = str(e)
+
+        if errors:
+            sink.write("errors.json", json.dumps(errors, indent=2))
+    stream.flush()
+
+
+async def _archive_chunks(request: ArchiveRequest):
+    """Yield archive bytes while the documents are still being generated"""
+    send, receive = anyio.create_memory_object_stream(8)
+
+    async def produce():
+        async with send:
+            # Render slots are taken per document (see _write_archive)
+            await run_in_threadpool(run_profiled, _write_archive, request, _ArchiveChannel(send))
+
+    task = asyncio.create_task(produce())
+    try:
+        async with receive:
+            async for chunk in receive:
+                yield chunk
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _json_response(content: BaseModel, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serialize a response model straight to JSON bytes with Pydantic's Rust core,
+    skipping FastAPI's jsonable_encoder pass over the (large) HTML and PDF strings.
+    """
+    return Response(
+        content=content.model_dump_json(), media_type="application/json", headers=headers
+    )
 
-            # Generate PDF
-            generate_pdf(str(html_file), str(pdf_file))
 
-            # Read PDF content and clean up temp files
-            with open(pdf_file, "rb") as f:
-                pdf_bytes = f.read()
-                response.pdf_content = base64.b64encode(pdf_bytes).decode("utf-8")
+async def _run_generation(*args, generate: Callable = _generate_document):
+    """Run a generation job in the thread pool once a render slot is free"""
+    slots = _get_render_slots()
+    QUEUE_DEPTH.inc()
+    try:
+        await slots.acquire()
+    finally:
+        QUEUE_DEPTH.dec()
+    try:
+        return await run_in_threadpool(run_profiled, generate, *args)
+    finally:
+        slots.release()
 
-            # Clean up temporary files
-            html_file.unlink(missing_ok=True)
-            pdf_file.unlink(missing_ok=True)
 
-        return response
+async def _generate_resume(body: bytes | dict | ResumeRequest) -> tuple[GenerationResponse, Timings]:
+    try:
+        return await _run_generation(
+            "resume", ResumeRequest, render_resume, body, "Resume generated successfully"
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
 
-@app.post("/generate-cover-letter", response_model=GenerationResponse)
-async def generate_cover_letter_api(request: CoverLetterRequest):
-    """Generate cover letter from JSON data"""
+async def _generate_cover_letter(
+    body: bytes | dict | CoverLetterRequest,
+) -> tuple[GenerationResponse, Timings]:
     try:
-        # Create cover letter using utility function that handles personal info properly
-        cover_letter = create_cover_letter_with_personal_info(request.cover_letter_data, request.personal_info)
+        return await _run_generation(
+            "cover_letter",
+            CoverLetterRequest,
+            render_cover_letter,
+            body,
+            "Cover letter generated successfully",
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
 
-        # Render HTML
-        html_content = render_cover_letter(cover_letter)
 
-        # Initialize response
-        response = GenerationResponse(message="Cover letter generated successfully")
+@app.get("/")
+def root():
+    return {"message": "Resume Generator API", "docs": "/docs"}
 
-        # Generate outputs based on format
-        if request.output_format in ["html", "both"]:
-            response.html_content = html_content
 
-        if request.output_format in ["pdf", "both"]:
-            # Generate unique temporary files for PDF generation
-            job_id = str(uuid.uuid4())[:8]
-            html_file = TEMP_DIR / f"cover_letter_{job_id}.html"
-            pdf_file = TEMP_DIR / f"cover_letter_{job_id}.pdf"
+@app.get("/health")
+def health_check():
+    return {"status": "healthy", "service": "Resume Generator"}
 
-            # Save HTML temporarily
-            with open(html_file, "w", encoding="utf-8") as f:
-                f.write(html_content)
 
-            # Generate PDF
-            generate_pdf(str(html_file), str(pdf_file))
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics in text exposition format"""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/debug/profiles/{profile_id}", include_in_schema=False)
+def get_profile(profile_id: str, request: Request):
+    """Download a stored request profile; requires the profile token"""
+    if not profiling.token_matches(request.headers.get("x-profile-token")):
+        raise HTTPException(status_code=404, detail="Not found")
+    path = profiling.find_profile(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+
+@app.get("/debug/memory", include_in_schema=False)
+def get_memory(request: Request, limit: int = 20, group_by: str = "lineno"):
+    """Traced memory and the top allocation sites; requires the profile token"""
+    if not profiling.token_matches(request.headers.get("x-profile-token")):
+        raise HTTPException(status_code=404, detail="Not found")
+    if not memory.TRACE_MEMORY:
+        raise HTTPException(
+            status_code=404, detail="Memory tracing is disabled (set RESUMEGEN_TRACE_MEMORY=1)"
+        )
+    if group_by not in ("lineno", "filename", "traceback"):
+        raise HTTPException(status_code=422, detail="group_by must be lineno, filename or traceback")
+    memory.start()
+    return memory.report(limit, group_by)
+
+
+@app.post(
+    "/generate-resume", response_model=GenerationResponse, openapi_extra=_request_body(ResumeRequest)
+)
+async def generate_resume_api(request: Request):
+    """Generate resume from JSON data"""
+    result, timings = await _generate_resume(await request.body())
+    return _json_response(result, {"Server-Timing": timings.server_timing()})
 
-            # Read PDF content and clean up temp files
-            with open(pdf_file, "rb") as f:
-                pdf_bytes = f.read()
-                response.pdf_content = base64.b64encode(pdf_bytes).decode("utf-8")
 
-            # Clean up temporary files
-            html_file.unlink(missing_ok=True)
-            pdf_file.unlink(missing_ok=True)
+@app.post(
+    "/generate-cover-letter",
+    response_model=GenerationResponse,
+    openapi_extra=_request_body(CoverLetterRequest),
+)
+async def generate_cover_letter_api(request: Request):
+    """Generate cover letter from JSON data"""
+    result, timings = await _generate_cover_letter(await request.body())
+    return _json_response(result, {"Server-Timing": timings.server_timing()})
 
-        return response
 
+@app.post(
+    "/generate-variants",
+    response_model=VariantsGenerationResponse,
+    openapi_extra=_request_body(VariantsRequest),
+)
+async def generate_variants_api(request: Request):
+    """Generate tailored resume variants from one base resume and a list of overlays"""
+    try:
+        result, timings = await _run_generation(await request.body(), generate=_generate_variants)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Generation failed: {str(e)}")
+    return _json_response(result, {"Server-Timing": timings.server_timing()})
+
+
+@app.post("/generate-archive", openapi_extra=_request_body(ArchiveRequest))
+async def generate_archive(body: Request):
+    """
+    Generate many documents and stream them back as a single ZIP or tar archive.
+    Files are added as they are generated; per-document failures are listed in errors.json.
+    """
+    try:
+        request = await run_in_threadpool(ArchiveRequest.model_validate_json, await body.body())
+    except ValidationError as e:
+        # Invalid document content does not get here: it fails only that document
+        raise HTTPException(status_code=422, detail=json.loads(e.json(include_url=False)))
+    if request.archive_format not in ARCHIVE_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"archive_format must be one of: {', '.join(ARCHIVE_MEDIA_TYPES)}",
+        )
+    for index, document in enumerate(request.documents, start=1):
+        if (document.resume_data is None) == (document.cover_letter_data is None):
+            raise HTTPException(
+                status_code=422,
+                detail=f"Document {index} needs exactly one of resume_data or cover_letter_data",
+            )
+    names = [_archive_name(index, document) for index, document in enumerate(request.documents, start=1)]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=422, detail="Document names must be unique")
+
+    return StreamingResponse(
+        _archive_chunks(request),
+        media_type=ARCHIVE_MEDIA_TYPES[request.archive_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="documents.{request.archive_format}"'
+        },
+    )
 
 
 # Run the server
 
 
-@app.post("/generate-both")
-async def generate_both(
-    resume_data: dict, cover_letter_data: dict, personal_info: dict
-):
+@app.post(
+    "/generate-both",
+    response_model=BothGenerationResponse,
+    openapi_extra=_request_body(BothRequest),
+)
+async def generate_both(request: Request):
     """Generate both resume and cover letter"""
-    resume_request = ResumeRequest(
-        resume_data=resume_data, personal_info=personal_info, output_format="both"
-    )
+    both = await run_in_threadpool(_parse_request, BothRequest, await request.body())
+    resume_request = both.resume_request()
+    cover_letter_request = both.cover_letter_request()
 
-    cover_letter_request = CoverLetterRequest(
-        cover_letter_data=cover_letter_data,
-        personal_info=personal_info,
-        output_format="both",
+    resume_result, resume_timings = await _generate_resume(resume_request)
+    cover_letter_result, cover_letter_timings = await _generate_cover_letter(
+        cover_letter_request
+    )
+    result = BothGenerationResponse(
+        resume=resume_result,
+        cover_letter=cover_letter_result,
+        message="Both documents generated successfully",
+    )
+    return _json_response(
+        result,
+        {"Server-Timing": server_timing_header([resume_timings, cover_letter_timings])},
     )
-
-    resume_result = await generate_resume_api(resume_request)
-    cover_letter_result = await generate_cover_letter_api(cover_letter_request)
-
-    return {
-        "resume": resume_result,
-        "cover_letter": cover_letter_result,
-        "message": "Both documents generated successfully",
-    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,307 @@
+"""Disk-backed store for generated artifacts and per-job scratch files.
+
+Artifacts are files named by a hex key (usually a hash of the content they
+were generated from) under ``<directory>/<key[:2]>/<key>``. Writes go to a
+temporary file that is renamed into place, so any number of worker
+processes can share one directory without locking.
+
+The store keeps its own size in bounds:
+
+- ``max_bytes`` caps the total size; when it is exceeded the least recently
+  used artifacts are removed. Each process counts only the bytes it wrote
+  since it last scanned the directory, so with N processes writing the
+  store can grow to about N times the cap before one of them evicts.
+- ``ttl`` removes artifacts that have not been used for that many seconds.
+- Temporary files and scratch directories left behind by processes that
+  died mid-write are removed when a store is opened.
+
+The modification time of an artifact records its last use, so the LRU
+order is shared by every process using the directory.
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from resumegen.metrics import ARTIFACT_BYTES, ARTIFACT_EVICTIONS, record_cache
+
+# Root of the store shared by the API and CLI
+ARTIFACT_DIR = Path(os.getenv("RESUMEGEN_ARTIFACT_DIR", "/tmp/resumegen/artifacts"))
+# Total size cap in bytes; 0 disables it
+ARTIFACT_MAX_BYTES = int(os.getenv("RESUMEGEN_ARTIFACT_MAX_BYTES", str(512 * 1024 * 1024)))
+# Seconds since last use after which an artifact expires; 0 disables expiry
+ARTIFACT_TTL = float(os.getenv("RESUMEGEN_ARTIFACT_TTL", str(7 * 24 * 3600)))
+
+# Eviction frees space down to this fraction of the cap, so it does not run on every write
+EVICT_TO = 0.9
+# Temporary files of a running process are kept unless they are older than
+# this: no job runs that long, so their pid was reused by another process
+ORPHAN_AGE = 7 * 24 * 3600
+TMP_DIR_NAME = ".tmp"
+SCRATCH_DIR_NAME = "scratch"
+_KEY = re.compile(r"[0-9a-f]{8,128}")
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _orphaned(path: Path, now: float) -> bool:
+    """Whether a temporary file or scratch directory was left by a dead process"""
+    pid, _, _ = path.name.lstrip(".").partition("-")
+    if not pid.isdigit() or not _process_alive(int(pid)):
+        return True
+    try:
+        return now - path.stat().st_mtime > ORPHAN_AGE
+    except FileNotFoundError:
+        return False
+
+
+def _stored_size(path: Path) -> int:
+    """Size of the artifact a write is about to replace, 0 if there is none"""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def map_file(path: Path | str) -> memoryview:
+    """Read-only memory-mapped view of a file's contents"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class ArtifactStore:
+    """
+    Content-addressed, size-capped store of generated artifacts (e.g. PDF bytes
+    keyed by the hash of the rendered HTML), also handing out scratch
+    directories for jobs that need files on disk.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str,
+        name: str = "artifact",
+        max_bytes: int = ARTIFACT_MAX_BYTES,
+        ttl: float = ARTIFACT_TTL,
+        cleanup: bool = True,
+    ):
+        self.directory = Path(directory)
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._tmp_dir = self.directory / TMP_DIR_NAME
+        self._scratch_dir = self.directory / SCRATCH_DIR_NAME
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._scratch_dir.mkdir(exist_ok=True)
+        self._size = 0
+        if cleanup:
+            self.cleanup()
+
+    @staticmethod
+    def key(*parts: str | bytes) -> str:
+        """Build a key from the content an artifact depends on."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        if not _KEY.fullmatch(key):
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        return self.directory / key[:2] / key
+
+    def _artifacts(self) -> Iterator[tuple[Path, os.stat_result]]:
+        for shard in os.scandir(self.directory):
+            if len(shard.name) != 2 or not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if _KEY.fullmatch(entry.name):
+                    try:
+                        yield Path(entry.path), entry.stat()
+                    except FileNotFoundError:
+                        pass
+
+    def _touch(self, path: Path) -> bool:
+        """Mark an artifact as used; False if it no longer exists"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Read-only store: still usable, just without LRU updates
+            return path.exists()
+        return True
+
+    def path(self, key: str) -> Optional[Path]:
+        """
+        Path of a stored artifact, for serving it straight from disk
+        (e.g. with a FileResponse), or None if it is not stored.
+        """
+        path = self._path(key)
+        hit = self._touch(path)
+        record_cache(self.name, hit)
+        return path if hit else None
+
+    def read(self, key: str) -> Optional[memoryview]:
+        """
+        Memory-mapped contents of an artifact, or None. Nothing is copied until
+        the view is consumed, and the view stays valid if the artifact is
+        evicted or replaced meanwhile.
+        """
+        path = self.path(key)
+        if path is None:
+            return None
+        try:
+            return map_file(path)
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Contents of an artifact, or None"""
+        view = self.read(key)
+        return None if view is None else bytes(view)
+
+    def _new_tmp(self) -> tuple[int, str]:
+        return tempfile.mkstemp(dir=self._tmp_dir, prefix=f"{os.getpid()}-")
+
+    def _commit(self, tmp_name: str, key: str, size: int) -> Path:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        replaced = _stored_size(path)
+        os.replace(tmp_name, path)
+        self._added(size - replaced)
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Store an artifact atomically and return its path"""
+        fd, tmp_name = self._new_tmp()
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return self._commit(tmp_name, key, len(data))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def put_file(self, key: str, source: Path | str) -> Path:
+        """
+        Move a finished file (e.g. from a scratch directory) into the store.
+        The file is renamed, not copied, when it is on the same filesystem.
+        """
+        source = Path(source)
+        size = source.stat().st_size
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        replaced = _stored_size(path)
+        try:
+            os.replace(source, path)
+        except OSError:
+            # On another filesystem: copy through a temporary file instead
+            return self.put(key, source.read_bytes())
+        self._added(size - replaced)
+        return path
+
+    def add(self, data: bytes) -> str:
+        """Store an artifact under the hash of its contents and return the key"""
+        key = hashlib.sha256(data).hexdigest()
+        if self.path(key) is None:
+            self.put(key, data)
+        return key
+
+    @contextmanager
+    def scratch(self) -> Iterator[Path]:
+        """
+        Private directory for one job's intermediate files. It is removed when
+        the block exits, and by the next cleanup if the process dies first.
+        """
+        path = self._scratch_dir / f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        path.mkdir()
+        try:
+            yield path
+        finally:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _added(self, size: int) -> None:
+        # The directory's size at the last scan plus this process's writes
+        self._size += size
+        ARTIFACT_BYTES.set(self._size, store=self.name)
+        if self.max_bytes and self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Remove expired artifacts, then the least recently used ones until the
+        store is within its size cap. Returns the bytes freed.
+        """
+        now = time.time() if now is None else now
+        artifacts = sorted(self._artifacts(), key=lambda item: item[1].st_mtime)
+        total = sum(stat.st_size for _, stat in artifacts)
+        target = self.max_bytes * EVICT_TO if self.max_bytes and total > self.max_bytes else None
+        freed = 0
+        for path, stat in artifacts:
+            if self.ttl and now - stat.st_mtime > self.ttl:
+                reason = "ttl"
+            elif target is not None and total - freed > target:
+                reason = "size"
+            else:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            freed += stat.st_size
+            ARTIFACT_EVICTIONS.inc(store=self.name, reason=reason)
+        self._size = total - freed
+        ARTIFACT_BYTES.set(self._size, store=self.name)
+        return freed
+
+    def cleanup(self) -> int:
+        """
+        Remove temporary files and scratch directories of processes that are
+        gone, then expire and evict artifacts. Run when a store is opened.
+        """
+        now = time.time()
+        leftovers = list(self._tmp_dir.iterdir()) + list(self._scratch_dir.iterdir())
+        for path in leftovers:
+            if not _orphaned(path, now):
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+            ARTIFACT_EVICTIONS.inc(store=self.name, reason="orphan")
+        return self.evict(now)
+
+    def size(self) -> int:
+        """Total bytes of the stored artifacts"""
+        return sum(stat.st_size for _, stat in self._artifacts())
+
+
+def artifact_store_from_env(
+    name: str = "artifact", directory: Path | str | None = None
+) -> ArtifactStore:
+    """
+    Open the artifact store at `directory`, or RESUMEGEN_ARTIFACT_DIR, with the
+    size cap and TTL configured by RESUMEGEN_ARTIFACT_MAX_BYTES and RESUMEGEN_ARTIFACT_TTL.
+    """
+    return ArtifactStore(directory or ARTIFACT_DIR, name)
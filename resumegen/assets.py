@@ -0,0 +1,343 @@
+"""Inlining of the fonts, images and stylesheets a rendered document references.
+
+Chromium has to fetch every ``url(...)``, ``<img src>`` and
+``<link rel="stylesheet">`` before it can print, so a document pointing at a
+web font waits on the network on every render. Rendered HTML is rewritten
+here so that such references become ``data:`` URIs (and linked stylesheets
+become ``<style>`` blocks) read from local asset directories:
+
+- the template directory and its ``assets/`` subdirectory,
+- ``RESUMEGEN_ASSET_DIR``, if set.
+
+Relative paths and ``file://`` URLs are resolved in those directories only.
+A remote URL is served from a local file with the same name; with
+``RESUMEGEN_FETCH_ASSETS=1`` a missing remote asset is downloaded once into
+``RESUMEGEN_ASSET_DIR`` and reused afterwards. Encoded assets are cached by
+content hash.
+
+A document with no remote references left can be printed as soon as it has
+loaded instead of after the network has been idle for 500ms
+(:func:`wait_condition`).
+"""
+
+import base64
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+from urllib.parse import unquote, urlsplit
+
+from resumegen.metrics import record_cache
+
+ASSET_DIR_NAME = "assets"
+# Additional directory searched for assets, and written to by fetching
+ASSET_DIR = os.getenv("RESUMEGEN_ASSET_DIR")
+INLINE_ASSETS = os.getenv("RESUMEGEN_INLINE_ASSETS", "1") != "0"
+# Download remote assets that are not available locally (off by default:
+# it lets document content make the server issue requests)
+FETCH_ASSETS = os.getenv("RESUMEGEN_FETCH_ASSETS", "0") == "1"
+# Forces the Puppeteer wait condition instead of choosing it per document
+PDF_WAIT_UNTIL = os.getenv("RESUMEGEN_PDF_WAIT_UNTIL", "")
+
+WAIT_CONDITIONS = ("load", "domcontentloaded", "networkidle0", "networkidle2")
+
+MEDIA_TYPES = {
+    ".woff2": "font/woff2",
+    ".woff": "font/woff",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+    ".eot": "application/vnd.ms-fontobject",
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".avif": "image/avif",
+    ".ico": "image/x-icon",
+    ".css": "text/css",
+}
+
+_CSS_URL = re.compile(r"""url\(\s*(?P<q>['"]?)(?P<ref>[^'")]+?)(?P=q)\s*\)""", re.IGNORECASE)
+_CSS_IMPORT = re.compile(
+    r"""@import\s+"""
+    r"""(?:url\(\s*(?P<q1>['"]?)(?P<ref1>[^'")]+?)(?P=q1)\s*\)|(?P<q2>['"])(?P<ref2>[^'"]+)(?P=q2))"""
+    r"""(?P<media>[^;]*);""",
+    re.IGNORECASE,
+)
+_STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style>)", re.IGNORECASE | re.DOTALL)
+_STYLE_ATTRIBUTE = re.compile(
+    r"""(\bstyle\s*=\s*)(?P<q>['"])(?P<css>.*?)(?P=q)""", re.IGNORECASE | re.DOTALL
+)
+_IMG_SRC = re.compile(
+    r"""(<img\b[^>]*?\bsrc\s*=\s*)(?P<q>['"])(?P<ref>[^'"]*)(?P=q)""", re.IGNORECASE
+)
+_LINK = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+# Anything inline_assets may rewrite; documents without a match are returned as is
+_REFERENCE = re.compile(r"<link\b|<img\b|url\(|@import", re.IGNORECASE)
+# Quoted file names with an asset suffix, e.g. "assets/photo.jpg" in input JSON
+_QUOTED_ASSET = re.compile(
+    r"""['"]([^'"\s<>{}()]+\.(?:%s))['"]""" % "|".join(ext[1:] for ext in MEDIA_TYPES),
+    re.IGNORECASE,
+)
+_REMOTE = re.compile(
+    r"""(?:url\(\s*['"]?|@import\s+['"]|<img\b[^>]*?\bsrc\s*=\s*['"]?)"""
+    r"""\s*((?:https?:)?//[^'")\s>]+)""",
+    re.IGNORECASE,
+)
+
+# Path -> (mtime_ns, size, content hash) of files already read
+_file_hashes: dict[str, tuple[int, int, str]] = {}
+# Content hash -> data URI, shared by identical files
+_encoded: dict[str, str] = {}
+
+
+def asset_dirs(wd: Path | str) -> list[Path]:
+    """Directories searched for the assets of documents rendered from a template directory"""
+    wd = Path(wd)
+    dirs = [wd, wd / ASSET_DIR_NAME]
+    if ASSET_DIR:
+        dirs.insert(0, Path(ASSET_DIR))
+    return [d.resolve() for d in dirs if d.is_dir()]
+
+
+def _attributes(tag: str) -> dict[str, str]:
+    return {
+        name.lower(): double or single or bare
+        for name, double, single, bare in _ATTRIBUTE.findall(tag)
+    }
+
+
+def _is_remote(ref: str) -> bool:
+    return ref.startswith(("http://", "https://", "//"))
+
+
+def _remote_name(url: str) -> str:
+    """
+    Local file name of a remote asset: its own name, or a hash of the URL when
+    that has no known suffix or is not a plain file name once unquoted.
+    """
+    name = unquote(urlsplit(url).path.rsplit("/", 1)[-1])
+    suffix = Path(name).suffix.lower()
+    if suffix in MEDIA_TYPES and "/" not in name and "\\" not in name and ".." not in name:
+        return name
+    return hashlib.sha256(url.encode()).hexdigest()[:16] + (suffix if suffix in MEDIA_TYPES else ".bin")
+
+
+def _inside(path: Path, directory: Path) -> bool:
+    return path.resolve().is_relative_to(directory.resolve())
+
+
+def _fetch(url: str) -> Optional[Path]:
+    """Download a remote asset into RESUMEGEN_ASSET_DIR"""
+    # Imported lazily: fetching is opt-in
+    import requests
+
+    if not ASSET_DIR:
+        return None
+    target_dir = Path(ASSET_DIR).resolve()
+    target_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        response = requests.get("https:" + url if url.startswith("//") else url, timeout=10)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+    path = target_dir / _remote_name(url)
+    if not _inside(path, target_dir):
+        return None
+    path.write_bytes(response.content)
+    return path
+
+
+def resolve(
+    ref: str, dirs: Iterable[Path], base: Optional[Path] = None, fetch: bool = True
+) -> Optional[Path]:
+    """
+    Local file for a reference, or None. Local references must stay inside
+    the asset directories; remote ones are matched by file name (and
+    downloaded if enabled and `fetch` is true).
+    """
+    dirs = list(dirs)
+    ref = ref.strip()
+    if _is_remote(ref):
+        name = _remote_name(ref)
+        for directory in dirs:
+            path = directory / name
+            if path.is_file() and _inside(path, directory):
+                return path.resolve()
+        return _fetch(ref) if fetch and FETCH_ASSETS else None
+    if ref.startswith("file://"):
+        ref = unquote(urlsplit(ref).path)
+    else:
+        ref = unquote(ref.split("#", 1)[0].split("?", 1)[0])
+    if not ref or ":" in ref.split("/", 1)[0]:
+        return None
+    candidates = [Path(ref)] if Path(ref).is_absolute() else [
+        directory / ref for directory in ([base] if base else []) + dirs
+    ]
+    for candidate in candidates:
+        path = candidate.resolve()
+        if path.is_file() and any(path.is_relative_to(directory) for directory in dirs):
+            return path
+    return None
+
+
+def _content_hash(path: Path) -> tuple[str, Optional[bytes]]:
+    stat = path.stat()
+    cached = _file_hashes.get(str(path))
+    hit = cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size)
+    record_cache("asset", hit)
+    if hit:
+        return cached[2], None
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    _file_hashes[str(path)] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest, data
+
+
+def data_uri(path: Path) -> str:
+    """Base64 data URI of a file, cached by content hash"""
+    digest, data = _content_hash(path)
+    uri = _encoded.get(digest)
+    if uri is None:
+        if data is None:
+            data = path.read_bytes()
+        media_type = MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream")
+        uri = _encoded[digest] = f"data:{media_type};base64,{base64.b64encode(data).decode('ascii')}"
+    return uri
+
+
+def _stylesheet(path: Path, dirs: list[Path], seen: frozenset) -> str:
+    """Text of a linked or imported stylesheet with its references inlined"""
+    css = path.read_text(encoding="utf-8")
+    return inline_css(css, dirs, base=path.parent, seen=seen | {path})
+
+
+def inline_css(
+    css: str, dirs: Iterable[Path], base: Optional[Path] = None, seen: frozenset = frozenset()
+) -> str:
+    """Inline the ``@import`` rules and ``url(...)`` references of a stylesheet"""
+    dirs = list(dirs)
+
+    def import_rule(match: re.Match) -> str:
+        path = resolve(match["ref1"] or match["ref2"], dirs, base)
+        if path is None or path in seen:
+            return match.group(0)
+        css = _stylesheet(path, dirs, seen)
+        media = match["media"].strip()
+        return f"@media {media} {{\n{css}\n}}" if media else css
+
+    def url(match: re.Match) -> str:
+        ref = match["ref"]
+        if ref.startswith(("data:", "#")):
+            return match.group(0)
+        path = resolve(ref, dirs, base)
+        # Base64 data URIs need no quotes, which keeps them valid in style attributes
+        return match.group(0) if path is None else f"url({data_uri(path)})"
+
+    if "@import" in css:
+        css = _CSS_IMPORT.sub(import_rule, css)
+    return _CSS_URL.sub(url, css) if "url(" in css.lower() else css
+
+
+def references_assets(html: str) -> bool:
+    """Whether a document contains anything inline_assets could rewrite"""
+    return _REFERENCE.search(html) is not None
+
+
+def inline_assets(html: str, dirs: Iterable[Path]) -> str:
+    """
+    Replace the local (or locally available) fonts, images and stylesheets
+    referenced by a document with inline copies. References that cannot be
+    resolved are left as they are.
+    """
+    dirs = list(dirs)
+    if not dirs or not references_assets(html):
+        return html
+
+    def link(match: re.Match) -> str:
+        attributes = _attributes(match.group(0))
+        if "stylesheet" not in attributes.get("rel", "").lower().split() or not attributes.get("href"):
+            return match.group(0)
+        path = resolve(attributes["href"], dirs)
+        if path is None:
+            return match.group(0)
+        css = _stylesheet(path, dirs, frozenset())
+        media = attributes.get("media")
+        return f'<style media="{media}">{css}</style>' if media else f"<style>{css}</style>"
+
+    def image(match: re.Match) -> str:
+        ref = match["ref"]
+        path = None if ref.startswith("data:") else resolve(ref, dirs)
+        if path is None:
+            return match.group(0)
+        return f'{match.group(1)}{match["q"]}{data_uri(path)}{match["q"]}'
+
+    def style_block(match: re.Match) -> str:
+        return match.group(1) + inline_css(match.group(2), dirs) + match.group(3)
+
+    def style_attribute(match: re.Match) -> str:
+        return f'{match.group(1)}{match["q"]}{inline_css(match["css"], dirs)}{match["q"]}'
+
+    html = _LINK.sub(link, html)
+    html = _IMG_SRC.sub(image, html)
+    html = _STYLE_BLOCK.sub(style_block, html)
+    return _STYLE_ATTRIBUTE.sub(style_attribute, html)
+
+
+def _references(text: str) -> list[str]:
+    references = [m["ref"] for m in _CSS_URL.finditer(text)]
+    references += [m["ref1"] or m["ref2"] for m in _CSS_IMPORT.finditer(text)]
+    references += [m["ref"] for m in _IMG_SRC.finditer(text)]
+    references += [_attributes(m.group(0)).get("href", "") for m in _LINK.finditer(text)]
+    references += _QUOTED_ASSET.findall(text)
+    return [ref for ref in references if ref and not ref.startswith(("data:", "#"))]
+
+
+def referenced_files(texts: Iterable[str], dirs: Iterable[Path]) -> list[Path]:
+    """
+    Local asset files that templates, stylesheets or input documents refer
+    to, including the files of referenced stylesheets: the files whose
+    changes change the inlined output. Nothing is downloaded.
+    """
+    dirs = list(dirs)
+    files: dict[Path, None] = {}
+    pending = [(text, None) for text in texts]
+    while pending and dirs:
+        text, base = pending.pop()
+        for ref in _references(text):
+            path = resolve(ref, dirs, base, fetch=False)
+            if path is None or path in files:
+                continue
+            files[path] = None
+            if path.suffix.lower() == ".css":
+                pending.append((path.read_text(encoding="utf-8"), path.parent))
+    return sorted(files)
+
+
+def remote_references(html: str) -> list[str]:
+    """Remote URLs a browser would still fetch to lay out a document"""
+    references = _REMOTE.findall(html)
+    for match in _LINK.finditer(html):
+        attributes = _attributes(match.group(0))
+        if "stylesheet" in attributes.get("rel", "").lower().split() and _is_remote(
+            attributes.get("href", "")
+        ):
+            references.append(attributes["href"])
+    return references
+
+
+def wait_condition(html: str) -> str:
+    """
+    Puppeteer ``waitUntil`` for a document: ``load`` when nothing has to be
+    fetched from the network, otherwise ``networkidle0``.
+    """
+    if PDF_WAIT_UNTIL:
+        if PDF_WAIT_UNTIL not in WAIT_CONDITIONS:
+            raise ValueError(
+                f"RESUMEGEN_PDF_WAIT_UNTIL must be one of {', '.join(WAIT_CONDITIONS)}"
+            )
+        return PDF_WAIT_UNTIL
+    return "networkidle0" if remote_references(html) else "load"
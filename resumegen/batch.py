@@ -0,0 +1,421 @@
+"""Batch generation of many resumes and cover letters.
+
+Validation and rendering run in parallel worker processes; PDFs go through one
+shared, reused PDF backend with bounded concurrency, using the artifact store
+for scratch files and the shared result cache (RESUMEGEN_CACHE_DIR) if enabled.
+"""
+
+import glob
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from resumegen.build_cache import BuildManifest, build_fingerprint
+from resumegen.cache import PdfFiles
+from resumegen.memory import MemoryUsage, measure
+from resumegen.storage import OutputSink, check_output_name, load_json, save_html
+
+PERSONAL_INFO_PREFIX = "personal_info"
+MANIFEST_JOBS_KEY = "jobs"
+
+
+@dataclass
+class BatchJob:
+    """
+    One document to generate. The document type is detected from the input
+    content when not given.
+    """
+
+    input_path: Path
+    out_html: Path
+    out_pdf: Path
+    info_path: Optional[Path] = None
+    document_type: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    job: BatchJob
+    document_type: Optional[str] = None
+    error: Optional[str] = None
+    stage: Optional[str] = None  # Stage that failed: load, validation, render, save or pdf
+    skipped: bool = False  # Inputs unchanged since the last build
+    fingerprint: Optional[Dict[str, Any]] = None  # Build inputs, recorded on success
+    memory: Optional[MemoryUsage] = None  # Load to save, when traced
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def detect_document_type(data: Dict[str, Any]) -> str:
+    """
+    Tell cover letters from resumes by their required fields.
+    """
+    if "opening_paragraph" in data or "body_paragraphs" in data:
+        return "cover_letter"
+    return "resume"
+
+
+def _is_personal_info(path: Path) -> bool:
+    return path.name.startswith(PERSONAL_INFO_PREFIX)
+
+
+def _default_info_path(input_path: Path) -> Optional[Path]:
+    candidate = input_path.parent / f"{PERSONAL_INFO_PREFIX}.json"
+    return candidate if candidate.exists() else None
+
+
+def _output_names(inputs: List[Path]) -> List[str]:
+    """
+    Output base names: the input stem, prefixed by the parent directory when stems collide.
+    """
+    stems = [path.stem for path in inputs]
+    return [
+        f"{path.parent.name}_{path.stem}" if stems.count(path.stem) > 1 else path.stem
+        for path in inputs
+    ]
+
+
+def _load_manifest(path: Path) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the job entries of a manifest file, or None if the file is a plain input document.
+    """
+    data = load_json(path)
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and isinstance(data.get(MANIFEST_JOBS_KEY), list):
+        return data[MANIFEST_JOBS_KEY]
+    return None
+
+
+def discover_jobs(
+    source: Path | str,
+    out_dir: Path | str | None = None,
+    info_path: Path | str | None = None,
+) -> List[BatchJob]:
+    """
+    Build the job list from a directory, a glob pattern or a manifest.
+
+    A manifest is a JSON list (or an object with a "jobs" list) of entries like
+    {"input": "alice.json", "info": "alice_info.json", "type": "resume", "output": "alice"};
+    relative paths are resolved against the manifest's directory. An "output"
+    must be a plain file name (ValueError otherwise).
+
+    Personal information comes from `info_path` if given, then the manifest entry,
+    then a `personal_info.json` next to the input, otherwise it must be embedded.
+
+    Args:
+        source: Directory of JSON files, glob pattern, manifest or single input file.
+        out_dir: Directory for generated files. Defaults to an `output` directory next to the inputs.
+        info_path: Personal information file shared by all jobs.
+    """
+    source = str(source)
+    source_path = Path(source)
+    shared_info = Path(info_path).resolve() if info_path else None
+    entries: List[Dict[str, Any]]
+
+    if source_path.is_dir():
+        base_dir = source_path
+        inputs = sorted(p for p in source_path.glob("*.json") if not _is_personal_info(p))
+        entries = [{"input": p} for p in inputs]
+    elif any(char in source for char in "*?["):
+        base_dir = Path(".")
+        inputs = sorted(
+            Path(p)
+            for p in glob.glob(source, recursive=True)
+            if p.endswith(".json") and not _is_personal_info(Path(p))
+        )
+        entries = [{"input": p} for p in inputs]
+    elif source_path.is_file():
+        base_dir = source_path.parent
+        manifest = _load_manifest(source_path)
+        entries = manifest if manifest is not None else [{"input": source_path}]
+    else:
+        raise FileNotFoundError(f"No such directory, file or matching pattern: {source}")
+
+    if out_dir is None:
+        out_dir = base_dir / "output"
+    out_dir = Path(out_dir).resolve()
+
+    input_paths = [(base_dir / entry["input"]).resolve() for entry in entries]
+    names = _output_names(input_paths)
+    jobs = []
+    for entry, input_path, name in zip(entries, input_paths, names):
+        job_info = shared_info
+        if job_info is None and entry.get("info"):
+            job_info = (base_dir / entry["info"]).resolve()
+        if job_info is None:
+            job_info = _default_info_path(input_path)
+        if entry.get("output"):
+            name = check_output_name(entry["output"])
+        jobs.append(
+            BatchJob(
+                input_path=input_path,
+                out_html=out_dir / f"{name}.html",
+                out_pdf=out_dir / f"{name}.pdf",
+                info_path=job_info,
+                document_type=entry.get("type"),
+            )
+        )
+    return jobs
+
+
+def render_job(
+    job: BatchJob, save: bool = True, trace_memory: bool = False
+) -> tuple[BatchResult, Optional[str]]:
+    """
+    Load, validate, render and (unless `save` is False) save the HTML of one job.
+    Runs in a worker process; errors are returned instead of raised. With
+    `trace_memory`, the result records the memory used by the job.
+    """
+    if not trace_memory:
+        return _render_job(job, save)
+
+    with measure() as usage:
+        result, html_content = _render_job(job, save)
+    result.memory = usage
+    return result, html_content
+
+
+def _render_job(job: BatchJob, save: bool) -> tuple[BatchResult, Optional[str]]:
+    from resumegen.jinja_render import render_cover_letter, render_resume
+    from resumegen.utils import (
+        create_cover_letter_with_personal_info,
+        create_resume_with_personal_info,
+    )
+
+    result = BatchResult(job=job)
+    result.stage = "load"
+    try:
+        data = load_json(job.input_path)
+        info_data = load_json(job.info_path) if job.info_path else None
+        result.document_type = job.document_type or detect_document_type(data)
+
+        result.stage = "validation"
+        if result.document_type == "cover_letter":
+            document = create_cover_letter_with_personal_info(data, info_data)
+            result.stage = "render"
+            html_content = render_cover_letter(document)
+        else:
+            document = create_resume_with_personal_info(data, info_data)
+            result.stage = "render"
+            html_content = render_resume(document)
+
+        if save:
+            result.stage = "save"
+            job.out_html.parent.mkdir(parents=True, exist_ok=True)
+            save_html(html_content, job.out_html)
+    except Exception as e:
+        result.error = str(e)
+        return result, None
+
+    result.stage = None
+    return result, html_content
+
+
+def _job_outputs(job: BatchJob, generate_pdfs: bool) -> List[Path]:
+    return [job.out_html, job.out_pdf] if generate_pdfs else [job.out_html]
+
+
+def _job_fingerprint(job: BatchJob) -> Dict[str, Any]:
+    """
+    Build fingerprint of a job; the document type is read from the input if not set.
+    """
+    document_type = job.document_type or detect_document_type(load_json(job.input_path))
+    return build_fingerprint(document_type, job.input_path, job.info_path)
+
+
+def _convert_pdf(
+    backend,
+    result: BatchResult,
+    html_content: str,
+    sink: Optional[OutputSink] = None,
+    files: Optional[PdfFiles] = None,
+) -> BatchResult:
+    files = files or PdfFiles.from_env()
+    try:
+        if sink is None:
+            files.write(
+                html_content, result.job.out_pdf, lambda path: backend.render(html_content, path)
+            )
+        else:
+            pdf_bytes = files.render(html_content, lambda: backend.render(html_content))
+            sink.write(result.job.out_pdf.name, pdf_bytes)
+    except Exception as e:
+        result.error = str(e)
+        result.stage = "pdf"
+    return result
+
+
+def process_context():
+    """
+    Start method for render worker processes. Workers are started on demand
+    while PDF backend threads are already running, so avoid plain fork where
+    a safer start method exists.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def _write_html(sink: OutputSink, result: BatchResult, html_content: str) -> None:
+    try:
+        sink.write(result.job.out_html.name, html_content)
+    except Exception as e:
+        result.error = str(e)
+        result.stage = "save"
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    workers: Optional[int] = None,
+    pdf_concurrency: int = 4,
+    generate_pdfs: bool = True,
+    force: bool = False,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+    sink: Optional[OutputSink] = None,
+    trace_memory: bool = False,
+) -> List[BatchResult]:
+    """
+    Generate all jobs: validation and rendering across `workers` processes,
+    PDF conversion through one shared backend with at most `pdf_concurrency`
+    documents in flight. Failures are collected, not raised. Documents whose
+    inputs are unchanged since the last build are skipped unless `force` is set.
+
+    Args:
+        jobs: Documents to generate.
+        workers: Render processes. Defaults to the CPU count; 1 renders in-process.
+        pdf_concurrency: Maximum concurrent PDF conversions.
+        generate_pdfs: Convert rendered HTML to PDF.
+        force: Regenerate documents whose build manifest says they are up to date.
+        on_result: Called with each finished result (e.g. to advance a progress bar).
+        sink: Write every artifact into this sink (e.g. a streaming archive), named
+            after the job's output file names, instead of to the output paths.
+            Archives are always built in full, so the build manifest is not used.
+        trace_memory: Record the peak memory of each job's load, validation,
+            render and save in its result (slows rendering down).
+    """
+    from resumegen.pdf_service import open_pdf_backend
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results: List[BatchResult] = []
+
+    manifests: Dict[Path, BuildManifest] = {}
+
+    def manifest_for(job: BatchJob) -> BuildManifest:
+        directory = job.out_html.parent
+        if directory not in manifests:
+            manifests[directory] = BuildManifest(directory)
+        return manifests[directory]
+
+    def finish(result: BatchResult) -> None:
+        if sink is None and result.ok and not result.skipped and result.fingerprint is not None:
+            manifest_for(result.job).record(
+                _job_outputs(result.job, generate_pdfs), result.fingerprint
+            )
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    # Skip jobs whose outputs were built from identical inputs
+    fingerprints: Dict[Path, Optional[Dict[str, Any]]] = {}
+    todo: List[BatchJob] = []
+    for job in jobs:
+        if sink is not None:
+            todo.append(job)
+            continue
+        try:
+            fingerprint = _job_fingerprint(job)
+        except Exception:
+            # Unreadable input: let the render stage report the error
+            fingerprint = None
+        fingerprints[job.out_html] = fingerprint
+        if (
+            not force
+            and fingerprint is not None
+            and manifest_for(job).is_up_to_date(_job_outputs(job, generate_pdfs), fingerprint)
+        ):
+            finish(BatchResult(job=job, document_type=fingerprint["document_type"], skipped=True))
+        else:
+            todo.append(job)
+    jobs = todo
+
+    if not jobs:
+        return results
+
+    render_pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+        if workers > 1
+        else None
+    )
+    pdf_pool = ThreadPoolExecutor(max_workers=pdf_concurrency) if generate_pdfs else None
+    backend = None
+    files = None
+    # Jobs rendered or converted at a time: rendered HTML waits in memory for
+    # its conversion, so it must not pile up ahead of the PDF backend
+    max_in_flight = 2 * workers + pdf_concurrency
+    try:
+        if generate_pdfs:
+            backend = open_pdf_backend(pdf_concurrency)
+            files = PdfFiles.from_env()
+
+        queue = iter(jobs)
+        pending: set[Future] = set()
+        render_futures: set[Future] = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                job = next(queue, None)
+                if job is None:
+                    exhausted = True
+                    break
+                if render_pool is not None:
+                    future = render_pool.submit(render_job, job, sink is None, trace_memory)
+                else:
+                    future = Future()
+                    future.set_result(render_job(job, sink is None, trace_memory))
+                render_futures.add(future)
+                pending.add(future)
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                if future in render_futures:
+                    render_futures.discard(future)
+                    result, html_content = future.result()
+                    result.fingerprint = fingerprints.get(result.job.out_html)
+                    if result.ok and sink is not None:
+                        _write_html(sink, result, html_content)
+                    if result.ok and generate_pdfs:
+                        pending.add(
+                            pdf_pool.submit(_convert_pdf, backend, result, html_content, sink, files)
+                        )
+                    else:
+                        finish(result)
+                else:
+                    finish(future.result())
+    finally:
+        # Keep the progress made so far even if the batch was interrupted
+        for manifest in manifests.values():
+            manifest.save()
+        if render_pool is not None:
+            render_pool.shutdown(cancel_futures=True)
+        if pdf_pool is not None:
+            pdf_pool.shutdown(cancel_futures=True)
+        if backend is not None:
+            backend.close()
+
+    return results
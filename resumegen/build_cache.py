@@ -0,0 +1,168 @@
+"""Incremental builds: skip documents whose inputs have not changed.
+
+A build manifest (``.resumegen-manifest.json``) next to the generated files
+records, for each output, the hashes of everything it was built from: the
+input JSON, the personal information, the template, the stylesheet, the
+local assets inlined into the output and the resumegen version. A document is up to date when those hashes match and all
+of its outputs still exist.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_NAME = ".resumegen-manifest.json"
+MANIFEST_VERSION = 2
+
+# File hashes keyed by path, stored with the (mtime, size) they were computed for
+_hash_cache: Dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def resumegen_version() -> str:
+    try:
+        return version("resumegen")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def file_hash(path: Path | str | None) -> Optional[str]:
+    """
+    SHA-256 of a file's contents, memoized while the file is unchanged.
+    """
+    if path is None:
+        return None
+    path = Path(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _hash_cache.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    _hash_cache[str(path)] = (signature, digest)
+    return digest
+
+
+def template_paths(document_type: str) -> tuple[Path, Path]:
+    """
+    Template and stylesheet used to render a document type.
+    """
+    from resumegen.jinja_render import (
+        COVER_LETTER_TEMPLATE_NAME,
+        RESUME_TEMPLATE_NAME,
+        STYLE_NAME,
+        TEMPLATE_DIR,
+    )
+
+    template_name = (
+        COVER_LETTER_TEMPLATE_NAME if document_type == "cover_letter" else RESUME_TEMPLATE_NAME
+    )
+    return TEMPLATE_DIR / template_name, TEMPLATE_DIR / STYLE_NAME
+
+
+def asset_files(document_type: str, *inputs: Path | str | None) -> List[Path]:
+    """
+    Local assets (fonts, images, stylesheets) that get inlined into a document
+    type rendered from these inputs, found by scanning the template,
+    stylesheet and inputs for references (see resumegen.assets).
+    """
+    from resumegen import assets
+
+    if not assets.INLINE_ASSETS:
+        return []
+    template_path, style_path = template_paths(document_type)
+    texts = []
+    for path in (template_path, style_path, *inputs):
+        if path is not None:
+            try:
+                texts.append(Path(path).read_text(encoding="utf-8"))
+            except (FileNotFoundError, UnicodeDecodeError):
+                pass
+    return assets.referenced_files(texts, assets.asset_dirs(template_path.parent))
+
+
+def build_fingerprint(
+    document_type: str,
+    input_path: Path | str,
+    info_path: Path | str | None = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Hashes of every input a generated document depends on.
+    """
+    template_path, style_path = template_paths(document_type)
+    return {
+        "document_type": document_type,
+        "input": file_hash(input_path),
+        "personal_info": file_hash(info_path),
+        "template": file_hash(template_path),
+        "style": file_hash(style_path),
+        "assets": {
+            str(path): file_hash(path) for path in asset_files(document_type, input_path, info_path)
+        },
+        "resumegen": resumegen_version(),
+    }
+
+
+class BuildManifest:
+    """
+    Build records for the outputs in one directory.
+    """
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self.path = self.directory / MANIFEST_NAME
+        self.entries: Dict[str, Dict] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("outputs", {})
+        except (FileNotFoundError, ValueError, AttributeError):
+            pass
+
+    def _key(self, output: Path) -> str:
+        output = Path(output).resolve()
+        try:
+            return str(output.relative_to(self.directory.resolve()))
+        except ValueError:
+            return str(output)
+
+    def is_up_to_date(self, outputs: List[Path], fingerprint: Dict) -> bool:
+        """
+        True if the outputs were built from exactly these inputs and all still exist.
+        """
+        entry = self.entries.get(self._key(outputs[0]))
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        if entry.get("outputs") != [self._key(output) for output in outputs]:
+            return False
+        return all(Path(output).exists() for output in outputs)
+
+    def record(self, outputs: List[Path], fingerprint: Dict) -> None:
+        self.entries[self._key(outputs[0])] = {
+            "fingerprint": fingerprint,
+            "outputs": [self._key(output) for output in outputs],
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Atomically write the manifest if anything was recorded.
+        """
+        if not self._dirty:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, prefix=".tmp-manifest-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": MANIFEST_VERSION, "outputs": self.entries}, f, indent=2, sort_keys=True
+                )
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._dirty = False
@@ -0,0 +1,95 @@
+"""Disk-backed result cache shared between API worker processes, CLI runs and batch jobs."""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Optional
+
+from resumegen.artifacts import ArtifactStore, artifact_store_from_env
+
+# Directory of the shared result cache; caching is disabled when unset
+CACHE_DIR_ENV = "RESUMEGEN_CACHE_DIR"
+
+# The result cache is an artifact store; the name is kept for existing callers
+ResultCache = ArtifactStore
+
+
+def result_cache_from_env(name: str = "pdf") -> ArtifactStore | None:
+    """
+    Return the shared cache configured by RESUMEGEN_CACHE_DIR, or None if disabled.
+    Its size cap and TTL come from RESUMEGEN_ARTIFACT_MAX_BYTES and RESUMEGEN_ARTIFACT_TTL.
+    """
+    directory = os.getenv(CACHE_DIR_ENV)
+    return ArtifactStore(directory, name) if directory else None
+
+
+def pdf_cache_key(cache: ArtifactStore, html_content: str) -> str:
+    """Key of the PDF of rendered HTML, the same for the API, CLI and batch jobs"""
+    from resumegen.pdf_service import pdf_backend_name
+
+    return cache.key(pdf_backend_name(), html_content)
+
+
+class PdfFiles:
+    """
+    PDF conversions outside the API: the shared result cache, if enabled,
+    and the artifact store whose scratch directories hold unfinished files.
+    """
+
+    def __init__(self, cache: Optional[ArtifactStore], store: ArtifactStore):
+        self.cache = cache
+        self.store = store
+
+    @classmethod
+    def from_env(cls) -> "PdfFiles":
+        """The stores the API uses too: RESUMEGEN_CACHE_DIR and RESUMEGEN_ARTIFACT_DIR"""
+        cache = result_cache_from_env("pdf")
+        return cls(cache, cache if cache is not None else artifact_store_from_env("pdf"))
+
+    def write(
+        self, html_content: str, pdf_path: Path | str, convert: Callable[[Path], None]
+    ) -> None:
+        """
+        Write the PDF of rendered HTML to `pdf_path`: copied from the result
+        cache when it is there, otherwise produced by `convert(path)` in a
+        scratch directory, then copied out and moved into the cache. `pdf_path`
+        is only replaced by a complete file.
+        """
+        pdf_path = Path(pdf_path)
+        cache = self.cache
+        key = pdf_cache_key(cache, html_content) if cache is not None else None
+        if key is not None:
+            cached = cache.path(key)
+            if cached is not None:
+                _copy_into_place(cached, pdf_path)
+                return
+        with self.store.scratch() as scratch:
+            pdf_file = scratch / pdf_path.name
+            convert(pdf_file)
+            _copy_into_place(pdf_file, pdf_path)
+            if key is not None:
+                cache.put_file(key, pdf_file)
+
+    def render(self, html_content: str, convert: Callable[[], bytes]) -> bytes | memoryview:
+        """PDF bytes of rendered HTML, from the result cache or `convert()`"""
+        cache = self.cache
+        if cache is None:
+            return convert()
+        key = pdf_cache_key(cache, html_content)
+        cached = cache.read(key)
+        if cached is not None:
+            return cached
+        pdf_bytes = convert()
+        cache.put(key, pdf_bytes)
+        return pdf_bytes
+
+
+def _copy_into_place(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -1,19 +1,109 @@
-from typer import Typer, Option
+from typer import Typer, Option, Argument, Exit
 from typing import Annotated
 from pathlib import Path
+from contextlib import nullcontext
 import json
-from resumegen.jinja_render import render_resume, render_cover_letter
 from resumegen.storage import save_html, load_json
-from resumegen.models import Resume, CoverLetter, PersonalInfo
-from resumegen.pdf_service import generate_pdf
-from resumegen.utils import create_resume_with_personal_info, create_cover_letter_with_personal_info
+from resumegen.timings import Timings
 from rich import print
 
+# Rendering, validation and PDF modules (jinja2, pydantic, requests) are imported
+# inside the commands so that `resumegen --help` and shell completion stay fast.
+
 app = Typer(no_args_is_help=True)
 
 DATA_PATH = Path(__file__).parent.parent / "data"
 
 
+def print_timings(timings: Timings, title: str) -> None:
+    """
+    Print a per-stage timing breakdown as a table.
+    """
+    from rich.table import Table
+
+    table = Table(title=title)
+    table.add_column("Stage")
+    table.add_column("ms", justify="right")
+    for name, duration in timings.stages.items():
+        table.add_row(name, f"{duration:.2f}")
+    table.add_row("total", f"{timings.total_ms:.2f}", style="bold")
+    print(table)
+
+
+def print_memory(rows: list, title: str = "Memory") -> None:
+    """
+    Print per-document memory usage given (document, MemoryUsage) pairs.
+    """
+    from rich.table import Table
+    from resumegen.memory import format_bytes
+
+    table = Table(title=title)
+    table.add_column("Document")
+    table.add_column("Peak traced", justify="right")
+    table.add_column("Retained", justify="right")
+    table.add_column("Peak RSS", justify="right")
+    for name, usage in rows:
+        table.add_row(
+            name,
+            format_bytes(usage.peak_bytes),
+            format_bytes(usage.retained_bytes),
+            format_bytes(usage.peak_rss_bytes),
+        )
+    print(table)
+
+
+def optimize_pdf_file(pdf_path: Path, optimizations: tuple, document_type: str) -> None:
+    """
+    Post-process a generated PDF in place and print the bytes saved.
+    """
+    from resumegen.memory import format_bytes
+    from resumegen.pdf_optimize import optimize_pdf
+    from resumegen.timings import stage
+
+    with stage("optimize"):
+        result = optimize_pdf(pdf_path.read_bytes(), optimizations, document_type)
+        if result.saved_bytes:
+            pdf_path.write_bytes(result.pdf)
+    print(
+        f"PDF optimized ({', '.join(optimizations)}): saved {format_bytes(result.saved_bytes)}"
+        f" of {format_bytes(result.original_bytes)}"
+    )
+
+
+def fit_document(document, pages: int, prune: list[str] | None = None):
+    """
+    Fit a resume or cover letter to a page count, confirming the layout with
+    the PDF backend, and print the adjustments that were needed.
+    """
+    from resumegen.layout import fit_to_pages
+    from resumegen.pdf_service import open_pdf_backend
+
+    try:
+        with open_pdf_backend(concurrency=1) as backend:
+            fit = fit_to_pages(document, pages, backend.render, prune=prune or ())
+    except ValueError as e:
+        print(str(e))
+        raise Exit(code=2)
+
+    settings = fit.settings
+    adjustments = (
+        "no adjustments"
+        if settings.is_default
+        else f"font {settings.font_scale:.0%}, spacing {settings.spacing:.0%}, zoom {settings.zoom:.0%}"
+    )
+    if fit.pruned:
+        adjustments += f", dropped {', '.join(fit.pruned)}"
+    renders = f"{fit.pdf_renders} PDF render{'s' if fit.pdf_renders != 1 else ''}"
+    if fit.fits:
+        print(f"Fitted to {fit.pages} page(s) with {adjustments} ({renders})")
+    else:
+        print(
+            f"[yellow]Could not fit into {pages} page(s):[/yellow] the PDF has {fit.pages} pages"
+            f" with {adjustments} ({renders})"
+        )
+    return fit
+
+
 @app.command()
 def generate_resume(
     resume_path: Annotated[
@@ -40,11 +130,75 @@ def generate_resume(
             help="Path to save the generated PDF file. Defaults to 'data/resume.pdf'."
         ),
     ] = None,
+    timings: Annotated[
+        bool,
+        Option(
+            "--timings",
+            help="Print the time spent in each generation stage.",
+        ),
+    ] = False,
+    force: Annotated[
+        bool,
+        Option(
+            "--force",
+            help="Regenerate even if the inputs are unchanged since the last build.",
+        ),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        Option(
+            help="Write a CPU profile of the generation to this file: pstats (.prof, .pstats) or flame graph folded stacks (.folded)."
+        ),
+    ] = None,
+    memory: Annotated[
+        bool,
+        Option(
+            "--memory",
+            help="Report peak traced memory, retained memory and peak RSS of the document (slows generation down).",
+        ),
+    ] = False,
+    pages: Annotated[
+        int | None,
+        Option(
+            min=1,
+            help="Fit the document to this many pages by reducing font size, spacing and zoom as needed.",
+        ),
+    ] = None,
+    prune: Annotated[
+        list[str] | None,
+        Option(
+            help="With --pages, a section that may be dropped if the document does not fit otherwise (repeatable, dropped in the given order): publications, achievements, certifications, projects or additional_skills.",
+        ),
+    ] = None,
+    optimize_pdf: Annotated[
+        str | None,
+        Option(
+            help="Shrink the PDF after generation: comma-separated compress, dedupe and metadata, or all. Defaults to RESUMEGEN_PDF_OPTIMIZE.",
+        ),
+    ] = None,
 ) -> None:
     """
     Generate a resume in HTML and PDF format from a JSON input file.
     """
+    from resumegen.jinja_render import render_resume
+    from resumegen.cache import PdfFiles
+    from resumegen.pdf_service import generate_pdf
+    from resumegen.utils import create_resume_with_personal_info
+    from resumegen.build_cache import BuildManifest, build_fingerprint
+    from resumegen.memory import measure
+    from resumegen.profiling import profile_to
+    from resumegen.pdf_optimize import DEFAULT_OPTIMIZATIONS, parse_optimizations
 
+    if prune and pages is None:
+        print("--prune requires --pages")
+        raise Exit(code=2)
+    try:
+        optimizations = (
+            DEFAULT_OPTIMIZATIONS if optimize_pdf is None else parse_optimizations(optimize_pdf)
+        )
+    except ValueError as e:
+        print(str(e))
+        raise Exit(code=2)
     if resume_path is None:
         resume_path = DATA_PATH / "resume.json"
     if info_path is None:
@@ -59,16 +213,60 @@ def generate_resume(
     out_html = Path(out_html).resolve()
     out_pdf = Path(out_pdf).resolve()
 
-    resume_data = load_json(resume_path)
-    info_data = load_json(info_path) if info_path else None
+    # Skip the build if nothing it depends on changed since the last run
+    manifest = BuildManifest(out_html.parent)
+    outputs = [out_html, out_pdf]
+    fingerprint = build_fingerprint("resume", resume_path, info_path)
+    if pages is not None:
+        fingerprint["fit"] = {"pages": pages, "prune": prune or []}
+    if optimizations:
+        fingerprint["pdf_optimize"] = list(optimizations)
+    if not force and manifest.is_up_to_date(outputs, fingerprint):
+        print(f"Resume is up to date: {out_html} (use --force to rebuild)")
+        return
+
+    stage_timings = Timings("resume")
+    memory_usage = measure() if memory else nullcontext()
+    with profile_to(profile), memory_usage as usage, stage_timings.activate():
+        with stage_timings.stage("load"):
+            resume_data = load_json(resume_path)
+            info_data = load_json(info_path) if info_path else None
+
+        with stage_timings.stage("validation"):
+            resume = create_resume_with_personal_info(resume_data, info_data)
 
-    resume = create_resume_with_personal_info(resume_data, info_data)
+        fit = None
+        if pages is None:
+            with stage_timings.stage("render"):
+                html_content = render_resume(resume)
+        else:
+            fit = fit_document(resume, pages, prune)
+            html_content = fit.html
+        with stage_timings.stage("save"):
+            save_html(html_content, out_html)
+        print(f"Resume HTML saved to {out_html}")
+        with stage_timings.stage("pdf"):
+            if fit is None:
+                PdfFiles.from_env().write(
+                    html_content, out_pdf, lambda path: generate_pdf(out_html, path)
+                )
+            else:
+                out_pdf.write_bytes(fit.pdf)
+        print(f"Resume PDF saved to {out_pdf}")
+        if optimizations:
+            optimize_pdf_file(out_pdf, optimizations, "resume")
 
-    html_content = render_resume(resume)
-    save_html(html_content, out_html)
-    print(f"Resume HTML saved to {out_html}")
-    generate_pdf(out_html, out_pdf)
-    print(f"Resume PDF saved to {out_pdf}")
+    manifest.record(outputs, fingerprint)
+    manifest.save()
+
+    if profile:
+        print(f"CPU profile saved to {profile}")
+    if timings:
+        print_timings(stage_timings, "Resume timings")
+    if memory:
+        print_memory([(out_html.stem, usage)], "Resume memory")
+    if fit is not None and not fit.fits:
+        raise Exit(code=1)
 
 
 @app.command()
@@ -97,10 +295,67 @@ def generate_cover_letter(
             help="Path to save the generated PDF file. Defaults to 'data/cover_letter.pdf'."
         ),
     ] = None,
+    timings: Annotated[
+        bool,
+        Option(
+            "--timings",
+            help="Print the time spent in each generation stage.",
+        ),
+    ] = False,
+    force: Annotated[
+        bool,
+        Option(
+            "--force",
+            help="Regenerate even if the inputs are unchanged since the last build.",
+        ),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        Option(
+            help="Write a CPU profile of the generation to this file: pstats (.prof, .pstats) or flame graph folded stacks (.folded)."
+        ),
+    ] = None,
+    memory: Annotated[
+        bool,
+        Option(
+            "--memory",
+            help="Report peak traced memory, retained memory and peak RSS of the document (slows generation down).",
+        ),
+    ] = False,
+    pages: Annotated[
+        int | None,
+        Option(
+            min=1,
+            help="Fit the document to this many pages by reducing font size, spacing and zoom as needed.",
+        ),
+    ] = None,
+    optimize_pdf: Annotated[
+        str | None,
+        Option(
+            help="Shrink the PDF after generation: comma-separated compress, dedupe and metadata, or all. Defaults to RESUMEGEN_PDF_OPTIMIZE.",
+        ),
+    ] = None,
 ) -> None:
     """
     Generate a cover letter in HTML and PDF format from a JSON input file.
     """
+    from resumegen.jinja_render import render_cover_letter
+    from resumegen.cache import PdfFiles
+    from resumegen.pdf_service import generate_pdf
+    from resumegen.utils import create_cover_letter_with_personal_info
+    from resumegen.build_cache import BuildManifest, build_fingerprint
+    from resumegen.memory import measure
+    from resumegen.profiling import profile_to
+    from resumegen.pdf_optimize import DEFAULT_OPTIMIZATIONS, parse_optimizations
+
+    try:
+        optimizations = (
+            DEFAULT_OPTIMIZATIONS if optimize_pdf is None else parse_optimizations(optimize_pdf)
+        )
+    except ValueError as e:
+        print(str(e))
+        raise Exit(code=2)
+
     if info_path is None:
         info_path = DATA_PATH / "personal_info.json"
     if letter_path is None:
@@ -115,16 +370,545 @@ def generate_cover_letter(
     out_html = Path(out_html).resolve()
     out_pdf = Path(out_pdf).resolve()
 
-    info_data = load_json(info_path) if info_path else None
-    letter_data = load_json(letter_path)
+    # Skip the build if nothing it depends on changed since the last run
+    manifest = BuildManifest(out_html.parent)
+    outputs = [out_html, out_pdf]
+    fingerprint = build_fingerprint("cover_letter", letter_path, info_path)
+    if pages is not None:
+        fingerprint["fit"] = {"pages": pages}
+    if optimizations:
+        fingerprint["pdf_optimize"] = list(optimizations)
+    if not force and manifest.is_up_to_date(outputs, fingerprint):
+        print(f"Cover letter is up to date: {out_html} (use --force to rebuild)")
+        return
+
+    stage_timings = Timings("cover_letter")
+    memory_usage = measure() if memory else nullcontext()
+    with profile_to(profile), memory_usage as usage, stage_timings.activate():
+        with stage_timings.stage("load"):
+            info_data = load_json(info_path) if info_path else None
+            letter_data = load_json(letter_path)
+
+        with stage_timings.stage("validation"):
+            cover_letter = create_cover_letter_with_personal_info(letter_data, info_data)
+
+        fit = None
+        if pages is None:
+            with stage_timings.stage("render"):
+                html_content = render_cover_letter(cover_letter)
+        else:
+            fit = fit_document(cover_letter, pages)
+            html_content = fit.html
+        with stage_timings.stage("save"):
+            save_html(html_content, out_html)
+        print(f"Cover letter HTML saved to {out_html}")
+        with stage_timings.stage("pdf"):
+            if fit is None:
+                PdfFiles.from_env().write(
+                    html_content, out_pdf, lambda path: generate_pdf(out_html, path)
+                )
+            else:
+                out_pdf.write_bytes(fit.pdf)
+        print(f"Cover letter PDF saved to {out_pdf}")
+        if optimizations:
+            optimize_pdf_file(out_pdf, optimizations, "cover_letter")
+
+    manifest.record(outputs, fingerprint)
+    manifest.save()
+
+    if profile:
+        print(f"CPU profile saved to {profile}")
+    if timings:
+        print_timings(stage_timings, "Cover letter timings")
+    if memory:
+        print_memory([(out_html.stem, usage)], "Cover letter memory")
+    if fit is not None and not fit.fits:
+        raise Exit(code=1)
 
-    cover_letter = create_cover_letter_with_personal_info(letter_data, info_data)
 
-    html_content = render_cover_letter(cover_letter)
-    save_html(html_content, out_html)
-    print(f"Cover letter HTML saved to {out_html}")
-    generate_pdf(out_html, out_pdf)
-    print(f"Cover letter PDF saved to {out_pdf}")
+@app.command()
+def generate_batch(
+    source: Annotated[
+        str,
+        Argument(
+            help="Directory of JSON files, glob pattern (quoted), manifest JSON listing the documents, or a JSON Lines file ('-' for stdin)."
+        ),
+    ],
+    info_path: Annotated[
+        str | None,
+        Option(
+            help="Personal information JSON shared by all documents. Defaults to a 'personal_info.json' next to each input."
+        ),
+    ] = None,
+    out_dir: Annotated[
+        str | None,
+        Option(
+            help="Directory for the generated files. Defaults to an 'output' directory next to the inputs."
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        Option(help="Processes used for validation and rendering. Defaults to the CPU count."),
+    ] = None,
+    pdf_concurrency: Annotated[
+        int,
+        Option(help="Maximum number of PDFs converted at the same time."),
+    ] = 4,
+    no_pdf: Annotated[
+        bool,
+        Option("--no-pdf", help="Only generate HTML files."),
+    ] = False,
+    force: Annotated[
+        bool,
+        Option(
+            "--force",
+            help="Regenerate even if the inputs are unchanged since the last build.",
+        ),
+    ] = False,
+    archive: Annotated[
+        str | None,
+        Option(
+            help="Write all outputs straight into this .zip, .tar or .tar.gz archive instead of separate files."
+        ),
+    ] = None,
+    profile: Annotated[
+        str | None,
+        Option(
+            help="Write a CPU profile of the run to this file: pstats (.prof, .pstats) or flame graph folded stacks (.folded). Worker processes are not profiled, so --workers defaults to 1."
+        ),
+    ] = None,
+    memory: Annotated[
+        bool,
+        Option(
+            "--memory",
+            help="Report peak traced memory, retained memory and peak RSS per document, measured in the render worker (slows rendering down).",
+        ),
+    ] = False,
+) -> None:
+    """
+    Generate many resumes and cover letters in parallel.
+
+    A JSON Lines file (.jsonl, or '-' for stdin) is streamed record by record
+    with constant memory instead.
+    """
+    from rich.progress import Progress
+    from rich.table import Table
+    from resumegen.batch import discover_jobs, run_batch
+    from resumegen.profiling import profile_to
+    from resumegen.storage import is_archive, open_sink
+
+    if archive is not None and not is_archive(archive):
+        print(f"Unsupported archive type: {archive} (use .zip, .tar or .tar.gz)")
+        raise Exit(code=2)
+    if profile is not None and workers is None:
+        # Only the main process is profiled, so render in-process
+        workers = 1
+
+    if source == "-" or Path(source).suffix.lower() in (".jsonl", ".ndjson"):
+        if memory:
+            print("--memory is not supported for JSON Lines input")
+            raise Exit(code=2)
+        with profile_to(profile):
+            generate_stream(source, info_path, out_dir, workers, pdf_concurrency, no_pdf, archive)
+        return
+
+    jobs = discover_jobs(source, out_dir=out_dir, info_path=info_path)
+    if not jobs:
+        print(f"No input files found in {source}")
+        raise Exit(code=1)
+
+    sink = open_sink(archive) if archive is not None else None
+    try:
+        with profile_to(profile), Progress() as progress:
+            task = progress.add_task("Generating documents", total=len(jobs))
+            results = run_batch(
+                jobs,
+                workers=workers,
+                pdf_concurrency=pdf_concurrency,
+                generate_pdfs=not no_pdf,
+                force=force,
+                on_result=lambda result: progress.advance(task),
+                sink=sink,
+                trace_memory=memory,
+            )
+    finally:
+        if sink is not None:
+            sink.close()
+
+    failures = [result for result in results if not result.ok]
+    skipped = [result for result in results if result.skipped]
+    generated = len(results) - len(failures) - len(skipped)
+    print(
+        f"Generated {generated} of {len(results)} documents in {archive or jobs[0].out_html.parent}"
+        f" ({len(skipped)} up to date, {len(failures)} failed)"
+    )
+    if profile:
+        print(f"CPU profile saved to {profile}")
+    if memory:
+        print_memory(
+            sorted(
+                (str(result.job.input_path.name), result.memory)
+                for result in results
+                if result.memory is not None
+            ),
+            "Memory per document",
+        )
+    if failures:
+        table = Table(title="Failures")
+        table.add_column("Input")
+        table.add_column("Stage")
+        table.add_column("Error")
+        for result in sorted(failures, key=lambda r: str(r.job.input_path)):
+            table.add_row(str(result.job.input_path), result.stage or "", result.error)
+        print(table)
+        raise Exit(code=1)
+
+
+def generate_stream(
+    source: str,
+    info_path: str | None,
+    out_dir: str | None,
+    workers: int | None,
+    pdf_concurrency: int,
+    no_pdf: bool,
+    archive: str | None = None,
+) -> None:
+    """
+    Stream a JSON Lines file through the generation pipeline, reporting
+    failed lines as they happen.
+    """
+    import sys
+    from rich.progress import Progress
+    from resumegen.storage import open_sink
+    from resumegen.stream import stream_jsonl
+
+    if out_dir is None:
+        out_dir = Path("output") if source == "-" else Path(source).resolve().parent / "output"
+    out_dir = Path(out_dir).resolve()
+    stream_source = sys.stdin if source == "-" else source
+
+    total = failed = 0
+    sink = open_sink(archive) if archive is not None else None
+    try:
+        with Progress() as progress:
+            task = progress.add_task("Generating documents", total=None)
+            for result in stream_jsonl(
+                stream_source,
+                out_dir,
+                info_path=info_path,
+                workers=workers,
+                pdf_concurrency=pdf_concurrency,
+                generate_pdfs=not no_pdf,
+                sink=sink,
+            ):
+                total += 1
+                if not result.ok:
+                    failed += 1
+                    progress.console.print(
+                        f"[red]✗ line {result.line}[/red] ({result.stage}): {result.error}"
+                    )
+                progress.advance(task)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    print(
+        f"Generated {total - failed} of {total} documents in {archive or out_dir} ({failed} failed)"
+    )
+    if failed:
+        raise Exit(code=1)
+
+
+@app.command()
+def generate_variants(
+    variants_path: Annotated[
+        str,
+        Argument(
+            help="Variants JSON with a 'base' document and a list of 'variants' overlays (merge or JSON Patch)."
+        ),
+    ],
+    info_path: Annotated[
+        str | None,
+        Option(
+            help="Personal information JSON. Overrides the 'personal_info' given in the variants file."
+        ),
+    ] = None,
+    out_dir: Annotated[
+        str | None,
+        Option(
+            help="Directory for the generated files. Defaults to an 'output' directory next to the variants file."
+        ),
+    ] = None,
+    pdf_concurrency: Annotated[
+        int,
+        Option(help="Maximum number of PDFs converted at the same time."),
+    ] = 4,
+    no_pdf: Annotated[
+        bool,
+        Option("--no-pdf", help="Only generate HTML files."),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        Option(
+            help="Write a CPU profile of the run to this file: pstats (.prof, .pstats) or flame graph folded stacks (.folded)."
+        ),
+    ] = None,
+) -> None:
+    """
+    Generate tailored variants of one base resume or cover letter in a single run.
+    """
+    from rich.progress import Progress
+    from rich.table import Table
+    from resumegen.profiling import profile_to
+    from resumegen.variants import load_variant_set, run_variants
+
+    variants_path = Path(variants_path).resolve()
+    variant_set = load_variant_set(variants_path, info_path=info_path)
+    if out_dir is None:
+        out_dir = variants_path.parent / "output"
+    out_dir = Path(out_dir).resolve()
+
+    with profile_to(profile), Progress() as progress:
+        task = progress.add_task("Generating variants", total=len(variant_set.variants))
+        results = run_variants(
+            variant_set,
+            out_dir,
+            generate_pdfs=not no_pdf,
+            pdf_concurrency=pdf_concurrency,
+            on_result=lambda result: progress.advance(task),
+        )
+
+    failures = [result for result in results if not result.ok]
+    print(
+        f"Generated {len(results) - len(failures)} of {len(results)} variants in {out_dir}"
+        f" ({len(failures)} failed)"
+    )
+    if profile:
+        print(f"CPU profile saved to {profile}")
+    if failures:
+        table = Table(title="Failures")
+        table.add_column("Variant")
+        table.add_column("Stage")
+        table.add_column("Error")
+        for result in failures:
+            table.add_row(result.name, result.stage or "", result.error)
+        print(table)
+        raise Exit(code=1)
+
+
+@app.command()
+def loadtest(
+    url: Annotated[
+        str | None,
+        Option(help="Base URL of a running API. Defaults to serving the API in-process."),
+    ] = None,
+    requests: Annotated[
+        int | None,
+        Option(help="Number of requests to send. Defaults to 200 unless --duration is given."),
+    ] = None,
+    duration: Annotated[
+        float | None,
+        Option(help="Seconds to keep sending requests."),
+    ] = None,
+    concurrency: Annotated[
+        int,
+        Option(help="Concurrent requests (workers, or the in-flight limit with --rate)."),
+    ] = 8,
+    rate: Annotated[
+        float | None,
+        Option(help="Target requests per second (open loop). Defaults to back-to-back requests."),
+    ] = None,
+    mix: Annotated[
+        str,
+        Option(help="Document mix, e.g. 'resume=3,cover_letter=1'."),
+    ] = "resume=1,cover_letter=1",
+    entries: Annotated[
+        str,
+        Option(help="Items per list: N, A-B (uniform) or exp:MEAN."),
+    ] = "1-5",
+    words: Annotated[
+        str,
+        Option(help="Words per text field: N, A-B (uniform) or exp:MEAN."),
+    ] = "3-20",
+    output_format: Annotated[
+        str,
+        Option(help="output_format of the requests: html, pdf or both."),
+    ] = "html",
+    stub_pdf: Annotated[
+        bool,
+        Option("--stub-pdf/--real-pdf", help="Send PDF conversions to a local stub service (in-process mode)."),
+    ] = True,
+    pdf_latency: Annotated[
+        float,
+        Option(help="Seconds the stub PDF service takes per document."),
+    ] = 0.2,
+    pdf_jitter: Annotated[
+        float,
+        Option(help="Extra random stub latency, up to this many seconds."),
+    ] = 0.0,
+    pdf_error_rate: Annotated[
+        float,
+        Option(help="Fraction of stub PDF requests that fail with 500."),
+    ] = 0.0,
+    seed: Annotated[
+        int | None,
+        Option(help="Random seed for reproducible payloads."),
+    ] = None,
+    output: Annotated[
+        str | None,
+        Option(help="Save the report as JSON to this path."),
+    ] = None,
+) -> None:
+    """
+    Load-test the API with synthetic resumes and cover letters.
+    """
+    from rich.table import Table
+    from resumegen.loadtest import loadtest as run_loadtest
+
+    if requests is None and duration is None:
+        requests = 200
+    report = run_loadtest(
+        url=url,
+        requests=requests,
+        duration=duration,
+        concurrency=concurrency,
+        rate=rate,
+        mix=mix,
+        entries=entries,
+        words=words,
+        output_format=output_format,
+        stub_pdf=stub_pdf,
+        pdf_latency=pdf_latency,
+        pdf_jitter=pdf_jitter,
+        pdf_error_rate=pdf_error_rate,
+        seed=seed,
+    ).as_dict()
+
+    summary = Table(title="Load test")
+    summary.add_column("Metric")
+    summary.add_column("Value", justify="right")
+    summary.add_row("requests", str(report["requests"]))
+    summary.add_row("duration (s)", f"{report['duration_s']:.2f}")
+    summary.add_row("throughput (req/s)", f"{report['throughput_rps']:.1f}")
+    summary.add_row("error rate", f"{report['error_rate']:.2%}")
+    for name, value in report["latency_ms"].items():
+        summary.add_row(f"latency {name} (ms)", f"{value:.1f}")
+    for status, count in report["statuses"].items():
+        summary.add_row(f"status {status}", str(count))
+    for error, count in report["errors"].items():
+        summary.add_row(f"error {error}", str(count))
+    print(summary)
+
+    histogram = Table(title="Latency histogram")
+    histogram.add_column("≤ ms", justify="right")
+    histogram.add_column("requests", justify="right")
+    histogram.add_column("")
+    largest = max(report["histogram_ms"].values(), default=1)
+    for bound, count in report["histogram_ms"].items():
+        histogram.add_row(bound, str(count), "█" * max(1, round(30 * count / largest)))
+    print(histogram)
+
+    if output is not None:
+        Path(output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Report saved to {output}")
+
+
+@app.command()
+def watch(
+    source: Annotated[
+        str,
+        Argument(
+            help="Directory of JSON files, glob pattern (quoted) or manifest JSON listing the documents."
+        ),
+    ],
+    info_path: Annotated[
+        str | None,
+        Option(
+            help="Personal information JSON shared by all documents. Defaults to a 'personal_info.json' next to each input."
+        ),
+    ] = None,
+    out_dir: Annotated[
+        str | None,
+        Option(
+            help="Directory for the generated files. Defaults to an 'output' directory next to the inputs."
+        ),
+    ] = None,
+    no_pdf: Annotated[
+        bool,
+        Option("--no-pdf", help="Only generate HTML files."),
+    ] = False,
+    debounce: Annotated[
+        float,
+        Option(help="Seconds to wait for further changes before rebuilding."),
+    ] = 0.3,
+    poll_interval: Annotated[
+        float,
+        Option(help="Seconds between checks for changed files."),
+    ] = 0.5,
+) -> None:
+    """
+    Watch inputs, templates and the stylesheet, and regenerate affected documents on change.
+    """
+    from resumegen.watch import Watcher
+
+    def report(result) -> None:
+        if not result.ok:
+            print(f"[red]✗ {result.job.input_path.name}[/red] ({result.stage}): {result.error}")
+        elif result.skipped:
+            print(f"✓ {result.job.out_html} (HTML unchanged, PDF kept)")
+        else:
+            print(f"✓ {result.job.out_html}")
+
+    watcher = Watcher(
+        source,
+        out_dir=out_dir,
+        info_path=info_path,
+        generate_pdfs=not no_pdf,
+        debounce=debounce,
+        poll_interval=poll_interval,
+        on_result=report,
+    )
+    print(f"Watching {source} (Ctrl+C to stop)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def prune_artifacts(
+    directory: Annotated[
+        str | None,
+        Argument(
+            help="Artifact store or result cache directory. Defaults to RESUMEGEN_CACHE_DIR, then RESUMEGEN_ARTIFACT_DIR."
+        ),
+    ] = None,
+    max_bytes: Annotated[
+        int | None,
+        Option(help="Size cap in bytes (0 for none). Defaults to RESUMEGEN_ARTIFACT_MAX_BYTES."),
+    ] = None,
+    ttl: Annotated[
+        float | None,
+        Option(help="Seconds since last use after which artifacts expire (0 for never). Defaults to RESUMEGEN_ARTIFACT_TTL."),
+    ] = None,
+) -> None:
+    """
+    Remove leftover temporary files, expired artifacts and least recently used artifacts over the size cap.
+    """
+    import os
+    from resumegen import artifacts
+    from resumegen.cache import CACHE_DIR_ENV
+    from resumegen.memory import format_bytes
+
+    directory = directory or os.getenv(CACHE_DIR_ENV) or artifacts.ARTIFACT_DIR
+    store = artifacts.ArtifactStore(
+        directory,
+        max_bytes=artifacts.ARTIFACT_MAX_BYTES if max_bytes is None else max_bytes,
+        ttl=artifacts.ARTIFACT_TTL if ttl is None else ttl,
+        cleanup=False,
+    )
+    freed = store.cleanup()
+    print(f"{store.directory}: freed {format_bytes(freed)}, {format_bytes(store.size())} in use")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""Negotiated response compression for the API.
+
+``CompressionMiddleware`` compresses buffered HTML, JSON and text responses
+above a size threshold with brotli (when the optional ``brotli`` package is
+installed) or gzip, depending on the client's ``Accept-Encoding``. Streaming
+responses and bodies that are already encoded pass through untouched.
+"""
+
+import gzip
+import os
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Smallest body (in bytes) worth compressing
+COMPRESSION_MIN_SIZE = int(os.getenv("RESUMEGEN_COMPRESSION_MIN_SIZE", "1024"))
+# gzip level (1-9)
+COMPRESSION_LEVEL = int(os.getenv("RESUMEGEN_COMPRESSION_LEVEL", "6"))
+# brotli quality (0-11); low values keep CPU cost close to gzip
+BROTLI_QUALITY = int(os.getenv("RESUMEGEN_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/javascript",
+}
+# Bodies above this size are compressed in the thread pool to keep the event loop free
+THREADPOOL_THRESHOLD = 256 * 1024
+
+
+def negotiate_encoding(accept_encoding: str, brotli_available: bool = BROTLI_AVAILABLE) -> str | None:
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+    Returns 'br', 'gzip' or None.
+    """
+    preferences = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        preferences[coding] = quality
+
+    wildcard = preferences.get("*", 0.0)
+    candidates = (["br"] if brotli_available else []) + ["gzip"]
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = preferences.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int = COMPRESSION_LEVEL, brotli_quality: int = BROTLI_QUALITY) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware applying negotiated gzip/brotli compression.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        level: int = COMPRESSION_LEVEL,
+        brotli_quality: int = BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streaming response: forward unchanged
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            if self._should_compress(start_message["status"], headers, body):
+                if len(body) > THREADPOOL_THRESHOLD:
+                    body = await run_in_threadpool(
+                        compress, body, encoding, self.level, self.brotli_quality
+                    )
+                else:
+                    body = compress(body, encoding, self.level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {"type": "http.response.body", "body": body}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, status: int, headers: MutableHeaders, body: bytes) -> bool:
+        if status in (204, 304) or "content-encoding" in headers:
+            return False
+        if len(body) < self.minimum_size:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in COMPRESSIBLE_TYPES
@@ -1,7 +1,13 @@
 # filepath: src/jinja_resume.py
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from pydantic import BaseModel
 from resumegen.models import Resume, CoverLetter, PersonalInfo
+from resumegen import assets
+from resumegen.metrics import record_cache
+from resumegen.template_usage import model_include
+from resumegen.timings import stage
 from pathlib import Path
+from functools import lru_cache
 import os
 from datetime import datetime
 
@@ -10,24 +16,95 @@ STYLE_NAME = "style.css"
 RESUME_TEMPLATE_NAME = "resume_template.html.j2"
 COVER_LETTER_TEMPLATE_NAME = "cover_letter_template.html.j2"
 
+# Stylesheet contents keyed by path, stored with the mtime they were read at
+_style_cache: dict[str, tuple[int, str]] = {}
+# Templates already compiled by a shared environment, for cache hit reporting
+_loaded_templates: set[tuple[Path, str]] = set()
+
+
+@lru_cache(maxsize=16)
+def _get_environment(wd: Path) -> Environment:
+    """
+    Return a shared Jinja2 environment for a template directory.
+    Compiled templates are cached by the environment and reloaded when the source changes.
+    """
+    return Environment(
+        loader=FileSystemLoader(wd), autoescape=select_autoescape(["html", "xml"])
+    )
+
+
+def _get_template(wd: Path, template_name: str):
+    wd = Path(wd)
+    key = (wd, template_name)
+    record_cache("template", key in _loaded_templates)
+    template = _get_environment(wd).get_template(template_name)
+    _loaded_templates.add(key)
+    return template
+
+
+def _load_style(path: Path) -> str:
+    """
+    Read a stylesheet, reusing the cached contents while the file is unchanged.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _style_cache.get(str(path))
+    hit = cached is not None and cached[0] == mtime
+    record_cache("style", hit)
+    if hit:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        style_css = f.read()
+    _style_cache[str(path)] = (mtime, style_css)
+    return style_css
+
+
+def preload(wd: Path = TEMPLATE_DIR, style_name: str = STYLE_NAME) -> None:
+    """
+    Compile the bundled templates and read the stylesheet ahead of the first request.
+    Called before forking API workers so they share the warmed state.
+    """
+    for template_name in (RESUME_TEMPLATE_NAME, COVER_LETTER_TEMPLATE_NAME):
+        _get_template(wd, template_name)
+    _load_style(Path(wd) / style_name)
+
+
+def _inline_assets(html: str, wd: Path) -> str:
+    """Inline the local fonts, images and stylesheets a rendered document references"""
+    if not assets.INLINE_ASSETS or not assets.references_assets(html):
+        return html
+    return assets.inline_assets(html, assets.asset_dirs(wd))
+
+
+def _template_context(document: BaseModel | tuple, template=None) -> dict:
+    """
+    Top-level template variables of a model or of a compact record
+    (resumegen.models.compact), whose nested records the templates read as is.
+    Models are serialized only as far as the template reads them.
+    """
+    if isinstance(document, BaseModel):
+        include = model_include(template, type(document)) if template is not None else None
+        return document.model_dump(include=include)
+    return document._asdict()
+
 
 def render_resume(
-    resume: Resume,
+    resume: Resume | tuple,
     wd: Path = TEMPLATE_DIR,
     style_name: str = STYLE_NAME,
     template_name: str = RESUME_TEMPLATE_NAME,
+    style_css: str | None = None,
 ) -> str:
     """
-    Render a Resume object to HTML using Jinja2 template.
+    Render a Resume object, or its compact record, to HTML using Jinja2 template.
+    `style_css` replaces the contents of the stylesheet file if given.
+    Local assets the document references are inlined (see resumegen.assets).
     """
-    env = Environment(
-        loader=FileSystemLoader(wd), autoescape=select_autoescape(["html", "xml"])
-    )
-    template = env.get_template(template_name)
-    with open(wd / style_name, "r", encoding="utf-8") as f:
-        style_css = f.read()
+    with stage("cache"):
+        template = _get_template(wd, template_name)
+        if style_css is None:
+            style_css = _load_style(Path(wd) / style_name)
     # Defensive: ensure all sections are at least empty lists for template logic
-    resume_dict = resume.model_dump()
+    resume_dict = _template_context(resume, template)
     for section in [
         "education",
         "work_experience",
@@ -39,30 +116,31 @@ def render_resume(
         if resume_dict.get(section) is None:
             resume_dict[section] = []
     html = template.render(**resume_dict, style_css=style_css)
-    return html
+    return _inline_assets(html, wd)
 
 
 def render_cover_letter(
-    cover_letter: CoverLetter,
+    cover_letter: CoverLetter | tuple,
     date=None,
     wd: Path = TEMPLATE_DIR,
     template_name: str = COVER_LETTER_TEMPLATE_NAME,
     style_name: str = STYLE_NAME,
+    style_css: str | None = None,
 ) -> str:
     """
     Render a CoverLetter object to HTML using Jinja2 template and Resume for personal info.
+    `style_css` replaces the contents of the stylesheet file if given.
+    Local assets the document references are inlined (see resumegen.assets).
     """
     if date is None:
         date = datetime.now().strftime("%d-%m-%Y")
 
-    env = Environment(
-        loader=FileSystemLoader(wd), autoescape=select_autoescape(["html", "xml"])
-    )
-    template = env.get_template(template_name)
-    with open(wd / style_name, "r", encoding="utf-8") as f:
-        style_css = f.read()
+    with stage("cache"):
+        template = _get_template(wd, template_name)
+        if style_css is None:
+            style_css = _load_style(Path(wd) / style_name)
     # Defensive: ensure personal_information exists
-    cover_letter_dict = cover_letter.model_dump()
+    cover_letter_dict = _template_context(cover_letter, template)
     if cover_letter_dict.get("personal_information") is None:
         cover_letter_dict["personal_information"] = {}
     html = template.render(
@@ -70,4 +148,4 @@ def render_cover_letter(
         date=date,
         style_css=style_css,
     )
-    return html
+    return _inline_assets(html, wd)
@@ -11,9 +11,13 @@ import subprocess
 import sys
 from pathlib import Path
 import typer
+from resumegen.server import run as serve_api
 
 app = typer.Typer(help="ResumeGen Launcher - Choose your deployment mode")
 
+# Production API mode: multiple preloaded workers with a shared result cache
+app.command(name="serve")(serve_api)
+
 
 @app.command()
 def script():
@@ -0,0 +1,800 @@
+"""Page-count estimation and fit-to-N-pages layout.
+
+``estimate_pages`` lays a rendered document out without a browser: the HTML
+is parsed into a block tree, the stylesheet is cascaded over it (simple
+type/class selectors with descendant and child combinators, ``@media print``
+and ``@page`` margins), text is broken into lines using average glyph
+widths, and the blocks are paginated honouring ``page-break-inside: avoid``
+and ``page-break-after: avoid``. The result is a fractional page count
+(1.7 means the second page is 70% full).
+
+``fit_to_pages`` searches font size, vertical spacing and zoom, and
+optionally drops optional resume sections, until the estimate fits a target
+page count, then renders the PDF once to confirm it. If the confirmation
+overflows, the estimator budget is lowered and the search repeated, up to
+``max_renders`` PDF renders.
+"""
+
+import io
+import math
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from resumegen.pdf_optimize import PYPDF_AVAILABLE
+from resumegen.timings import stage
+
+# A4, the format the PDF service prints to, in CSS pixels
+PX_PER_MM = 96 / 25.4
+PAGE_WIDTH = 210 * PX_PER_MM
+PAGE_HEIGHT = 297 * PX_PER_MM
+# Average advance of a glyph in running text, in em (sans-serif fonts)
+CHAR_WIDTH_EM = 0.5
+BOLD_WIDTH_FACTOR = 1.06
+# Line height of "line-height: normal"
+NORMAL_LINE_HEIGHT = 1.15
+
+# Fraction of a page kept free by the fit search to absorb estimation error
+FIT_MARGIN = 0.03
+# How much the page budget is lowered after a confirmation render overflowed
+FIT_RETRY_STEP = 0.1
+# Iterations of the bisection over the tightness of the layout
+FIT_SEARCH_STEPS = 12
+# Smallest settings the fit search goes down to
+MIN_FONT_SCALE = 0.85
+MIN_SPACING = 0.5
+MIN_ZOOM = 0.85
+# Resume sections that can be dropped to fit, in the default drop order
+OPTIONAL_SECTIONS = (
+    "publications",
+    "achievements",
+    "certifications",
+    "projects",
+    "additional_skills",
+)
+
+_BLOCK_TAGS = {
+    "html", "body", "div", "header", "footer", "section", "article", "main",
+    "nav", "aside", "address", "p", "ul", "ol", "li", "h1", "h2", "h3", "h4",
+    "h5", "h6", "blockquote", "figure", "table", "tr", "pre", "hr", "dl",
+    "dt", "dd", "form", "fieldset",
+}
+_VOID_TAGS = {"meta", "link", "br", "img", "hr", "input", "col", "area", "base", "wbr"}
+_SKIPPED_TAGS = {"head", "style", "script", "title", "template"}
+
+# Defaults of the browser stylesheet that matter for vertical layout
+_USER_AGENT_CSS = """
+body { margin: 8px; line-height: normal; font-size: 16px }
+h1 { font-size: 2em; margin: 0.67em 0; font-weight: bold }
+h2 { font-size: 1.5em; margin: 0.83em 0; font-weight: bold }
+h3 { font-size: 1.17em; margin: 1em 0; font-weight: bold }
+h4 { margin: 1.33em 0; font-weight: bold }
+h5 { font-size: 0.83em; margin: 1.67em 0; font-weight: bold }
+h6 { font-size: 0.67em; margin: 2.33em 0; font-weight: bold }
+p, blockquote, dl, pre { margin: 1em 0 }
+ul, ol { margin: 1em 0; padding-left: 40px }
+li { display: list-item }
+strong, b, th { font-weight: bold }
+hr { margin: 0.5em 0; border: 1px inset }
+"""
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_LENGTH = re.compile(r"(-?\d*\.?\d+)(px|pt|em|rem|mm|cm|in|%)?")
+_SCALABLE_LENGTH = re.compile(r"(?<![\w#.-])(-?\d*\.?\d+)(px|pt|em|rem|mm|cm|in)\b")
+_COMPOUND = re.compile(r"^(\*|[a-zA-Z][\w-]*)?((?:\.[\w-]+)*)$")
+_ABSOLUTE_UNITS = {"px": 1.0, "pt": 4 / 3, "mm": PX_PER_MM, "cm": 10 * PX_PER_MM, "in": 96.0}
+
+
+# Stylesheets
+
+
+@dataclass
+class _Rule:
+    selector: List[Tuple[str, Optional[str], frozenset]]  # (combinator, tag, classes)
+    declarations: Dict[str, str]
+    key: Tuple  # (important, origin, specificity, source order)
+
+
+@dataclass
+class Stylesheet:
+    """Parsed style rules and @page margins (top, right, bottom, left in px)."""
+
+    rules: List[_Rule] = field(default_factory=list)
+    page_margins: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+
+
+def _split_blocks(css: str) -> List[Tuple[str, str]]:
+    """Top-level ``prelude { body }`` blocks; an unclosed block runs to the end, as in browsers."""
+    blocks = []
+    depth, start, prelude = 0, 0, ""
+    for index, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude, start = css[start:index].strip(), index + 1
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:index]))
+                start = index + 1
+    if depth:
+        blocks.append((prelude, css[start:]))
+    return blocks
+
+
+def _declarations(body: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    normal, important = {}, {}
+    for declaration in body.split(";"):
+        name, _, value = declaration.partition(":")
+        name, value = name.strip().lower(), value.strip()
+        if not name or not value:
+            continue
+        if value.endswith("!important"):
+            important[name] = value[: -len("!important")].strip()
+        else:
+            normal[name] = value
+    return normal, important
+
+
+def _parse_selector(text: str) -> Optional[List[Tuple[str, Optional[str], frozenset]]]:
+    """Parse a selector of type/class compounds; None if it uses anything else."""
+    parts = []
+    combinator = " "
+    for token in text.replace(">", " > ").split():
+        if token == ">":
+            combinator = ">"
+            continue
+        match = _COMPOUND.match(token)
+        if match is None:
+            return None
+        tag = match.group(1)
+        classes = frozenset(c for c in match.group(2).split(".") if c)
+        parts.append((combinator, None if tag in (None, "*") else tag.lower(), classes))
+        combinator = " "
+    return parts or None
+
+
+def _specificity(selector) -> Tuple[int, int]:
+    return (
+        sum(len(classes) for _, _, classes in selector),
+        sum(tag is not None for _, tag, _ in selector),
+    )
+
+
+def _page_margins(body: str, margins) -> Tuple[float, float, float, float]:
+    normal, important = _declarations(body)
+    declarations = {**normal, **important}
+    if "margin" in declarations:
+        margins = tuple(_length(v, 16.0, 0.0) for v in _box_values(declarations["margin"]))
+    sides = ("top", "right", "bottom", "left")
+    return tuple(
+        _length(declarations[f"margin-{side}"], 16.0, 0.0)
+        if f"margin-{side}" in declarations
+        else margins[index]
+        for index, side in enumerate(sides)
+    )
+
+
+def _parse_rules(sheet: Stylesheet, css: str, media: str, origin: int) -> None:
+    for prelude, body in _split_blocks(_COMMENT.sub("", css)):
+        if prelude.startswith("@media"):
+            queries = prelude[len("@media"):].lower()
+            if media in queries or "all" in queries:
+                _parse_rules(sheet, body, media, origin)
+            continue
+        if prelude.startswith("@page"):
+            sheet.page_margins = _page_margins(body, sheet.page_margins)
+            continue
+        if prelude.startswith("@"):
+            continue
+        normal, important = _declarations(body)
+        for text in prelude.split(","):
+            selector = _parse_selector(text)
+            if selector is None:
+                continue
+            for declarations, is_important in ((normal, False), (important, True)):
+                if declarations:
+                    key = (is_important, origin, _specificity(selector), len(sheet.rules))
+                    sheet.rules.append(_Rule(selector, declarations, key))
+
+
+def parse_stylesheet(css: str, media: str = "print") -> Stylesheet:
+    """
+    Parse the rules of a stylesheet that apply to a medium. The browser's
+    defaults are included, below the author rules.
+    """
+    sheet = Stylesheet()
+    _parse_rules(sheet, _USER_AGENT_CSS, media, origin=0)
+    _parse_rules(sheet, css, media, origin=1)
+    # Cascade order, so computed styles are a plain update in rule order
+    sheet.rules.sort(key=lambda rule: rule.key)
+    return sheet
+
+
+# Documents
+
+
+class Element:
+    __slots__ = ("tag", "classes", "parent", "children")
+
+    def __init__(self, tag: str, classes: frozenset, parent: Optional["Element"]):
+        self.tag = tag
+        self.classes = classes
+        self.parent = parent
+        self.children: List["Element | str"] = []
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", frozenset(), None)
+        self.current = self.root
+        self.skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.skipping:
+            if tag not in _VOID_TAGS:
+                self.skipping += 1
+            return
+        if tag in _SKIPPED_TAGS:
+            self.skipping = 1
+            return
+        classes = frozenset((dict(attrs).get("class") or "").split())
+        element = Element(tag, classes, self.current)
+        self.current.children.append(element)
+        if tag not in _VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.skipping and tag not in _SKIPPED_TAGS:
+            classes = frozenset((dict(attrs).get("class") or "").split())
+            self.current.children.append(Element(tag, classes, self.current))
+
+    def handle_endtag(self, tag):
+        if self.skipping:
+            self.skipping -= 1
+            return
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.current.children.append(data)
+
+
+def parse_html(html: str) -> Element:
+    """Parse rendered HTML into an element tree, without <head> contents."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _matches(element: Element, tag: Optional[str], classes: frozenset) -> bool:
+    return (tag is None or element.tag == tag) and classes <= element.classes
+
+
+def _selector_matches(selector, element: Element) -> bool:
+    combinator, tag, classes = selector[-1]
+    if not _matches(element, tag, classes):
+        return False
+    node = element
+    for index in range(len(selector) - 2, -1, -1):
+        _, tag, classes = selector[index]
+        if combinator == ">":
+            node = node.parent
+            if node is None or not _matches(node, tag, classes):
+                return False
+        else:
+            node = node.parent
+            while node is not None and not _matches(node, tag, classes):
+                node = node.parent
+            if node is None:
+                return False
+        combinator = selector[index][0]
+    return True
+
+
+# Computed style
+
+
+def _length(value: str, font_size: float, reference: float) -> float:
+    match = _LENGTH.match(value.strip())
+    if match is None:
+        return 0.0
+    number, unit = float(match.group(1)), match.group(2)
+    if unit in ("em", "rem"):
+        return number * font_size
+    if unit == "%":
+        return number * reference / 100
+    return number * _ABSOLUTE_UNITS.get(unit or "px", 1.0)
+
+
+def _box_values(value: str) -> List[str]:
+    values = value.split()[:4] or ["0"]
+    if len(values) == 1:
+        values *= 4
+    elif len(values) == 2:
+        values = values * 2
+    elif len(values) == 3:
+        values.append(values[1])
+    return values
+
+
+def _border_width(value: str, font_size: float) -> float:
+    if "none" in value or "hidden" in value:
+        return 0.0
+    for token in value.split():
+        if _LENGTH.fullmatch(token) or token in ("thin", "medium", "thick"):
+            return {"thin": 1.0, "medium": 3.0, "thick": 5.0}.get(token) or _length(token, font_size, 0.0)
+    return 3.0
+
+
+@dataclass
+class _Style:
+    display: str = "inline"
+    font_size: float = 16.0
+    line_height: Tuple[str, float] = ("factor", NORMAL_LINE_HEIGHT)
+    bold: bool = False
+    margin: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    padding: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    border: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)
+    max_width: Optional[float] = None
+    avoid_inside: bool = False
+    keep_with_next: bool = False
+
+    @property
+    def line_px(self) -> float:
+        kind, value = self.line_height
+        return value * self.font_size if kind == "factor" else value
+
+
+def _compute_style(element: Element, parent: _Style, sheet: Stylesheet, width: float) -> _Style:
+    declarations: Dict[str, str] = {}
+    for rule in sheet.rules:
+        if _selector_matches(rule.selector, element):
+            declarations.update(rule.declarations)
+
+    font_size = parent.font_size
+    if "font-size" in declarations:
+        value = declarations["font-size"]
+        if _LENGTH.match(value):
+            font_size = _length(value, parent.font_size, parent.font_size)
+    line_height = parent.line_height
+    if "line-height" in declarations:
+        value = declarations["line-height"]
+        if value == "normal":
+            line_height = ("factor", NORMAL_LINE_HEIGHT)
+        elif re.fullmatch(r"\d*\.?\d+", value):
+            line_height = ("factor", float(value))
+        elif _LENGTH.match(value):
+            line_height = ("px", _length(value, font_size, font_size))
+    bold = parent.bold
+    if "font-weight" in declarations:
+        weight = declarations["font-weight"]
+        bold = weight in ("bold", "bolder") or (weight.isdigit() and int(weight) >= 600)
+
+    style = _Style(
+        display=declarations.get("display", "block" if element.tag in _BLOCK_TAGS else "inline"),
+        font_size=font_size,
+        line_height=line_height,
+        bold=bold,
+    )
+    sides = ("top", "right", "bottom", "left")
+    for name in ("margin", "padding"):
+        values = _box_values(declarations.get(name, "0"))
+        for index, side in enumerate(sides):
+            values[index] = declarations.get(f"{name}-{side}", values[index])
+        setattr(style, name, tuple(_length(v, font_size, width) for v in values))
+    widths = [_border_width(declarations["border"], font_size) if "border" in declarations else 0.0] * 4
+    if "border-width" in declarations:
+        widths = [_length(v, font_size, 0.0) for v in _box_values(declarations["border-width"])]
+    for index, side in enumerate(sides):
+        if f"border-{side}" in declarations:
+            widths[index] = _border_width(declarations[f"border-{side}"], font_size)
+    style.border = tuple(widths)
+    if "max-width" in declarations and _LENGTH.match(declarations["max-width"]):
+        style.max_width = _length(declarations["max-width"], font_size, width)
+    style.avoid_inside = "avoid" in (
+        declarations.get("page-break-inside", "") + declarations.get("break-inside", "")
+    )
+    style.keep_with_next = "avoid" in (
+        declarations.get("page-break-after", "") + declarations.get("break-after", "")
+    )
+    return style
+
+
+# Layout
+
+
+@dataclass
+class _Slice:
+    """An unbreakable piece of vertical layout. Spacing is dropped at the top of a page."""
+
+    height: float
+    spacing: bool = False
+    keep_with_next: bool = False
+
+
+def _line_slices(words: List[Tuple[float, float]], width: float, line_px: float) -> List[_Slice]:
+    """Greedy line breaking of (word width, space width) runs into line slices."""
+    if not words:
+        return []
+    lines, used = 1, 0.0
+    for word, space in words:
+        if used and used + word > width:
+            lines += 1
+            used = 0.0
+        used += word + space
+    return [_Slice(line_px) for _ in range(lines)]
+
+
+class _Layout:
+    def __init__(self, sheet: Stylesheet):
+        self.sheet = sheet
+        self._styles: Dict[int, _Style] = {}
+
+    def style(self, element: Element, parent: _Style, width: float) -> _Style:
+        style = self._styles.get(id(element))
+        if style is None:
+            style = self._styles[id(element)] = _compute_style(element, parent, self.sheet, width)
+        return style
+
+    def inline_words(self, node: "Element | str", style: _Style, words: list) -> None:
+        """Collect (width, following space width) of the words of inline content."""
+        if isinstance(node, str):
+            char = style.font_size * CHAR_WIDTH_EM * (BOLD_WIDTH_FACTOR if style.bold else 1.0)
+            words.extend((len(word) * char, char) for word in node.split())
+            return
+        if node.tag == "br":
+            words.append((math.inf, 0.0))
+            return
+        child_style = self.style(node, style, 0.0)
+        if child_style.display == "none":
+            return
+        for child in node.children:
+            self.inline_words(child, child_style, words)
+
+    def block(self, element: Element, parent: _Style, width: float) -> Tuple[float, List[_Slice], float]:
+        """Lay out a block: (top margin, slices, bottom margin)."""
+        style = self.style(element, parent, width)
+        if style.display == "none":
+            return 0.0, [], 0.0
+        margin_top, _, margin_bottom, _ = style.margin
+        inner = width - style.margin[1] - style.margin[3]
+        if style.max_width is not None:
+            inner = min(inner, style.max_width)
+        inner -= style.padding[1] + style.padding[3] + style.border[1] + style.border[3]
+        inner = max(inner, style.font_size)
+
+        children: List[Tuple[float, List[_Slice], float]] = []
+        words: list = []
+
+        def flush():
+            if words:
+                children.append((0.0, _line_slices(words, inner, style.line_px), 0.0))
+                words.clear()
+
+        for child in element.children:
+            if isinstance(child, Element) and child.tag != "br":
+                child_style = self.style(child, style, inner)
+                if child_style.display in ("block", "list-item", "flex", "grid", "table"):
+                    flush()
+                    children.append(self.block(child, style, inner))
+                    continue
+            self.inline_words(child, style, words)
+        flush()
+
+        top = style.border[0] + style.padding[0]
+        bottom = style.border[2] + style.padding[2]
+        slices: List[_Slice] = []
+        if top:
+            slices.append(_Slice(top))
+        previous_margin = None
+        for child_top, child_slices, child_bottom in children:
+            if previous_margin is None:
+                if not top:
+                    # First child's margin collapses with ours
+                    margin_top = max(margin_top, child_top)
+                else:
+                    slices.append(_Slice(child_top, spacing=True))
+            else:
+                slices.append(_Slice(max(previous_margin, child_top), spacing=True))
+            slices.extend(child_slices)
+            previous_margin = child_bottom
+        if previous_margin is not None:
+            if bottom:
+                slices.append(_Slice(previous_margin, spacing=True))
+            else:
+                margin_bottom = max(margin_bottom, previous_margin)
+        if bottom:
+            slices.append(_Slice(bottom))
+
+        if style.avoid_inside and slices:
+            slices = [_Slice(sum(s.height for s in slices))]
+        if style.keep_with_next and slices:
+            slices[-1].keep_with_next = True
+        return margin_top, slices, margin_bottom
+
+
+def _paginate(slices: Sequence[_Slice], page_height: float) -> float:
+    pages, used = 1, 0.0
+    for index, piece in enumerate(slices):
+        if piece.spacing:
+            if not used:
+                continue
+            if used + piece.height > page_height:
+                pages, used = pages + 1, 0.0
+            else:
+                used += piece.height
+            continue
+        needed = piece.height
+        if piece.keep_with_next:
+            following = next((s for s in slices[index + 1:] if not s.spacing), None)
+            if following is not None:
+                needed += following.height
+        if used and used + needed > page_height:
+            pages, used = pages + 1, 0.0
+        used += piece.height
+        while used > page_height:
+            pages, used = pages + 1, used - page_height
+    return pages - 1 + used / page_height
+
+
+def estimate_pages(html: "str | Element", css: "str | Stylesheet", zoom: float = 1.0) -> float:
+    """
+    Estimate how many A4 pages a rendered document prints to, as a fraction
+    (1.7 means the second page is 70% full).
+    """
+    root = parse_html(html) if isinstance(html, str) else html
+    sheet = parse_stylesheet(css) if isinstance(css, str) else css
+    top, right, bottom, left = sheet.page_margins
+    # Zoom scales every CSS length, i.e. shrinks the page in CSS pixels
+    width = (PAGE_WIDTH - left - right) / zoom
+    height = (PAGE_HEIGHT - top - bottom) / zoom
+    _, slices, _ = _Layout(sheet).block(root, _Style(display="block"), width)
+    return _paginate(slices, height)
+
+
+# Fitting
+
+
+def _scale(value: str, factor: float) -> str:
+    return _SCALABLE_LENGTH.sub(lambda m: f"{float(m.group(1)) * factor:.4g}{m.group(2)}", value)
+
+
+def _adjust_declaration(match: "re.Match", font_scale: float, spacing: float) -> str:
+    name, value = match.group(1), match.group(2)
+    prop = name.strip().lower()
+    if prop == "font-size":
+        value = _SCALABLE_LENGTH.sub(
+            lambda m: m.group(0) if m.group(2) in ("em", "rem") else f"{float(m.group(1)) * font_scale:.4g}{m.group(2)}",
+            value,
+        )
+    elif prop == "line-height":
+        number = value.strip()
+        if re.fullmatch(r"\d*\.?\d+", number):
+            value = f" {1 + (float(number) - 1) * spacing:.4g}"
+        else:
+            value = _scale(value, spacing)
+    elif prop in ("margin", "padding"):
+        important = value.rstrip().endswith("!important")
+        values = _box_values(value.replace("!important", ""))
+        values[0], values[2] = _scale(values[0], spacing), _scale(values[2], spacing)
+        value = " " + " ".join(values) + (" !important" if important else "")
+    elif prop in ("margin-top", "margin-bottom", "padding-top", "padding-bottom"):
+        value = _scale(value, spacing)
+    return f"{name}:{value}"
+
+
+_DECLARATION = re.compile(r"([\w-]+\s*):([^;{}]+)")
+
+
+@dataclass(frozen=True)
+class FitSettings:
+    """
+    Layout adjustments: font sizes, vertical spacing (margins and paddings,
+    including the page margins, and line leading) and page zoom, as factors
+    of the original stylesheet.
+    """
+
+    font_scale: float = 1.0
+    spacing: float = 1.0
+    zoom: float = 1.0
+
+    @classmethod
+    def at(cls, tightness: float) -> "FitSettings":
+        """Settings between the original layout (0) and the tightest one (1)."""
+        return cls(
+            font_scale=1 - (1 - MIN_FONT_SCALE) * tightness,
+            spacing=1 - (1 - MIN_SPACING) * tightness,
+            zoom=1 - (1 - MIN_ZOOM) * tightness,
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return self == FitSettings()
+
+    def stylesheet(self, css: str) -> str:
+        """The stylesheet with these adjustments applied."""
+        if self.is_default:
+            return css
+        adjusted = _DECLARATION.sub(
+            lambda m: _adjust_declaration(m, self.font_scale, self.spacing), _COMMENT.sub("", css)
+        )
+        # Close a block left open by the original, so the zoom rule is top-level
+        depth = sum(1 if c == "{" else -1 for c in adjusted if c in "{}")
+        return adjusted + "}" * max(depth, 0) + f"\nhtml {{ zoom: {self.zoom:.4g}; }}\n"
+
+
+@dataclass
+class FitResult:
+    """
+    Outcome of a fit: the final HTML and the settings and dropped sections
+    used to produce it, plus the confirmed PDF and its page count if one
+    was rendered.
+    """
+
+    html: str
+    target_pages: int
+    settings: FitSettings
+    estimated_pages: float
+    pruned: List[str] = field(default_factory=list)
+    pdf: Optional[bytes] = None
+    pages: Optional[int] = None
+    pdf_renders: int = 0
+
+    @property
+    def fits(self) -> Optional[bool]:
+        """Whether the confirmed PDF fits the target; None if no PDF was rendered."""
+        return None if self.pages is None else self.pages <= self.target_pages
+
+
+def count_pdf_pages(pdf: bytes) -> int:
+    """
+    Number of pages of a PDF, read from its page tree with pypdf when it is
+    installed. Without pypdf, or if pypdf cannot parse the file, page objects
+    are counted in the raw bytes, which miscounts pages inside compressed
+    object streams and pages rewritten by incremental updates.
+    """
+    if PYPDF_AVAILABLE:
+        import pypdf
+
+        try:
+            return len(pypdf.PdfReader(io.BytesIO(pdf)).pages)
+        except pypdf.errors.PyPdfError:
+            pass
+    return len(re.findall(rb"/Type\s*/Page(?![a-zA-Z])", pdf))
+
+
+def _prunings(document: BaseModel, prune: Iterable[str]):
+    """The document, then with each section in `prune` dropped in turn."""
+    yield [], document
+    dropped: List[str] = []
+    for section in prune:
+        if not getattr(document, section, None):
+            continue
+        dropped.append(section)
+        document = document.model_copy(update={section: None})
+        yield list(dropped), document
+
+
+def fit_to_pages(
+    document: BaseModel,
+    pages: int,
+    render_pdf: Optional[Callable[[str], bytes]] = None,
+    prune: Sequence[str] = (),
+    wd: Path | str | None = None,
+    style_name: str | None = None,
+    template_name: str | None = None,
+    max_renders: int = 3,
+) -> FitResult:
+    """
+    Lay a Resume or CoverLetter out to fit `pages` pages.
+
+    Font size, spacing and zoom are reduced only as far as needed; if the
+    tightest layout is still too long, the resume sections in `prune` are
+    dropped in order. `render_pdf` (HTML to PDF bytes, e.g. a PDF backend's
+    ``render``) is only called to confirm the result; without it the result
+    holds the HTML and the estimate.
+    """
+    from resumegen.jinja_render import (
+        COVER_LETTER_TEMPLATE_NAME,
+        RESUME_TEMPLATE_NAME,
+        STYLE_NAME,
+        TEMPLATE_DIR,
+        _load_style,
+        render_cover_letter,
+        render_resume,
+    )
+    from resumegen.models import CoverLetter, Resume
+
+    if pages < 1:
+        raise ValueError("The target page count must be at least 1")
+    unknown = [section for section in prune if section not in OPTIONAL_SECTIONS]
+    if unknown:
+        raise ValueError(
+            f"Cannot drop {', '.join(unknown)}; optional sections are: {', '.join(OPTIONAL_SECTIONS)}"
+        )
+    if isinstance(document, Resume):
+        render = render_resume
+        template_name = template_name or RESUME_TEMPLATE_NAME
+    elif isinstance(document, CoverLetter):
+        if prune:
+            raise ValueError("Cover letters have no optional sections to drop")
+        render = render_cover_letter
+        template_name = template_name or COVER_LETTER_TEMPLATE_NAME
+    else:
+        raise TypeError(f"Cannot fit a {type(document).__name__}")
+    wd = Path(wd or TEMPLATE_DIR)
+    style_name = style_name or STYLE_NAME
+    css = _load_style(wd / style_name)
+
+    def render_html(candidate: BaseModel, settings: FitSettings) -> str:
+        with stage("render"):
+            return render(
+                candidate, wd=wd, style_name=style_name, template_name=template_name,
+                style_css=settings.stylesheet(css),
+            )
+
+    sheets: Dict[FitSettings, Stylesheet] = {}
+
+    def estimate(tree: Element, settings: FitSettings) -> float:
+        with stage("layout"):
+            sheet = sheets.get(settings)
+            if sheet is None:
+                sheet = sheets[settings] = parse_stylesheet(settings.stylesheet(css))
+            return estimate_pages(tree, sheet, settings.zoom)
+
+    candidates = list(_prunings(document, prune))
+    trees: Dict[int, Element] = {}
+    budget = pages - FIT_MARGIN
+    renders = 0
+    while True:
+        for level, (dropped, candidate) in enumerate(candidates):
+            tree = trees.get(level)
+            if tree is None:
+                tree = trees[level] = parse_html(render_html(candidate, FitSettings()))
+            last = level == len(candidates) - 1
+            if estimate(tree, FitSettings()) <= budget:
+                settings = FitSettings()
+                break
+            if estimate(tree, FitSettings.at(1.0)) > budget and not last:
+                continue
+            # Bisect for the least tightening that fits the budget
+            low, high = 0.0, 1.0
+            for _ in range(FIT_SEARCH_STEPS):
+                middle = (low + high) / 2
+                if estimate(tree, FitSettings.at(middle)) <= budget:
+                    high = middle
+                else:
+                    low = middle
+            settings = FitSettings.at(high)
+            break
+
+        result = FitResult(
+            html=render_html(candidate, settings),
+            target_pages=pages,
+            settings=settings,
+            estimated_pages=estimate(tree, settings),
+            pruned=dropped,
+            pdf_renders=renders,
+        )
+        if render_pdf is None:
+            return result
+        with stage("pdf"):
+            result.pdf = render_pdf(result.html)
+        renders = result.pdf_renders = renders + 1
+        result.pages = count_pdf_pages(result.pdf)
+        tightest = last and settings == FitSettings.at(1.0)
+        if result.fits or tightest or renders >= max_renders:
+            return result
+        # The estimate was too optimistic for this document: ask for more room
+        budget -= FIT_RETRY_STEP
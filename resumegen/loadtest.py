@@ -0,0 +1,473 @@
+"""Synthetic workloads and a local load-test harness for the API.
+
+Payloads are generated from the Pydantic models themselves, so they stay
+valid as the schemas evolve; list lengths and text sizes follow
+configurable distributions. The harness drives the FastAPI app in-process
+(or a running server) at a fixed request rate or concurrency. PDF
+conversion can go to a stub PDF service with configurable latency, so
+everything runs offline without Chromium.
+"""
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+import types
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from resumegen.metrics import LATENCY_BUCKETS
+
+# Smallest well-formed PDF, returned by the stub service
+STUB_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 595 842]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+WORDS = (
+    "design build scalable services data platform team lead python cloud "
+    "pipelines delivered reduced latency improved customer analytics research "
+    "mentored engineers migrated architecture automated testing deployment "
+    "product strategy growth insights modelling performance security"
+).split()
+
+ENDPOINTS = {
+    "resume": "/generate-resume",
+    "cover_letter": "/generate-cover-letter",
+}
+
+
+class SizeDistribution:
+    """
+    Distribution of a size (list length, words per text field).
+
+    Specs: "5" (fixed), "1-10" (uniform, inclusive) or "exp:4" (exponential
+    with mean 4, for a long tail of large documents; capped at 20x the mean).
+    """
+
+    def __init__(self, kind: str, low: float, high: float = 0):
+        self.kind = kind
+        self.low = low
+        self.high = high
+
+    @classmethod
+    def parse(cls, spec: str | int) -> "SizeDistribution":
+        spec = str(spec).strip()
+        if re.fullmatch(r"\d+", spec):
+            return cls("fixed", int(spec))
+        match = re.fullmatch(r"(\d+)\s*-\s*(\d+)", spec)
+        if match and int(match.group(1)) <= int(match.group(2)):
+            return cls("uniform", int(match.group(1)), int(match.group(2)))
+        match = re.fullmatch(r"exp:(\d+(?:\.\d+)?)", spec)
+        if match and float(match.group(1)) > 0:
+            return cls("exp", float(match.group(1)))
+        raise ValueError(f"Invalid size distribution: {spec!r} (use N, A-B or exp:MEAN)")
+
+    def sample(self, rng: random.Random) -> int:
+        if self.kind == "fixed":
+            return int(self.low)
+        if self.kind == "uniform":
+            return rng.randint(int(self.low), int(self.high))
+        return min(int(rng.expovariate(1 / self.low)), int(20 * self.low))
+
+
+class PayloadGenerator:
+    """
+    Random but schema-valid PersonalInfo, Resume and CoverLetter payloads.
+
+    Args:
+        seed: Seed for reproducible workloads.
+        entries: Items per list (work positions, courses, skills, paragraphs...).
+        words: Words per free-text field.
+        optional_probability: Chance that an optional field is filled in.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        entries: SizeDistribution | str = "1-5",
+        words: SizeDistribution | str = "3-20",
+        optional_probability: float = 0.8,
+    ):
+        self.rng = random.Random(seed)
+        self.entries = entries if isinstance(entries, SizeDistribution) else SizeDistribution.parse(entries)
+        self.words = words if isinstance(words, SizeDistribution) else SizeDistribution.parse(words)
+        self.optional_probability = optional_probability
+
+    def text(self, name: str = "") -> str:
+        name = name.lower()
+        if "email" in name:
+            return f"user{self.rng.randint(1, 10**6)}@example.com"
+        if "phone" in name:
+            return f"+1 555 {self.rng.randint(1000000, 9999999)}"
+        if name in ("link", "linkedin", "github"):
+            return f"https://example.com/{self.rng.choice(WORDS)}"
+        if "date" in name:
+            return f"{self.rng.randint(1, 28):02d}/{self.rng.randint(1, 12):02d}/{self.rng.randint(1960, 2005)}"
+        if "year" in name:
+            return str(self.rng.randint(1990, 2025))
+        count = max(1, self.words.sample(self.rng))
+        return " ".join(self.rng.choice(WORDS) for _ in range(count)).capitalize()
+
+    def value(self, annotation: Any, name: str = "") -> Any:
+        origin = get_origin(annotation)
+        if origin in (Union, types.UnionType):
+            choices = [arg for arg in get_args(annotation) if arg is not type(None)]
+            return self.value(self.rng.choice(choices), name)
+        if origin in (list, List):
+            (item,) = get_args(annotation) or (str,)
+            return [self.value(item, name) for _ in range(max(1, self.entries.sample(self.rng)))]
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return self.model(annotation)
+        if annotation is bool:
+            return self.rng.random() < 0.5
+        if annotation is int:
+            return self.rng.randint(0, 100)
+        if annotation is float:
+            return round(self.rng.uniform(0, 100), 2)
+        return self.text(name)
+
+    def model(self, model: type[BaseModel], exclude: tuple[str, ...] = ()) -> Dict[str, Any]:
+        data = {}
+        for name, model_field in model.model_fields.items():
+            if name in exclude:
+                continue
+            if not model_field.is_required() and self.rng.random() >= self.optional_probability:
+                continue
+            data[name] = self.value(model_field.annotation, name)
+        return data
+
+    def personal_info(self) -> Dict[str, Any]:
+        from resumegen.models import PersonalInfo
+
+        return self.model(PersonalInfo)
+
+    def resume(self) -> Dict[str, Any]:
+        from resumegen.models import Resume
+
+        return self.model(Resume, exclude=("personal_information",))
+
+    def cover_letter(self) -> Dict[str, Any]:
+        from resumegen.models import CoverLetter
+
+        return self.model(CoverLetter, exclude=("personal_information",))
+
+    def request(self, document_type: str, output_format: str = "html") -> tuple[str, Dict[str, Any]]:
+        """
+        An (endpoint, JSON body) pair for one API call.
+        """
+        if document_type == "cover_letter":
+            body = {"cover_letter_data": self.cover_letter()}
+        else:
+            body = {"resume_data": self.resume()}
+        body.update(personal_info=self.personal_info(), output_format=output_format)
+        return ENDPOINTS[document_type], body
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a document mix like "resume=3,cover_letter=1" into normalized weights.
+    """
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown document type in mix: {name!r}")
+        weights[name] = float(weight) if weight else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Mix weights must add up to more than zero")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+class StubPdfService:
+    """
+    Local stand-in for the PDF microservice: answers POST /generate-pdf with a
+    tiny PDF after `latency` seconds (plus up to `jitter` seconds), failing a
+    fraction `error_rate` of requests with 500.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                time.sleep(service.latency + random.uniform(0, service.jitter))
+                if random.random() < service.error_rate:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(STUB_PDF)))
+                self.end_headers()
+                self.wfile.write(STUB_PDF)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubPdfService":
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@dataclass
+class LoadReport:
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    duration_s: float = 0.0
+
+    def record(self, latency_ms: float, status: Optional[int] = None, error: Optional[str] = None):
+        self.latencies_ms.append(latency_ms)
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def failures(self) -> int:
+        return sum(self.errors.values()) + sum(
+            count for status, count in self.statuses.items() if status >= 400
+        )
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def histogram(self) -> Dict[str, int]:
+        """
+        Request counts per latency bucket (the Prometheus latency buckets, in ms).
+        """
+        counts = Counter()
+        for latency in self.latencies_ms:
+            bound = next((b for b in LATENCY_BUCKETS if latency <= b * 1000), None)
+            counts["+Inf" if bound is None else f"{bound * 1000:g}"] += 1
+        labels = [f"{b * 1000:g}" for b in LATENCY_BUCKETS] + ["+Inf"]
+        return {label: counts[label] for label in labels if counts[label]}
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "duration_s": round(self.duration_s, 3),
+            "throughput_rps": round(self.requests / self.duration_s, 2) if self.duration_s else 0.0,
+            "error_rate": round(self.failures / self.requests, 4) if self.requests else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+            "latency_ms": {
+                "p50": round(self.percentile(0.50), 3),
+                "p90": round(self.percentile(0.90), 3),
+                "p99": round(self.percentile(0.99), 3),
+                "max": round(max(self.latencies_ms, default=0.0), 3),
+            },
+            "histogram_ms": self.histogram(),
+        }
+
+
+async def run_load(
+    client,
+    generator: PayloadGenerator,
+    mix: Dict[str, float],
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    output_format: str = "html",
+    pregenerate: int = 64,
+) -> LoadReport:
+    """
+    Send requests with an httpx.AsyncClient until `requests` have been sent
+    or `duration` seconds have passed.
+
+    With `rate`, requests are started open-loop at that many per second
+    (Poisson arrivals), with at most `concurrency` in flight; otherwise
+    `concurrency` workers send requests back to back.
+
+    Payloads are generated ahead of time (cycling through `pregenerate` of
+    them) so payload generation does not limit the request rate.
+    """
+    if requests is None and duration is None:
+        raise ValueError("Give a number of requests or a duration")
+    document_types = list(mix)
+    weights = [mix[name] for name in document_types]
+    payloads = [
+        generator.request(generator.rng.choices(document_types, weights)[0], output_format)
+        for _ in range(max(1, min(pregenerate, requests or pregenerate)))
+    ]
+
+    report = LoadReport()
+    started = time.perf_counter()
+    deadline = started + duration if duration is not None else None
+    issued = 0
+
+    def take() -> Optional[tuple[str, Dict[str, Any]]]:
+        nonlocal issued
+        if requests is not None and issued >= requests:
+            return None
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        payload = payloads[issued % len(payloads)]
+        issued += 1
+        return payload
+
+    async def send(endpoint: str, body: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            response = await client.post(endpoint, json=body)
+        except Exception as e:
+            report.record((time.perf_counter() - start) * 1000, error=type(e).__name__)
+        else:
+            report.record((time.perf_counter() - start) * 1000, status=response.status_code)
+
+    if rate is None:
+
+        async def worker() -> None:
+            while (payload := take()) is not None:
+                await send(*payload)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        slots = asyncio.Semaphore(concurrency)
+        tasks = set()
+
+        async def limited(endpoint: str, body: Dict[str, Any]) -> None:
+            try:
+                await send(endpoint, body)
+            finally:
+                slots.release()
+
+        next_start = time.perf_counter()
+        while (payload := take()) is not None:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await slots.acquire()
+            task = asyncio.create_task(limited(*payload))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            next_start += generator.rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+
+    report.duration_s = time.perf_counter() - started
+    return report
+
+
+def loadtest(
+    url: Optional[str] = None,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    mix: str = "resume=1,cover_letter=1",
+    entries: str = "1-5",
+    words: str = "3-20",
+    output_format: str = "html",
+    stub_pdf: bool = True,
+    pdf_latency: float = 0.2,
+    pdf_jitter: float = 0.0,
+    pdf_error_rate: float = 0.0,
+    seed: Optional[int] = None,
+    timeout: float = 120.0,
+) -> LoadReport:
+    """
+    Run a load test and return the report.
+
+    Without `url` the API is served in-process; with `stub_pdf`, PDF requests
+    are sent to a local StubPdfService. Against a running server (`url`) the
+    server's own PDF backend is used.
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise RuntimeError('The load test needs httpx: pip install -e ".[loadtest]"')
+
+    generator = PayloadGenerator(seed=seed, entries=entries, words=words)
+    weights = parse_mix(mix)
+
+    async def drive(client) -> LoadReport:
+        return await run_load(
+            client,
+            generator,
+            weights,
+            requests=requests,
+            duration=duration,
+            concurrency=concurrency,
+            rate=rate,
+            output_format=output_format,
+        )
+
+    async def main() -> LoadReport:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        if url is not None:
+            async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+                return await drive(client)
+
+        from resumegen.api import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=timeout
+        ) as client:
+            return await drive(client)
+
+    if url is not None or not stub_pdf or output_format == "html":
+        return asyncio.run(main())
+
+    previous = os.environ.get("PDF_SERVICE_URL")
+    with StubPdfService(pdf_latency, pdf_jitter, pdf_error_rate) as stub:
+        os.environ["PDF_SERVICE_URL"] = stub.url
+        try:
+            return asyncio.run(main())
+        finally:
+            if previous is None:
+                os.environ.pop("PDF_SERVICE_URL", None)
+            else:
+                os.environ["PDF_SERVICE_URL"] = previous
@@ -0,0 +1,155 @@
+"""Memory instrumentation based on tracemalloc.
+
+Tracing slows allocation-heavy code down noticeably, so it is opt-in: the API
+traces when RESUMEGEN_TRACE_MEMORY is set, and the CLI with ``--memory``.
+Peaks are Python heap allocations traced by tracemalloc; memory held by
+Chromium or Node.js is only visible in the process RSS.
+"""
+
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACE_MEMORY = os.getenv("RESUMEGEN_TRACE_MEMORY", "").lower() in ("1", "true", "yes")
+# Stack frames stored per allocation; more frames give better sites but cost memory
+TRACE_FRAMES = int(os.getenv("RESUMEGEN_TRACE_FRAMES", "1"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MemoryUsage:
+    peak_bytes: int = 0  # Peak traced memory above the baseline
+    retained_bytes: int = 0  # Traced memory still allocated at the end
+    peak_rss_bytes: Optional[int] = None  # Process peak RSS so far, where the OS reports it
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Peak resident set size of this process in bytes, or None where unsupported.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def start() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+
+
+@contextmanager
+def measure() -> Iterator[MemoryUsage]:
+    """
+    Measure the traced memory of the block. Starts tracemalloc for the block
+    if it is not already running. The usage is filled in when the block exits.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACE_FRAMES)
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    usage = MemoryUsage()
+    try:
+        yield usage
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+        usage.peak_bytes = max(0, peak - baseline)
+        usage.retained_bytes = max(0, current - baseline)
+        usage.peak_rss_bytes = peak_rss()
+
+
+class RequestTracker:
+    """
+    Per-request peak memory for concurrent requests.
+
+    tracemalloc only keeps one process-wide peak, so it is reset when the first
+    of a group of overlapping requests starts. With overlapping requests the
+    peak is shared: each request reports the highest usage seen while it ran.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @contextmanager
+    def track(self) -> Iterator[MemoryUsage]:
+        start()
+        with self._lock:
+            if self._active == 0:
+                tracemalloc.reset_peak()
+            self._active += 1
+            baseline, _ = tracemalloc.get_traced_memory()
+        usage = MemoryUsage()
+        try:
+            yield usage
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self._active -= 1
+            usage.peak_bytes = max(0, peak - baseline)
+            usage.retained_bytes = max(0, current - baseline)
+            usage.peak_rss_bytes = peak_rss()
+
+
+REQUEST_TRACKER = RequestTracker()
+
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+def top_allocations(limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+    """
+    Allocation sites holding the most traced memory right now.
+
+    Args:
+        limit: Number of sites returned.
+        group_by: "lineno" for source lines, "filename" for whole files or
+            "traceback" for full stacks (needs RESUMEGEN_TRACE_FRAMES > 1).
+    """
+    if not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES]
+    )
+    return [
+        {
+            "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_bytes": stat.size,
+            "blocks": stat.count,
+        }
+        for stat in snapshot.statistics(group_by)[:limit]
+    ]
+
+
+def report(limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+    """
+    Traced memory totals and the top allocation sites, as JSON-serializable data.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "peak_rss_bytes": peak_rss(),
+        "top": top_allocations(limit, group_by),
+    }
+
+
+def format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,592 @@
+"""Prometheus-style metrics for resume generation.
+
+A small, dependency-free metrics registry that renders the Prometheus text
+exposition format. The API exposes it on ``/metrics``; the CLI and library
+code record into the same registry so every code path is instrumented.
+
+Values live in the memory of each process. Under a multi-worker server,
+RESUMEGEN_METRICS_DIR makes every worker write its values to a shared
+directory, and ``/metrics`` on any worker reports the total of all workers.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Files in the multiprocess directory besides the per-process snapshots
+AGGREGATE_NAME = "aggregate.json"
+LOCK_NAME = ".lock"
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, spanning Pydantic validation (sub-ms) to Chromium renders
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+# Payload size buckets in bytes
+SIZE_BUCKETS = (
+    1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000,
+)
+# Memory buckets in bytes, from small HTML-only requests to multi-document PDF batches
+MEMORY_BUCKETS = (
+    1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000, 100_000_000,
+    250_000_000, 500_000_000, 1_000_000_000,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], object]:
+        """Copy of the current values, keyed by label values"""
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, snapshots: List[Dict[Tuple[str, ...], object]]) -> Dict[Tuple[str, ...], object]:
+        """Combine the snapshots of several processes into one set of values"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def _samples(self, values: Dict[Tuple[str, ...], object]) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self, values: Optional[Dict[Tuple[str, ...], object]] = None) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, labels, value in self._samples(self.snapshot() if values is None else values):
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def merge(self, snapshots):
+        merged: Dict[Tuple[str, ...], float] = {}
+        for values in snapshots:
+            for key, value in values.items():
+                merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def _samples(self, values):
+        for key, value in sorted(values.items()):
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down. Across processes, the values of live
+    processes are summed, or with `multiprocess_mode="max"` the largest is
+    reported (for measurements of a shared resource).
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        multiprocess_mode: str = "sum",
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def merge(self, snapshots):
+        merged: Dict[Tuple[str, ...], float] = {}
+        for values in snapshots:
+            for key, value in values.items():
+                if key not in merged:
+                    merged[key] = value
+                elif self.multiprocess_mode == "max":
+                    merged[key] = max(merged[key], value)
+                else:
+                    merged[key] += value
+        return merged
+
+    def _samples(self, values):
+        items = sorted(values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        for key, value in items:
+            yield "", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][index] += 1
+                    break
+            state["sum"] += value
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state["counts"]) if state else 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {"counts": list(state["counts"]), "sum": state["sum"]}
+                for key, state in self._values.items()
+            }
+
+    def merge(self, snapshots):
+        merged: Dict[Tuple[str, ...], dict] = {}
+        for values in snapshots:
+            for key, state in values.items():
+                if len(state["counts"]) != len(self.buckets):
+                    # Written by a version with other buckets
+                    continue
+                total = merged.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0})
+                total["counts"] = [a + b for a, b in zip(total["counts"], state["counts"])]
+                total["sum"] += state["sum"]
+        return merged
+
+    def _samples(self, values):
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state["counts"]):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames + ("le",), key + (_format_value(bound),)
+                )
+                yield "_bucket", labels, cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield "_count", labels, cumulative
+            yield "_sum", labels, state["sum"]
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _parse_values(data: dict) -> Dict[str, Dict[Tuple[str, ...], object]]:
+    """Values by metric name and label values, from a snapshot file's JSON"""
+    return {name: {tuple(key): value for key, value in values} for name, values in data.items()}
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _snapshot_alive(path: Path) -> bool:
+    """Whether the process that writes a ``<pid>-<id>.json`` snapshot is still running"""
+    pid = path.name.partition("-")[0]
+    return pid.isdigit() and _process_alive(int(pid))
+
+
+class Registry:
+    """
+    Collection of metrics rendered together.
+
+    With a `multiprocess_dir` (RESUMEGEN_METRICS_DIR), every process writes
+    a snapshot of its values to ``<dir>/<pid>-<id>.json`` on flush(), and
+    render() reports the sum over all snapshots in the directory. Counters and
+    histograms of exited processes keep counting; gauges only include live
+    processes. The snapshots of exited processes are folded into one
+    ``aggregate.json``, so recycled workers do not make the directory grow.
+    """
+
+    def __init__(self, multiprocess_dir: Path | str | None = None):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self._snapshot_path: Optional[Path] = None
+        self._flush_interval = 0.0
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def _own_snapshot_path(self) -> Path:
+        pid = os.getpid()
+        if self._snapshot_path is None or not self._snapshot_path.name.startswith(f"{pid}-"):
+            self._snapshot_path = self.multiprocess_dir / f"{pid}-{uuid.uuid4().hex[:8]}.json"
+        return self._snapshot_path
+
+    def flush(self) -> None:
+        """Write this process's values to the multiprocess directory, if there is one"""
+        if self.multiprocess_dir is None:
+            return
+        with self._lock:
+            metrics = list(self._metrics.values())
+        data = {
+            metric.name: [[list(key), value] for key, value in metric.snapshot().items()]
+            for metric in metrics
+        }
+        self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        _write_json(self._own_snapshot_path(), data)
+
+    def start_flushing(self, interval: float) -> None:
+        """Flush from a daemon thread every `interval` seconds"""
+
+        def flush_periodically():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+        self._flush_interval = interval
+        threading.Thread(target=flush_periodically, name="metrics-flush", daemon=True).start()
+
+    def after_fork_in_child(self) -> None:
+        """
+        Start a forked process from zero: the values it inherited are the
+        parent's, which the parent reports itself. The flush thread, which
+        does not survive a fork, is restarted.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+        self._snapshot_path = None
+        if self._flush_interval:
+            self.start_flushing(self._flush_interval)
+
+    def retire(self) -> None:
+        """Fold this exiting process's values into the aggregate of exited processes"""
+        if self.multiprocess_dir is None:
+            return
+        self.flush()
+        with self._directory_lock():
+            self._compact([self._own_snapshot_path()])
+
+    @contextmanager
+    def _directory_lock(self) -> Iterator[None]:
+        import fcntl
+
+        self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.multiprocess_dir / LOCK_NAME, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _compact(self, paths: List[Path]) -> None:
+        """
+        Merge the counters and histograms of exited processes' snapshots into
+        the aggregate file, then delete the snapshots. The aggregate lists the
+        snapshots it holds, so one whose deletion was interrupted is not
+        counted twice. Called with the directory lock held.
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        aggregate_path = self.multiprocess_dir / AGGREGATE_NAME
+        aggregate = _read_json(aggregate_path) or {}
+        merged_names = set(aggregate.get("merged", ()))
+        totals = _parse_values(aggregate.get("metrics", {}))
+        merged = []
+        for path in paths:
+            data = None if path.name in merged_names else _read_json(path)
+            if data is None:
+                continue
+            for name, values in _parse_values(data).items():
+                metric = metrics.get(name)
+                if metric is None or isinstance(metric, Gauge):
+                    continue
+                totals[name] = metric.merge([totals.get(name, {}), values])
+            merged.append(path)
+        if merged:
+            existing = {path.name for path in self.multiprocess_dir.glob("*.json")}
+            names = (merged_names & existing) | {path.name for path in merged}
+            _write_json(
+                aggregate_path,
+                {
+                    "metrics": {
+                        name: [[list(key), value] for key, value in values.items()]
+                        for name, values in totals.items()
+                    },
+                    "merged": sorted(names),
+                },
+            )
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _snapshots(self) -> List[tuple[bool, dict]]:
+        """
+        (process alive, values by metric name) of the exited processes'
+        aggregate and of every live process, after compacting the snapshots
+        of processes that have exited since the last call.
+        """
+        with self._directory_lock():
+            paths = [
+                path
+                for path in self.multiprocess_dir.glob("*.json")
+                if path.name != AGGREGATE_NAME
+            ]
+            exited = [path for path in paths if not _snapshot_alive(path)]
+            if exited:
+                self._compact(exited)
+            aggregate = _read_json(self.multiprocess_dir / AGGREGATE_NAME) or {}
+            merged_names = set(aggregate.get("merged", ()))
+            snapshots = [(False, _parse_values(aggregate.get("metrics", {})))]
+            for path in paths:
+                if path in exited or path.name in merged_names:
+                    continue
+                data = _read_json(path)
+                if data is not None:
+                    snapshots.append((True, _parse_values(data)))
+        return snapshots
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        if self.multiprocess_dir is None:
+            return "\n".join(metric.render() for metric in metrics) + "\n"
+
+        self.flush()
+        snapshots = self._snapshots()
+        parts = []
+        for metric in metrics:
+            values = [
+                data.get(metric.name, {})
+                for alive, data in snapshots
+                if alive or not isinstance(metric, Gauge)
+            ]
+            parts.append(metric.render(metric.merge(values)))
+        return "\n".join(parts) + "\n"
+
+
+# Directory shared by the worker processes of one server, for metrics
+# aggregated across workers; each process reports only its own values when unset
+METRICS_DIR = os.getenv("RESUMEGEN_METRICS_DIR")
+# Seconds between writes of a worker's values to RESUMEGEN_METRICS_DIR
+METRICS_FLUSH_INTERVAL = float(os.getenv("RESUMEGEN_METRICS_FLUSH_INTERVAL", "1"))
+
+REGISTRY = Registry()
+
+
+def enable_multiprocess(
+    directory: Path | str, flush_interval: float = METRICS_FLUSH_INTERVAL
+) -> None:
+    """
+    Aggregate the metrics of all processes sharing `directory`. Must be called
+    before worker processes are forked; spawned workers read RESUMEGEN_METRICS_DIR.
+    """
+    first = REGISTRY.multiprocess_dir is None
+    REGISTRY.multiprocess_dir = Path(directory)
+    if first:
+        # Forked workers report their own values; exiting ones add their final counts to the aggregate
+        os.register_at_fork(before=REGISTRY.flush, after_in_child=REGISTRY.after_fork_in_child)
+        atexit.register(REGISTRY.retire)
+        REGISTRY.start_flushing(flush_interval)
+
+
+if METRICS_DIR:
+    enable_multiprocess(METRICS_DIR)
+
+REQUESTS = REGISTRY.register(
+    Counter(
+        "resumegen_requests_total",
+        "Generation requests handled, by endpoint, document type and HTTP status.",
+        ("endpoint", "document_type", "status"),
+    )
+)
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "resumegen_request_duration_seconds",
+        "End-to-end request latency.",
+        ("endpoint", "document_type"),
+    )
+)
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "resumegen_stage_duration_seconds",
+        "Latency of a single generation stage (validation, render, pdf, encoding).",
+        ("stage", "document_type"),
+    )
+)
+PDF_ERRORS = REGISTRY.register(
+    Counter(
+        "resumegen_pdf_errors_total",
+        "PDF backend failures, by backend and document type.",
+        ("backend", "document_type"),
+    )
+)
+PDF_RETRIES = REGISTRY.register(
+    Counter(
+        "resumegen_pdf_retries_total",
+        "Retried calls to the PDF backend.",
+        ("backend",),
+    )
+)
+QUEUE_DEPTH = REGISTRY.register(
+    Gauge(
+        "resumegen_queue_depth",
+        "Generation requests waiting for a free render slot.",
+    )
+)
+INFLIGHT_RENDERS = REGISTRY.register(
+    Gauge(
+        "resumegen_inflight_renders",
+        "Documents currently being generated, by document type.",
+        ("document_type",),
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "resumegen_cache_requests_total",
+        "Cache lookups by cache name and result (hit or miss).",
+        ("cache", "result"),
+    )
+)
+RESPONSE_BYTES = REGISTRY.register(
+    Histogram(
+        "resumegen_response_size_bytes",
+        "Response payload size in bytes.",
+        ("document_type",),
+        buckets=SIZE_BUCKETS,
+    )
+)
+
+REQUEST_PEAK_MEMORY = REGISTRY.register(
+    Histogram(
+        "resumegen_request_peak_memory_bytes",
+        "Peak traced Python memory above the baseline while a request ran (RESUMEGEN_TRACE_MEMORY).",
+        ("endpoint", "document_type"),
+        buckets=MEMORY_BUCKETS,
+    )
+)
+
+PDF_BYTES_SAVED = REGISTRY.register(
+    Counter(
+        "resumegen_pdf_bytes_saved_total",
+        "Bytes removed from generated PDFs by post-processing, by document type.",
+        ("document_type",),
+    )
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record a cache lookup for hit-ratio reporting."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+ARTIFACT_BYTES = REGISTRY.register(
+    Gauge(
+        "resumegen_artifact_store_bytes",
+        "Bytes held by an artifact store, as last measured by this process.",
+        ("store",),
+        multiprocess_mode="max",
+    )
+)
+ARTIFACT_EVICTIONS = REGISTRY.register(
+    Counter(
+        "resumegen_artifact_evictions_total",
+        "Artifacts and leftover files removed from a store, by reason (size, ttl, orphan).",
+        ("store", "reason"),
+    )
+)
@@ -0,0 +1,77 @@
+# resumegen/models/compact.py
+"""
+Compact, read-only records for render-only use.
+
+Every Pydantic model instance carries a ``__dict__`` and field-set
+bookkeeping, which adds up when a batch holds whole cohorts of validated
+resumes. ``compact()`` converts a validated model into tuple-backed records
+(named tuples with the same field names, nested lists as tuples and short
+strings interned), which take a fraction of the memory and render with the
+same templates. ``expand()`` turns them back into models.
+"""
+
+import sys
+from collections import namedtuple
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+# Strings up to this length are interned, so values repeated across a cohort
+# (proficiency levels, employment types, institutions) are stored once
+INTERN_MAX_LENGTH = 64
+
+_record_types: Dict[type, type] = {}
+
+
+def record_type(model: type[BaseModel]) -> type:
+    """
+    The compact record type of a model: a named tuple with the model's fields.
+    """
+    record = _record_types.get(model)
+    if record is None:
+        record = namedtuple(f"Compact{model.__name__}", tuple(model.model_fields))
+        record.__module__ = __name__
+        record.model = model
+        _record_types[model] = record
+    return record
+
+
+def is_compact(value: Any) -> bool:
+    return isinstance(value, tuple) and hasattr(type(value), "model")
+
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return compact(value)
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+    if isinstance(value, list):
+        return tuple(_compact_value(item) for item in value)
+    return value
+
+
+def compact(document: BaseModel) -> tuple:
+    """
+    Convert a validated model (e.g. a Resume) into a compact record.
+    """
+    record = record_type(type(document))
+    return record._make(
+        _compact_value(getattr(document, name)) for name in record._fields
+    )
+
+
+def _expand_value(value: Any) -> Any:
+    if is_compact(value):
+        return expand(value)
+    if isinstance(value, tuple):
+        return [_expand_value(item) for item in value]
+    return value
+
+
+def expand(record: tuple) -> BaseModel:
+    """
+    Convert a compact record back into its model. The record was built from
+    a validated model, so the model is constructed without validating again.
+    """
+    fields = {name: _expand_value(value) for name, value in zip(record._fields, record)}
+    return type(record).model.model_construct(**fields)
@@ -1,10 +1,11 @@
 # resumegen/models/cover_letter.py
-from pydantic import BaseModel, Field
+from pydantic import Field
+from resumegen.models.fingerprint import Fingerprinted
 from typing import List, Annotated
 from resumegen.models.personal_info import PersonalInfo
 
 
-class CoverLetter(BaseModel):
+class CoverLetter(Fingerprinted):
     personal_information: PersonalInfo = Field(
         ..., description="Personal information of the candidate."
     )
@@ -0,0 +1,143 @@
+# resumegen/models/fingerprint.py
+"""
+Canonical content fingerprints and structural diffs for documents.
+
+A document's fingerprint is built from one hash per top-level field
+("section"); list sections also keep one hash per item. Section hashes are
+computed on first use from Pydantic's JSON serialization (field order is
+fixed by the model, so the result is deterministic across processes) and
+memoized on the instance, so repeated comparisons only compare hashes.
+
+Fingerprints of nested fingerprinted models (e.g. a PersonalInfo shared by
+many documents) are memoized on those models and reused. Assigning a field
+drops its memoized hash; after mutating nested values in place call
+``invalidate_fingerprints()``.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, PrivateAttr
+from pydantic_core import to_json
+
+DIGEST_SIZE = 16
+
+# Section hash and, for list sections, the hash of every item
+_Section = Tuple[bytes, Optional[Tuple[bytes, ...]]]
+
+
+def _hash(*parts: bytes) -> bytes:
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def _item_digest(value: Any) -> bytes:
+    if isinstance(value, Fingerprinted):
+        return value._digest()
+    return _hash(to_json(value))
+
+
+def _section_digest(value: Any) -> _Section:
+    if isinstance(value, (list, tuple)):
+        items = tuple(_item_digest(item) for item in value)
+        return _hash(b"list", *items), items
+    return _item_digest(value), None
+
+
+class Fingerprinted(BaseModel):
+    """
+    Base for documents with memoized section fingerprints and structural diffs.
+    """
+
+    # Section name -> memoized section hash; None holds the whole-document hash
+    _fingerprints: Optional[Dict[Optional[str], Any]] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if self._fingerprints and name in type(self).model_fields:
+            self._fingerprints.pop(name, None)
+            self._fingerprints.pop(None, None)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        # Sections not replaced by the update keep their hashes
+        memo = self._fingerprints or {}
+        kept = {
+            name: section
+            for name, section in memo.items()
+            if name is not None and name not in (update or {})
+        }
+        # Nothing memoized compares equal to a freshly validated model
+        copied._fingerprints = kept or None
+        return copied
+
+    def invalidate_fingerprints(self) -> None:
+        """Forget memoized hashes, e.g. after changing nested values in place."""
+        self._fingerprints = None
+
+    def _section(self, name: str) -> _Section:
+        memo = self._fingerprints
+        if memo is None:
+            memo = self._fingerprints = {}
+        section = memo.get(name)
+        if section is None:
+            section = memo[name] = _section_digest(getattr(self, name))
+        return section
+
+    def _digest(self) -> bytes:
+        digest = self._fingerprints.get(None) if self._fingerprints else None
+        if digest is None:
+            parts = [type(self).__name__.encode()]
+            for name in type(self).model_fields:
+                parts += [name.encode(), self._section(name)[0]]
+            digest = self._fingerprints[None] = _hash(*parts)
+        return digest
+
+    def fingerprint(self) -> str:
+        """
+        Canonical hash of the whole document, as hex. Equal content gives an
+        equal fingerprint in any process.
+        """
+        return self._digest().hex()
+
+    def section_fingerprints(self) -> Dict[str, str]:
+        """Hash of every top-level field, as hex."""
+        return {name: self._section(name)[0].hex() for name in type(self).model_fields}
+
+    def item_fingerprints(self, section: str) -> Optional[List[str]]:
+        """Hash of every item of a list section, or None if the section is not a list."""
+        items = self._section(section)[1]
+        return None if items is None else [item.hex() for item in items]
+
+    def diff(self, other: "Fingerprinted") -> Dict[str, Optional[List[int]]]:
+        """
+        Sections that differ between two documents of the same kind.
+
+        Returns a mapping of changed section names to the indices of the
+        items that changed, were added or were removed, in field order; the
+        value is None for sections that are not lists on both sides.
+        """
+        fields = list(type(self).model_fields)
+        if fields != list(type(other).model_fields):
+            raise TypeError(
+                f"Cannot diff {type(self).__name__} with {type(other).__name__}"
+            )
+        changed: Dict[str, Optional[List[int]]] = {}
+        for name in fields:
+            digest, items = self._section(name)
+            other_digest, other_items = other._section(name)
+            if digest == other_digest:
+                continue
+            if items is None or other_items is None:
+                changed[name] = None
+                continue
+            changed[name] = [
+                index
+                for index in range(max(len(items), len(other_items)))
+                if index >= len(items)
+                or index >= len(other_items)
+                or items[index] != other_items[index]
+            ]
+        return changed
@@ -1,8 +1,9 @@
 # resumegen/models/personal_info.py
-from pydantic import BaseModel, Field
+from pydantic import Field
+from resumegen.models.fingerprint import Fingerprinted
 
 
-class PersonalInfo(BaseModel):
+class PersonalInfo(Fingerprinted):
     """
     Personal information of the candidate.
     """
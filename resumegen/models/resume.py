@@ -1,5 +1,6 @@
 # resumegen/models/resume.py
 from pydantic import BaseModel, Field
+from resumegen.models.fingerprint import Fingerprinted
 from typing import List, Union
 from resumegen.models.personal_info import PersonalInfo
 
@@ -206,7 +207,7 @@ SectionType = List[
 ]
 
 
-class Resume(BaseModel):
+class Resume(Fingerprinted):
     """
     The entire resume of one candidate.
     """
@@ -0,0 +1,126 @@
+"""Output targets of a generation request.
+
+``output_format`` is either one of the original strings (``"html"``,
+``"pdf"``, ``"both"``) or a list of targets, all produced from one render
+of the document and one browser page:
+
+- ``html``: the rendered HTML.
+- ``pdf`` or ``pdf:<paper>``: a PDF on A4 or the given paper size.
+- ``thumbnail`` or ``thumbnail:<width>``: a PNG of the first page, ``width``
+  pixels wide (default 300), on the paper size of the first PDF target.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Tuple
+
+# Paper sizes accepted by Puppeteer's `format`, in millimetres
+PAPER_SIZES = {
+    "a3": (297.0, 420.0),
+    "a4": (210.0, 297.0),
+    "a5": (148.0, 210.0),
+    "letter": (215.9, 279.4),
+    "legal": (215.9, 355.6),
+    "tabloid": (279.4, 431.8),
+    "ledger": (431.8, 279.4),
+}
+DEFAULT_PAPER = "a4"
+THUMBNAIL_WIDTH = 300
+MAX_THUMBNAIL_WIDTH = 2000
+# CSS pixels per millimetre
+PX_PER_MM = 96 / 25.4
+
+LEGACY_FORMATS = {"html": ("html",), "pdf": ("pdf",), "both": ("html", "pdf")}
+KINDS = ("html", "pdf", "thumbnail")
+
+
+@dataclass(frozen=True)
+class OutputTarget:
+    name: str  # as requested, e.g. "pdf:letter"
+    kind: str  # "html", "pdf" or "thumbnail"
+    paper: str = DEFAULT_PAPER
+    width: int = THUMBNAIL_WIDTH
+
+    @property
+    def cache_id(self) -> str:
+        """Spelling-independent identity, e.g. "pdf" and "pdf:a4" are the same output"""
+        if self.kind == "thumbnail":
+            return f"thumbnail:{self.paper}:{self.width}"
+        return f"{self.kind}:{self.paper}" if self.kind == "pdf" else self.kind
+
+    def filename(self, stem: str) -> str:
+        """File name of the output in an archive"""
+        if self.kind == "html":
+            return f"{stem}.html"
+        if self.kind == "pdf":
+            return f"{stem}.pdf" if self.name == "pdf" else f"{stem}-{self.paper}.pdf"
+        if self.name == "thumbnail":
+            return f"{stem}-thumbnail.png"
+        return f"{stem}-thumbnail-{self.width}.png"
+
+    def browser_job(self) -> Dict[str, Any]:
+        """Description of the output for the PDF backend's multi-output job"""
+        if self.kind == "pdf":
+            return {"name": self.name, "type": "pdf", "options": {"format": self.paper}}
+        width_mm, height_mm = PAPER_SIZES[self.paper]
+        width, height = round(width_mm * PX_PER_MM), round(height_mm * PX_PER_MM)
+        return {
+            "name": self.name,
+            "type": "screenshot",
+            "viewport": {"width": width, "height": height, "deviceScaleFactor": self.width / width},
+        }
+
+
+def _parse_target(spec: Any) -> Tuple[str, str, str]:
+    if not isinstance(spec, str):
+        raise ValueError(f"Output targets must be strings, got {spec!r}")
+    name = spec.strip().lower()
+    kind, _, argument = name.partition(":")
+    if kind not in KINDS or (kind == "html" and argument):
+        raise ValueError(
+            f"Unknown output target: {spec!r} (use html, pdf, pdf:<paper> or thumbnail[:<width>])"
+        )
+    if kind == "pdf" and argument and argument not in PAPER_SIZES:
+        raise ValueError(f"Unknown paper size: {argument!r} (use {', '.join(PAPER_SIZES)})")
+    if kind == "thumbnail" and argument and not (
+        argument.isdigit() and 0 < int(argument) <= MAX_THUMBNAIL_WIDTH
+    ):
+        raise ValueError(f"Thumbnail width must be 1-{MAX_THUMBNAIL_WIDTH} pixels, got {argument!r}")
+    return name, kind, argument
+
+
+def parse_targets(output_format: str | Iterable[str]) -> Tuple[OutputTarget, ...]:
+    """
+    Targets requested by an ``output_format``; repeated targets are dropped.
+    Raises ValueError for unknown targets, paper sizes and widths.
+    """
+    if isinstance(output_format, str):
+        specs = LEGACY_FORMATS.get(output_format.strip().lower(), (output_format,))
+    else:
+        specs = list(output_format)
+        if not specs:
+            raise ValueError("output_format must name at least one target")
+    parsed = [_parse_target(spec) for spec in specs]
+    # Thumbnails show the first page of the first PDF's paper size
+    thumbnail_paper = next(
+        (argument or DEFAULT_PAPER for _, kind, argument in parsed if kind == "pdf"), DEFAULT_PAPER
+    )
+    targets: Dict[str, OutputTarget] = {}
+    for name, kind, argument in parsed:
+        if kind == "pdf":
+            target = OutputTarget(name, kind, paper=argument or DEFAULT_PAPER)
+        elif kind == "thumbnail":
+            target = OutputTarget(
+                name, kind, paper=thumbnail_paper, width=int(argument or THUMBNAIL_WIDTH)
+            )
+        else:
+            target = OutputTarget(name, kind)
+        targets.setdefault(target.name, target)
+    return tuple(targets.values())
+
+
+def is_legacy(output_format: str | Iterable[str]) -> bool:
+    """
+    Whether an ``output_format`` is one of the original strings, which are
+    answered in html_content and pdf_content instead of per-target outputs.
+    """
+    return isinstance(output_format, str) and output_format.strip().lower() in LEGACY_FORMATS
@@ -0,0 +1,116 @@
+"""Optional size reduction of generated PDFs.
+
+Runs after the PDF backend, on the PDF bytes, with the optional ``pypdf``
+package (``pip install resumegen[pdf]``). The optimizations are:
+
+- ``compress``: Flate-compress every stream stored without a filter.
+- ``dedupe``: merge identical objects (fonts and images repeated per page)
+  and drop unreferenced ones.
+- ``metadata``: remove the document information dictionary (producer,
+  creator, dates) and XMP metadata.
+
+Chromium already subsets the fonts it embeds, and pypdf cannot subset
+fonts, so fonts are only reduced by ``compress`` and ``dedupe``. A result
+that is not smaller than the input is discarded.
+"""
+
+import importlib.util
+import io
+import os
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+from resumegen.metrics import PDF_BYTES_SAVED
+
+# pypdf is imported on first use, so commands that do not optimize stay fast to start
+PYPDF_AVAILABLE = importlib.util.find_spec("pypdf") is not None
+
+OPTIMIZATIONS = ("compress", "dedupe", "metadata")
+# zlib level used for streams compressed by "compress"
+COMPRESSION_LEVEL = 9
+
+
+def parse_optimizations(value: str | Iterable[str] | None) -> Tuple[str, ...]:
+    """
+    Normalize a list of optimizations, or a comma-separated string of them;
+    "all" selects every optimization and "none" or an empty value none.
+    """
+    if value is None:
+        return ()
+    names = value.split(",") if isinstance(value, str) else list(value)
+    names = [name.strip().lower() for name in names if name.strip()]
+    if "all" in names:
+        return OPTIMIZATIONS
+    names = [name for name in names if name != "none"]
+    unknown = [name for name in names if name not in OPTIMIZATIONS]
+    if unknown:
+        raise ValueError(
+            f"Unknown PDF optimization: {', '.join(unknown)} (use {', '.join(OPTIMIZATIONS)} or all)"
+        )
+    return tuple(name for name in OPTIMIZATIONS if name in names)
+
+
+# Optimizations applied when a request does not choose any (RESUMEGEN_PDF_OPTIMIZE)
+DEFAULT_OPTIMIZATIONS = parse_optimizations(os.getenv("RESUMEGEN_PDF_OPTIMIZE", ""))
+
+
+@dataclass
+class OptimizeResult:
+    pdf: bytes
+    original_bytes: int
+    optimizations: Tuple[str, ...] = ()
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - len(self.pdf)
+
+
+def _compress_streams(writer) -> None:
+    from pypdf.generic import StreamObject
+
+    # pypdf has no public way to re-encode arbitrary streams; objects are
+    # replaced in place so every indirect reference keeps pointing at them
+    objects = writer._objects
+    for index, obj in enumerate(objects):
+        if isinstance(obj, StreamObject) and "/Filter" not in obj:
+            encoded = obj.flate_encode(level=COMPRESSION_LEVEL)
+            encoded.indirect_reference = obj.indirect_reference
+            objects[index] = encoded
+
+
+def optimize_pdf(
+    pdf: bytes,
+    optimizations: Iterable[str] = OPTIMIZATIONS,
+    document_type: str = "document",
+) -> OptimizeResult:
+    """
+    Apply size optimizations to a PDF and report the bytes saved.
+    Returns the input unchanged if no optimization is selected or the
+    result would not be smaller.
+    """
+    optimizations = parse_optimizations(optimizations)
+    if not optimizations:
+        return OptimizeResult(pdf, len(pdf))
+    if not PYPDF_AVAILABLE:
+        raise RuntimeError(
+            "PDF optimization requires pypdf; install the 'pdf' extra: pip install resumegen[pdf]"
+        )
+    import pypdf
+    from pypdf.generic import NameObject
+
+    writer = pypdf.PdfWriter(clone_from=pypdf.PdfReader(io.BytesIO(pdf)))
+    if "metadata" in optimizations:
+        writer.metadata = None
+        writer.root_object.pop(NameObject("/Metadata"), None)
+    if "dedupe" in optimizations:
+        writer.compress_identical_objects()
+    if "compress" in optimizations:
+        _compress_streams(writer)
+
+    output = io.BytesIO()
+    writer.write(output)
+    optimized = output.getvalue()
+    if len(optimized) >= len(pdf):
+        return OptimizeResult(pdf, len(pdf), optimizations)
+    PDF_BYTES_SAVED.inc(len(pdf) - len(optimized), document_type=document_type)
+    return OptimizeResult(optimized, len(pdf), optimizations)
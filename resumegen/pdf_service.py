@@ -1,31 +1,90 @@
 import subprocess
 import os
-import requests
+import base64
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
+from resumegen.assets import wait_condition
+from resumegen.metrics import PDF_RETRIES
 
 PDF_SERVICE_PATH = Path(__file__).parent.parent / "PdfService"
+# Number of extra attempts for transient PDF service failures (connection errors, 5xx)
+PDF_SERVICE_RETRIES = int(os.getenv("PDF_SERVICE_RETRIES", "2"))
 
 
-def generate_pdf_http(html_content: str, pdf_path: Path | str, pdf_service_url: str):
+def pdf_backend_name() -> str:
+    """
+    Name of the PDF backend selected by the environment ('http' or 'subprocess').
+    """
+    return "http" if os.getenv("PDF_SERVICE_URL") else "subprocess"
+
+
+def _post(
+    endpoint: str,
+    payload: dict,
+    pdf_service_url: str,
+    retries: int = PDF_SERVICE_RETRIES,
+    session=None,
+):
+    """
+    POST a JSON job to the PDF service and return the response, retrying transient failures.
+    """
+    # Imported lazily: only the microservice mode talks HTTP
+    import requests
+
+    client = session if session is not None else requests
+    attempt = 0
+    while True:
+        try:
+            response = client.post(f"{pdf_service_url}{endpoint}", json=payload, timeout=60)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.RequestException as e:
+            transient = not isinstance(e, requests.exceptions.HTTPError) or (
+                e.response is not None and e.response.status_code >= 500
+            )
+            if not transient or attempt >= retries:
+                raise RuntimeError(f"HTTP PDF generation failed: {e}")
+            attempt += 1
+            PDF_RETRIES.inc(backend="http")
+            time.sleep(0.2 * 2**attempt)
+
+
+def _post_pdf(
+    html_content: str,
+    pdf_service_url: str,
+    retries: int = PDF_SERVICE_RETRIES,
+    session=None,
+) -> bytes:
+    """
+    POST HTML to the PDF service and return the PDF bytes, retrying transient failures.
+    """
+    payload = {"html": html_content, "waitUntil": wait_condition(html_content)}
+    return _post("/generate-pdf", payload, pdf_service_url, retries, session).content
+
+
+def generate_pdf_http(
+    html_content: str,
+    pdf_path: Path | str,
+    pdf_service_url: str,
+    retries: int = PDF_SERVICE_RETRIES,
+):
     """
     Generate PDF using HTTP PDF service.
     Args:
         html_content (str): HTML content to convert to PDF.
         pdf_path (str): Path to save the output PDF file.
         pdf_service_url (str): URL of the PDF service (e.g., 'http://pdf-service:3000').
+        retries (int): Extra attempts on connection errors and 5xx responses.
     """
-    try:
-        response = requests.post(
-            f"{pdf_service_url}/generate-pdf", json={"html": html_content}, timeout=60
-        )
-        response.raise_for_status()
+    pdf_bytes = _post_pdf(html_content, pdf_service_url, retries)
 
-        # Save the PDF content
-        with open(pdf_path, "wb") as f:
-            f.write(response.content)
-
-    except requests.exceptions.RequestException as e:
-        raise RuntimeError(f"HTTP PDF generation failed: {e}")
+    # Save the PDF content
+    with open(pdf_path, "wb") as f:
+        f.write(pdf_bytes)
 
 
 def generate_pdf_subprocess(
@@ -48,8 +107,9 @@ def generate_pdf_subprocess(
     html_path = Path(html_path).resolve()
     pdf_path = Path(pdf_path).resolve()
 
+    wait_until = wait_condition(html_path.read_text(encoding="utf-8"))
     result = subprocess.run(
-        ["node", node_script_path, html_path, pdf_path], capture_output=True, text=True
+        ["node", node_script_path, html_path, pdf_path, wait_until], capture_output=True, text=True
     )
     if result.returncode != 0:
         raise RuntimeError(f"PDF generation failed: {result.stderr}")
@@ -87,3 +147,199 @@ def generate_pdf(
     else:
         # Use subprocess (CLI method)
         generate_pdf_subprocess(html_path, pdf_path, node_script_path)
+
+
+class HttpPdfBackend:
+    """
+    Reusable PDF backend for the HTTP PDF service.
+    Keeps one pooled connection per concurrent render instead of reconnecting per document.
+    """
+
+    name = "http"
+    # Stateless: a failed request does not affect the next one
+    running = True
+
+    def __init__(self, pdf_service_url: str, concurrency: int = 4):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.pdf_service_url = pdf_service_url
+        self.concurrency = concurrency
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def render(self, html_content: str, pdf_path: Path | str | None = None) -> bytes | None:
+        """
+        Convert HTML to PDF. Writes to pdf_path if given, otherwise returns the PDF bytes.
+        Safe to call from several threads at once.
+        """
+        pdf_bytes = _post_pdf(html_content, self.pdf_service_url, session=self._session)
+        if pdf_path is None:
+            return pdf_bytes
+        with open(pdf_path, "wb") as f:
+            f.write(pdf_bytes)
+        return None
+
+    def render_outputs(self, html_content: str, targets: list[dict]) -> dict[str, bytes]:
+        """
+        Produce several outputs (see resumegen.outputs) from one page load,
+        keyed by target name.
+        """
+        payload = {
+            "html": html_content,
+            "waitUntil": wait_condition(html_content),
+            "targets": targets,
+        }
+        outputs = _post("/generate-outputs", payload, self.pdf_service_url, session=self._session)
+        return {name: base64.b64decode(data) for name, data in outputs.json()["outputs"].items()}
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NodePdfWorker:
+    """
+    Long-lived Node.js/Puppeteer process (`index.js --serve`) rendering many documents
+    with one browser. Jobs are exchanged as JSON lines over stdin/stdout; up to
+    `concurrency` pages render in parallel inside the browser.
+    """
+
+    name = "subprocess"
+
+    def __init__(self, node_script_path: Path | str | None = None, concurrency: int = 4):
+        if node_script_path is None:
+            node_script_path = PDF_SERVICE_PATH / "index.js"
+        self.concurrency = concurrency
+        self._process = subprocess.Popen(
+            ["node", str(Path(node_script_path).resolve()), "--serve", "--concurrency", str(concurrency)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._pending: dict[int, Future] = {}
+        self._stderr_tail: deque[str] = deque(maxlen=20)
+        threading.Thread(target=self._read_replies, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_replies(self) -> None:
+        for line in self._process.stdout:
+            try:
+                reply = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            with self._lock:
+                future = self._pending.pop(reply.get("id"), None)
+            if future is None:
+                continue
+            if reply.get("ok") and "outputs" in reply:
+                future.set_result(
+                    {name: base64.b64decode(data) for name, data in reply["outputs"].items()}
+                )
+            elif reply.get("ok"):
+                pdf = reply.get("pdf")
+                future.set_result(base64.b64decode(pdf) if pdf is not None else None)
+            else:
+                future.set_exception(RuntimeError(f"PDF generation failed: {reply.get('error')}"))
+
+        # The worker exited: fail everything still waiting
+        error = RuntimeError(
+            "PDF worker exited unexpectedly: " + "".join(self._stderr_tail).strip()
+        )
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(error)
+
+    def _read_stderr(self) -> None:
+        for line in self._process.stderr:
+            self._stderr_tail.append(line)
+
+    def submit(
+        self,
+        html_content: str,
+        pdf_path: Path | str | None = None,
+        targets: list[dict] | None = None,
+    ) -> Future:
+        """
+        Queue a document and return a Future resolving to the PDF bytes (or None if
+        written to pdf_path), or with `targets` to the outputs keyed by target name.
+        """
+        future: Future = Future()
+        job = {"html": html_content, "waitUntil": wait_condition(html_content)}
+        if pdf_path is not None:
+            job["path"] = str(Path(pdf_path).resolve())
+        if targets is not None:
+            job["targets"] = targets
+        with self._lock:
+            if self._process.poll() is not None:
+                raise RuntimeError(
+                    "PDF worker is not running: " + "".join(self._stderr_tail).strip()
+                )
+            job["id"] = self._next_id
+            self._next_id += 1
+            self._pending[job["id"]] = future
+            try:
+                self._process.stdin.write(json.dumps(job) + "\n")
+                self._process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                self._pending.pop(job["id"], None)
+                raise RuntimeError(f"PDF worker is not running: {e}")
+        return future
+
+    def render(self, html_content: str, pdf_path: Path | str | None = None) -> bytes | None:
+        """
+        Convert HTML to PDF. Writes to pdf_path if given, otherwise returns the PDF bytes.
+        Safe to call from several threads at once.
+        """
+        return self.submit(html_content, pdf_path).result()
+
+    def render_outputs(self, html_content: str, targets: list[dict]) -> dict[str, bytes]:
+        """
+        Produce several outputs (see resumegen.outputs) from one page load,
+        keyed by target name.
+        """
+        return self.submit(html_content, targets=targets).result()
+
+    @property
+    def running(self) -> bool:
+        """Whether the Node.js process still accepts jobs"""
+        return self._process.poll() is None
+
+    def close(self, timeout: float = 30) -> None:
+        if self._process.stdin and not self._process.stdin.closed:
+            self._process.stdin.close()
+        try:
+            self._process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_pdf_backend(concurrency: int = 4) -> HttpPdfBackend | NodePdfWorker:
+    """
+    Open a reusable PDF backend for many documents, chosen like generate_pdf:
+    the HTTP service if PDF_SERVICE_URL is set, otherwise a persistent Node.js worker.
+    Use as a context manager so the backend is shut down afterwards.
+    """
+    pdf_service_url = os.getenv("PDF_SERVICE_URL")
+    if pdf_service_url:
+        return HttpPdfBackend(pdf_service_url, concurrency)
+    return NodePdfWorker(concurrency=concurrency)
@@ -0,0 +1,288 @@
+"""CPU profiling for single CLI runs and API requests.
+
+Profiles are written either as cProfile/pstats files (``.prof``, ``.pstats``;
+open with ``python -m pstats`` or snakeviz) or as folded stacks (``.folded``),
+the "frame;frame;frame microseconds" format read by flamegraph.pl, speedscope
+and inferno.
+
+In the API, profiling is opt-in per request and disabled unless
+RESUMEGEN_PROFILE_TOKEN is set. A request carrying a matching
+``X-Profile-Token`` header is profiled through validation, render and PDF
+dispatch; the profile is stored in RESUMEGEN_PROFILE_DIR and its id is
+returned in the ``X-Profile-Id`` response header, for download from
+``/debug/profiles/{id}``.
+"""
+
+import cProfile
+import hmac
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+PROFILE_FORMATS = {"pstats": ".pstats", "folded": ".folded"}
+FOLDED_SUFFIXES = (".folded", ".collapsed")
+
+# Shared secret enabling per-request API profiling; profiling is off when unset
+PROFILE_TOKEN = os.getenv("RESUMEGEN_PROFILE_TOKEN") or None
+PROFILE_DIR = Path(os.getenv("RESUMEGEN_PROFILE_DIR", "/tmp/resumegen/profiles"))
+# Most recent profiles kept in PROFILE_DIR
+PROFILE_KEEP = int(os.getenv("RESUMEGEN_PROFILE_KEEP", "100"))
+
+TOKEN_HEADER = b"x-profile-token"
+FORMAT_HEADER = b"x-profile-format"
+
+# cProfile can only have one active profiler per process on newer Pythons
+_profile_lock = threading.Lock()
+
+_current_session: ContextVar["ProfileSession | None"] = ContextVar(
+    "resumegen_profile", default=None
+)
+
+
+def format_for_path(path: Path | str) -> str:
+    return "folded" if str(path).lower().endswith(FOLDED_SUFFIXES) else "pstats"
+
+
+class StackProfiler:
+    """
+    Deterministic profiler recording exclusive time per full call stack,
+    for flame graphs. Like cProfile, it only sees the thread it is enabled in.
+    """
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self._frames: list[list] = []  # [stack key, start, time spent in children]
+
+    @staticmethod
+    def _name(frame, event: str, arg: Any) -> str:
+        if event.startswith("c_"):
+            module = getattr(arg, "__module__", None) or "builtins"
+            return f"{module}.{getattr(arg, '__qualname__', repr(arg))}"
+        code = frame.f_code
+        return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+    def _callback(self, frame, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if event in ("call", "c_call"):
+            parent = self._frames[-1][0] + ";" if self._frames else ""
+            self._frames.append([parent + self._name(frame, event, arg), now, 0.0])
+        elif self._frames:  # return, c_return, c_exception
+            key, start, children = self._frames.pop()
+            elapsed = now - start
+            self.stacks[key] += elapsed - children
+            if self._frames:
+                self._frames[-1][2] += elapsed
+
+    def enable(self) -> None:
+        sys.setprofile(self._callback)
+
+    def disable(self) -> None:
+        sys.setprofile(None)
+        # Close frames still open (e.g. the caller of enable) at the current time
+        while self._frames:
+            self._callback(None, "return", None)
+
+    def dumps(self) -> bytes:
+        lines = [
+            f"{stack} {round(seconds * 1_000_000)}"
+            for stack, seconds in sorted(self.stacks.items())
+            if seconds > 0
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class Profiler:
+    """
+    Profile the code run between enable() and disable() in the current thread.
+    Can be enabled several times; the results accumulate.
+
+    Args:
+        format: "pstats" for cProfile statistics, "folded" for flame graph stacks.
+    """
+
+    def __init__(self, format: str = "pstats"):
+        if format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format: {format} (use {', '.join(PROFILE_FORMATS)})")
+        self.format = format
+        self._profiler = cProfile.Profile() if format == "pstats" else StackProfiler()
+
+    def enable(self) -> None:
+        self._profiler.enable()
+
+    def disable(self) -> None:
+        self._profiler.disable()
+
+    @contextmanager
+    def running(self) -> Iterator["Profiler"]:
+        self.enable()
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def dumps(self) -> bytes:
+        if self.format == "folded":
+            return self._profiler.dumps()
+        self._profiler.create_stats()
+        return marshal.dumps(self._profiler.stats)
+
+    def dump(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.dumps())
+        return path
+
+
+@contextmanager
+def profile_to(path: Path | str | None) -> Iterator[Optional[Profiler]]:
+    """
+    Profile the block and write the result to `path`, in the format given by
+    its suffix. A no-op when `path` is None.
+    """
+    if path is None:
+        yield None
+        return
+    profiler = Profiler(format_for_path(path))
+    with profiler.running():
+        yield profiler
+    profiler.dump(path)
+
+
+class ProfileSession:
+    """
+    Profile of one API request. Work dispatched to the thread pool is run
+    under the profiler with `run()`.
+    """
+
+    def __init__(self, format: str = "pstats"):
+        self.id = uuid.uuid4().hex
+        self.profiler = Profiler(format)
+
+    def run(self, func: Callable, *args) -> Any:
+        with _profile_lock, self.profiler.running():
+            return func(*args)
+
+    @property
+    def filename(self) -> str:
+        return f"{self.id}{PROFILE_FORMATS[self.profiler.format]}"
+
+    def save(self, directory: Optional[Path] = None, keep: Optional[int] = None) -> Path:
+        directory = Path(directory or PROFILE_DIR)
+        path = self.profiler.dump(directory / self.filename)
+        _prune(directory, PROFILE_KEEP if keep is None else keep)
+        return path
+
+
+def _prune(directory: Path, keep: int) -> None:
+    profiles = sorted(
+        (p for p in directory.iterdir() if p.suffix in PROFILE_FORMATS.values()),
+        key=lambda p: p.stat().st_mtime,
+    )
+    for path in profiles[: max(0, len(profiles) - keep)]:
+        path.unlink(missing_ok=True)
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _current_session.get()
+
+
+def run_profiled(func: Callable, *args) -> Any:
+    """
+    Call `func` under the current request's profiler, if the request is profiled.
+    Meant to run inside the worker thread.
+    """
+    session = _current_session.get()
+    if session is None:
+        return func(*args)
+    return session.run(func, *args)
+
+
+def token_matches(token: str | None) -> bool:
+    return (
+        PROFILE_TOKEN is not None
+        and token is not None
+        and hmac.compare_digest(token.encode("utf-8"), PROFILE_TOKEN.encode("utf-8"))
+    )
+
+
+def find_profile(profile_id: str, directory: Optional[Path] = None) -> Optional[Path]:
+    if not profile_id.isalnum():
+        return None
+    for suffix in PROFILE_FORMATS.values():
+        path = Path(directory or PROFILE_DIR) / f"{profile_id}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry a valid ``X-Profile-Token`` header.
+
+    Pure ASGI: when profiling is disabled (no RESUMEGEN_PROFILE_TOKEN) or the
+    request does not ask for it, the request is passed straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if PROFILE_TOKEN is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if TOKEN_HEADER not in headers or scope["path"].startswith("/debug/"):
+            await self.app(scope, receive, send)
+            return
+
+        if not token_matches(headers[TOKEN_HEADER].decode("latin-1")):
+            await _send_plain(send, 403, b"Invalid profile token")
+            return
+        profile_format = headers.get(FORMAT_HEADER, b"pstats").decode("latin-1")
+        if profile_format not in PROFILE_FORMATS:
+            await _send_plain(send, 400, b"X-Profile-Format must be pstats or folded")
+            return
+
+        session = ProfileSession(profile_format)
+        token = _current_session.set(session)
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", session.id.encode("latin-1")),
+                    (b"x-profile-url", f"/debug/profiles/{session.id}".encode("latin-1")),
+                ]
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                # Streamed responses generate while sending, so save at the end
+                session.save()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_session.reset(token)
+
+
+async def _send_plain(send, status: int, body: bytes) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
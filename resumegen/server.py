@@ -0,0 +1,215 @@
+"""
+Production server for the Resume Generator API.
+
+Runs N worker processes behind one listening socket. Templates, the stylesheet
+and the Pydantic models are loaded in the parent before workers are forked, all
+workers share one disk-backed PDF result cache, and each worker is recycled
+after a number of requests to keep memory growth in check. Workers write their
+metrics to a shared directory, so ``/metrics`` on any worker reports the totals
+of all of them.
+
+Uses gunicorn with uvicorn workers when gunicorn is installed
+(`pip install -e ".[serve]"`); otherwise falls back to uvicorn's own process
+manager, where each worker warms up at startup instead of inheriting the state.
+"""
+
+import inspect
+import os
+import random
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from resumegen import metrics
+from resumegen.cache import CACHE_DIR_ENV
+
+DEFAULT_CACHE_DIR = Path("/tmp/resumegen/cache")
+DEFAULT_METRICS_DIR = Path("/tmp/resumegen/metrics")
+METRICS_DIR_ENV = "RESUMEGEN_METRICS_DIR"
+
+
+def default_workers() -> int:
+    return int(os.getenv("RESUMEGEN_WORKERS", str(os.cpu_count() or 1)))
+
+
+def preload_app():
+    """
+    Import the API and warm every per-process cache before workers are forked.
+    """
+    from resumegen.api import app
+    from resumegen.jinja_render import preload
+
+    preload()
+    return app
+
+
+def _share_metrics(directory: Path) -> None:
+    """
+    Aggregate metrics across workers in `directory`, dropping the values of
+    a previous server run. Forked workers inherit the setting; spawned ones
+    read it from the environment.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob("*.json"):
+        path.unlink(missing_ok=True)
+    os.environ[METRICS_DIR_ENV] = str(directory)
+    metrics.enable_multiprocess(directory)
+
+
+def _uvicorn_options(max_requests: int, max_requests_jitter: int, timeout: int) -> dict:
+    """
+    Worker recycling and timeouts for uvicorn's process manager, as close as
+    it gets to gunicorn's: the jitter is drawn per worker and `timeout` is the
+    health check timeout after which a hung worker is killed, where this
+    uvicorn supports them.
+    """
+    import uvicorn
+
+    supported = inspect.signature(uvicorn.Config).parameters
+    options = {"limit_max_requests": max_requests or None, "timeout_graceful_shutdown": timeout}
+    if max_requests and max_requests_jitter:
+        if "limit_max_requests_jitter" in supported:
+            options["limit_max_requests_jitter"] = max_requests_jitter
+        else:
+            # One draw for all workers: they still restart together, but not on a round number
+            options["limit_max_requests"] = max_requests + random.randint(0, max_requests_jitter)
+            typer.echo(
+                "Warning: this uvicorn applies one --max-requests-jitter draw to all workers; "
+                "install gunicorn or a newer uvicorn to stagger worker restarts.",
+                err=True,
+            )
+    if "timeout_worker_healthcheck" in supported:
+        options["timeout_worker_healthcheck"] = timeout
+    else:
+        typer.echo(
+            "Warning: this uvicorn cannot restart hung workers; --timeout only bounds "
+            "graceful shutdown. Install gunicorn or a newer uvicorn for worker timeouts.",
+            err=True,
+        )
+    return options
+
+
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    workers: int | None = None,
+    max_requests: int = 1000,
+    max_requests_jitter: int = 100,
+    cache_dir: Path | str | None = DEFAULT_CACHE_DIR,
+    timeout: int = 120,
+    metrics_dir: Path | str | None = None,
+) -> None:
+    """
+    Start the API with multiple worker processes.
+
+    Args:
+        host: Interface to bind.
+        port: Port to bind.
+        workers: Number of worker processes. Defaults to RESUMEGEN_WORKERS or the CPU count.
+        max_requests: Requests served by a worker before it is gracefully recycled (0 disables).
+        max_requests_jitter: Random spread added to max_requests so workers do not restart together.
+        cache_dir: Shared PDF result cache directory. None disables the cache.
+        timeout: Seconds a worker may spend on a request before it is restarted.
+        metrics_dir: Directory where workers share their metrics. Defaults to
+            RESUMEGEN_METRICS_DIR, then /tmp/resumegen/metrics; emptied at startup.
+    """
+    if workers is None:
+        workers = default_workers()
+    # Must be set before the API module is imported so every worker sees the same cache
+    if cache_dir is not None:
+        os.environ[CACHE_DIR_ENV] = str(cache_dir)
+    _share_metrics(Path(metrics_dir or os.getenv(METRICS_DIR_ENV) or DEFAULT_METRICS_DIR))
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is None:
+        import uvicorn
+
+        uvicorn.run(
+            "resumegen.api:app",
+            host=host,
+            port=port,
+            workers=workers,
+            **_uvicorn_options(max_requests, max_requests_jitter, timeout),
+        )
+        return
+
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            self.application = preload_app()
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    PreloadedApplication(
+        {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "worker_class": "uvicorn.workers.UvicornWorker",
+            "preload_app": True,
+            "max_requests": max_requests,
+            "max_requests_jitter": max_requests_jitter,
+            "timeout": timeout,
+            "graceful_timeout": timeout,
+        }
+    ).run()
+
+
+def run(
+    host: Annotated[str, typer.Option(help="Interface to bind.")] = "0.0.0.0",
+    port: Annotated[int, typer.Option(help="Port to bind.")] = 8000,
+    workers: Annotated[
+        int | None,
+        typer.Option(help="Worker processes. Defaults to RESUMEGEN_WORKERS or the CPU count."),
+    ] = None,
+    max_requests: Annotated[
+        int, typer.Option(help="Recycle a worker after this many requests (0 disables).")
+    ] = 1000,
+    max_requests_jitter: Annotated[
+        int, typer.Option(help="Random spread added to --max-requests.")
+    ] = 100,
+    cache_dir: Annotated[
+        str, typer.Option(help="Shared PDF result cache directory.")
+    ] = str(DEFAULT_CACHE_DIR),
+    no_cache: Annotated[
+        bool, typer.Option("--no-cache", help="Disable the shared result cache.")
+    ] = False,
+    timeout: Annotated[int, typer.Option(help="Worker request timeout in seconds.")] = 120,
+    metrics_dir: Annotated[
+        str | None,
+        typer.Option(
+            help="Directory where workers share their metrics. Defaults to RESUMEGEN_METRICS_DIR, then /tmp/resumegen/metrics."
+        ),
+    ] = None,
+) -> None:
+    """
+    Serve the Resume Generator API with multiple preloaded worker processes.
+    """
+    serve(
+        host=host,
+        port=port,
+        workers=workers,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+        cache_dir=None if no_cache else cache_dir,
+        timeout=timeout,
+        metrics_dir=metrics_dir,
+    )
+
+
+def main() -> None:
+    typer.run(run)
+
+
+if __name__ == "__main__":
+    main()
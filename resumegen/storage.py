@@ -1,5 +1,9 @@
 from pathlib import Path
+from typing import BinaryIO, Iterator, TextIO
+import io
 import json
+import threading
+import time
 
 
 def load_json(path: Path) -> dict:
@@ -11,6 +15,25 @@ def load_json(path: Path) -> dict:
     return user_data
 
 
+def iter_jsonl(source: Path | str | TextIO) -> Iterator[tuple[int, str]]:
+    """
+    Yield (line number, raw line) for each non-empty line of a JSON Lines file,
+    one at a time. Lines are not parsed here, so a malformed record can be
+    reported on its own without aborting the stream.
+    """
+    if hasattr(source, "read"):
+        for line_number, line in enumerate(source, start=1):
+            if line.strip():
+                yield line_number, line
+        return
+
+    path = Path(source)
+    if path.suffix.lower() not in (".jsonl", ".ndjson"):
+        raise ValueError(f"Invalid file: {path} \nInput file must be a JSON Lines (.jsonl) file.")
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_jsonl(f)
+
+
 def save_html(content: str, path: str | None = None) -> Path:
 
     if path is None:
@@ -20,3 +43,162 @@ def save_html(content: str, path: str | None = None) -> Path:
     with open(path, "w", encoding="utf-8") as f:
         f.write(content)
     return path
+
+
+def check_output_name(name: str) -> str:
+    """
+    Validate a document name taken from input data (a record's or manifest
+    entry's "output"): it must be a plain file name, so the outputs named
+    after it stay in the output directory.
+    """
+    name = str(name)
+    if name in ("", ".", "..") or "/" in name or "\\" in name:
+        raise ValueError(f"Invalid output name: {name!r} (must be a file name without directories)")
+    return name
+
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz")
+
+# Already-compressed artifacts are stored as-is inside ZIP archives
+_STORED_SUFFIXES = (".pdf", ".png", ".jpg", ".jpeg", ".gz", ".zip")
+
+
+class OutputSink:
+    """
+    Destination for generated artifacts, written one at a time by name
+    (e.g. "alice.html"). Sinks are safe to write from several threads.
+    """
+
+    def write(self, name: str, data: bytes | str) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _encode(data: bytes | str) -> bytes:
+        return data.encode("utf-8") if isinstance(data, str) else data
+
+    @staticmethod
+    def _check_name(name: str) -> str:
+        parts = Path(name).parts
+        if not parts or Path(name).is_absolute() or ".." in parts:
+            raise ValueError(f"Invalid artifact name: {name!r}")
+        return Path(name).as_posix()
+
+
+class DirectorySink(OutputSink):
+    """
+    Write each artifact as a file below a directory.
+    """
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, name: str, data: bytes | str) -> None:
+        path = self.directory / self._check_name(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self._encode(data))
+
+
+class ZipSink(OutputSink):
+    """
+    Stream artifacts into a ZIP archive. `target` may be a path or any
+    writable binary stream, including non-seekable ones (pipes, sockets).
+    """
+
+    def __init__(self, target: Path | str | BinaryIO, compresslevel: int = 6):
+        import zipfile
+
+        self._archive = zipfile.ZipFile(
+            target, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        )
+        self._lock = threading.Lock()
+
+    def write(self, name: str, data: bytes | str) -> None:
+        import zipfile
+
+        name = self._check_name(name)
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.external_attr = 0o644 << 16
+        if name.lower().endswith(_STORED_SUFFIXES):
+            info.compress_type = zipfile.ZIP_STORED
+        else:
+            info.compress_type = zipfile.ZIP_DEFLATED
+        with self._lock:
+            self._archive.writestr(info, self._encode(data))
+
+    def close(self) -> None:
+        with self._lock:
+            self._archive.close()
+
+
+class TarSink(OutputSink):
+    """
+    Stream artifacts into a tar archive, gzip-compressed when `compression` is "gz".
+    Written in stream mode, so `target` may be a non-seekable binary stream.
+    """
+
+    def __init__(self, target: Path | str | BinaryIO, compression: str = ""):
+        import tarfile
+
+        mode = f"w|{compression}"
+        if hasattr(target, "write"):
+            self._archive = tarfile.open(fileobj=target, mode=mode)
+        else:
+            self._archive = tarfile.open(name=str(target), mode=mode)
+        self._lock = threading.Lock()
+
+    def write(self, name: str, data: bytes | str) -> None:
+        import tarfile
+
+        data = self._encode(data)
+        info = tarfile.TarInfo(self._check_name(name))
+        info.size = len(data)
+        info.mtime = int(time.time())
+        info.mode = 0o644
+        with self._lock:
+            self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        with self._lock:
+            self._archive.close()
+
+
+def is_archive(path: Path | str) -> bool:
+    return str(path).lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def open_sink(
+    target: Path | str | None,
+    archive_format: str | None = None,
+    stream: BinaryIO | None = None,
+) -> OutputSink:
+    """
+    Open the sink for a target: a ZIP or tar archive by suffix (.zip, .tar,
+    .tar.gz, .tgz) or `archive_format`, otherwise a directory. With `stream`,
+    the archive is written to that binary stream instead of a file.
+    """
+    name = str(target or "").lower()
+    archive_format = archive_format or next(
+        (suffix.lstrip(".") for suffix in ARCHIVE_SUFFIXES if name.endswith(suffix)), None
+    )
+    if archive_format is None and stream is not None:
+        raise ValueError("Streaming output requires an archive format")
+    destination = stream if stream is not None else target
+    if archive_format == "zip":
+        return ZipSink(destination)
+    if archive_format == "tar":
+        return TarSink(destination)
+    if archive_format in ("tar.gz", "tgz"):
+        return TarSink(destination, compression="gz")
+    if archive_format is not None:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+    return DirectorySink(target)
@@ -0,0 +1,232 @@
+"""Streaming generation from JSON Lines input.
+
+Each line is one record, either shaped like an API request::
+
+    {"resume_data": {...}, "personal_info": {...}, "output": "alice"}
+    {"cover_letter_data": {...}, "personal_info": {...}}
+
+or a plain resume / cover letter with embedded ``personal_information``.
+
+Records flow through parse, validate, render and PDF as a pipeline with a
+bounded number of records in flight, so memory stays constant however long
+the input is. Outputs are written as soon as each record completes and a
+malformed record only fails its own line.
+"""
+
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+from resumegen.batch import process_context, detect_document_type
+from resumegen.cache import PdfFiles
+from resumegen.storage import OutputSink, check_output_name, iter_jsonl, save_html
+
+DOCUMENT_KEYS = {"resume_data": "resume", "cover_letter_data": "cover_letter"}
+
+
+@dataclass
+class RecordResult:
+    line: int
+    name: str
+    out_html: Path
+    out_pdf: Path
+    document_type: Optional[str] = None
+    error: Optional[str] = None
+    stage: Optional[str] = None  # Stage that failed: parse, validation, render, save or pdf
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def render_record(
+    line: int,
+    text: str,
+    out_dir: Path,
+    prefix: str,
+    personal_info: Optional[Dict[str, Any]] = None,
+    save: bool = True,
+) -> tuple[RecordResult, Optional[str]]:
+    """
+    Parse, validate, render and (unless `save` is False) save one record.
+    Runs in a worker process; errors are returned instead of raised.
+    """
+    import json
+
+    from resumegen.jinja_render import render_cover_letter, render_resume
+    from resumegen.utils import (
+        create_cover_letter_with_personal_info,
+        create_resume_with_personal_info,
+    )
+
+    name = f"{prefix}-{line}"
+    result = RecordResult(line=line, name=name, out_html=out_dir / f"{name}.html", out_pdf=out_dir / f"{name}.pdf")
+    result.stage = "parse"
+    try:
+        record = json.loads(text)
+        if not isinstance(record, dict):
+            raise ValueError("Record must be a JSON object")
+        if record.get("output"):
+            result.name = check_output_name(record["output"])
+            result.out_html = out_dir / f"{result.name}.html"
+            result.out_pdf = out_dir / f"{result.name}.pdf"
+
+        key = next((key for key in DOCUMENT_KEYS if key in record), None)
+        if key is not None:
+            data = record[key]
+            result.document_type = DOCUMENT_KEYS[key]
+            info_data = record.get("personal_info", personal_info)
+        else:
+            data = record
+            result.document_type = detect_document_type(record)
+            info_data = personal_info
+
+        result.stage = "validation"
+        if result.document_type == "cover_letter":
+            document = create_cover_letter_with_personal_info(data, info_data)
+            result.stage = "render"
+            html_content = render_cover_letter(document)
+        else:
+            document = create_resume_with_personal_info(data, info_data)
+            result.stage = "render"
+            html_content = render_resume(document)
+
+        if save:
+            result.stage = "save"
+            save_html(html_content, result.out_html)
+    except Exception as e:
+        result.error = str(e)
+        return result, None
+
+    result.stage = None
+    return result, html_content
+
+
+def _convert_pdf(
+    backend,
+    result: RecordResult,
+    html_content: str,
+    sink: Optional[OutputSink],
+    files: PdfFiles,
+) -> RecordResult:
+    try:
+        if sink is None:
+            files.write(
+                html_content, result.out_pdf, lambda path: backend.render(html_content, path)
+            )
+        else:
+            pdf_bytes = files.render(html_content, lambda: backend.render(html_content))
+            sink.write(result.out_pdf.name, pdf_bytes)
+    except Exception as e:
+        result.error = str(e)
+        result.stage = "pdf"
+    return result
+
+
+def stream_jsonl(
+    source: Path | str | TextIO,
+    out_dir: Path | str,
+    info_path: Path | str | None = None,
+    workers: Optional[int] = None,
+    pdf_concurrency: int = 4,
+    generate_pdfs: bool = True,
+    max_in_flight: Optional[int] = None,
+    sink: Optional[OutputSink] = None,
+) -> Iterator[RecordResult]:
+    """
+    Generate a document for every record of a JSON Lines file, yielding each
+    result as soon as its outputs are written. Failures are yielded, not raised.
+
+    Args:
+        source: JSON Lines file or open text stream (e.g. stdin).
+        out_dir: Directory for the generated files, named after each record's
+            "output" field or `<input stem>-<line number>`.
+        info_path: Personal information for records that do not carry their own.
+        workers: Render processes. Defaults to the CPU count; 1 renders in-process.
+        pdf_concurrency: Maximum concurrent PDF conversions.
+        generate_pdfs: Convert rendered HTML to PDF.
+        max_in_flight: Records read ahead of completed results. Defaults to
+            twice the number of workers plus the PDF concurrency.
+        sink: Write every artifact into this sink (e.g. a streaming archive)
+            instead of to files in `out_dir`.
+    """
+    from resumegen.pdf_service import open_pdf_backend
+    from resumegen.storage import load_json
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_in_flight is None:
+        max_in_flight = 2 * workers + pdf_concurrency
+    out_dir = Path(out_dir)
+    if sink is None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    prefix = Path(source).stem if isinstance(source, (str, Path)) else "record"
+    personal_info = load_json(Path(info_path)) if info_path else None
+    lines = iter_jsonl(source)
+
+    render_pool = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) if workers > 1 else None
+    )
+    pdf_pool = ThreadPoolExecutor(max_workers=pdf_concurrency) if generate_pdfs else None
+    backend = open_pdf_backend(pdf_concurrency) if generate_pdfs else None
+    files = PdfFiles.from_env() if generate_pdfs else None
+    pending: set[Future] = set()
+    render_futures: set[Future] = set()
+
+    def submit(line: int, text: str) -> None:
+        args = (line, text, out_dir, prefix, personal_info, sink is None)
+        if render_pool is not None:
+            future = render_pool.submit(render_record, *args)
+        else:
+            future = Future()
+            future.set_result(render_record(*args))
+        render_futures.add(future)
+        pending.add(future)
+
+    try:
+        exhausted = False
+        while True:
+            # Read ahead only while there is room, so memory stays bounded
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    submit(*next(lines))
+                except StopIteration:
+                    exhausted = True
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                if future in render_futures:
+                    render_futures.discard(future)
+                    result, html_content = future.result()
+                    if result.ok and sink is not None:
+                        try:
+                            sink.write(result.out_html.name, html_content)
+                        except Exception as e:
+                            result.error = str(e)
+                            result.stage = "save"
+                    if result.ok and generate_pdfs:
+                        pending.add(
+                            pdf_pool.submit(_convert_pdf, backend, result, html_content, sink, files)
+                        )
+                        continue
+                else:
+                    result = future.result()
+                yield result
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown(cancel_futures=True)
+        if pdf_pool is not None:
+            pdf_pool.shutdown(cancel_futures=True)
+        if backend is not None:
+            backend.close()
@@ -0,0 +1,270 @@
+"""Static analysis of which context fields a Jinja template reads.
+
+The template AST is walked once per template version to collect the
+context paths it references (``work_experience[*].company``, following
+``for`` loop variables into list items). The result is a Pydantic
+``include`` specification, so rendering serializes only the fields the
+template can show.
+
+The analysis is conservative: a value that is printed, filtered, called or
+compared is included whole, and templates using constructs it does not
+follow (assignments, macros, includes, inheritance) get the full context.
+"""
+
+import weakref
+from typing import Any, Dict, Optional, Tuple, get_args
+
+from jinja2 import Environment, Template, nodes
+from pydantic import BaseModel
+
+# Marks a path that must be present but whose contents are not read
+_PRESENT = object()
+# Path segment standing for every item of a list
+_ITEMS = "*"
+
+# Constructs that can rebind or hide names, or pull in other templates
+_UNSUPPORTED = (
+    nodes.Assign,
+    nodes.AssignBlock,
+    nodes.Macro,
+    nodes.CallBlock,
+    nodes.FilterBlock,
+    nodes.With,
+    nodes.Include,
+    nodes.Extends,
+    nodes.Import,
+    nodes.FromImport,
+    nodes.Block,
+)
+
+_include_cache: "weakref.WeakKeyDictionary[Template, Optional[Dict[str, Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Template -> {model class: include specification narrowed to that model}
+_model_include_cache: "weakref.WeakKeyDictionary[Template, Dict[type, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class _Unsupported(Exception):
+    pass
+
+
+class _UsageCollector:
+    def __init__(self):
+        self.usage: Dict[str, Any] = {}
+        self.scopes: list[Dict[str, Tuple[str, ...]]] = [{}]
+
+    def _bound(self, name: str) -> Optional[Tuple[str, ...]]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def path(self, node: nodes.Node) -> Optional[Tuple[str, ...]]:
+        """Context path of a name / attribute / constant-subscript chain"""
+        if isinstance(node, nodes.Name):
+            bound = self._bound(node.name)
+            return bound if bound is not None else (node.name,)
+        if isinstance(node, nodes.Getattr):
+            parent = self.path(node.node)
+            return None if parent is None else parent + (node.attr,)
+        if isinstance(node, nodes.Getitem) and isinstance(node.arg, nodes.Const):
+            parent = self.path(node.node)
+            if parent is None or not isinstance(node.arg.value, str):
+                return None
+            return parent + (node.arg.value,)
+        return None
+
+    def mark(self, path: Tuple[str, ...], whole: bool) -> None:
+        tree = self.usage
+        for index, segment in enumerate(path):
+            last = index == len(path) - 1
+            current = tree.get(segment)
+            if current is True:
+                return
+            if last and whole:
+                tree[segment] = True
+                return
+            if not isinstance(current, dict):
+                current = tree[segment] = {}
+            if last:
+                current.setdefault(_PRESENT, True)
+            tree = current
+
+    def expression(self, node: nodes.Node, boolean: bool = False) -> None:
+        path = self.path(node)
+        if path is not None:
+            # A truth test only needs the value to exist; anything else reads all of it
+            self.mark(path, whole=not boolean)
+            return
+        if isinstance(node, nodes.Call) and isinstance(node.node, nodes.Getattr):
+            # A method call (``x.items()``) reads the object it is called on
+            self.expression(node.node.node)
+            for child in node.iter_child_nodes():
+                if child is not node.node:
+                    self.visit(child)
+        elif isinstance(node, (nodes.And, nodes.Or)):
+            self.expression(node.left, boolean)
+            self.expression(node.right, boolean)
+        elif isinstance(node, nodes.Not):
+            self.expression(node.node, boolean=True)
+        elif isinstance(node, nodes.CondExpr):
+            self.expression(node.test, boolean=True)
+            self.expression(node.expr1, boolean)
+            if node.expr2 is not None:
+                self.expression(node.expr2, boolean)
+        else:
+            for child in node.iter_child_nodes():
+                self.visit(child)
+
+    def visit(self, node: nodes.Node) -> None:
+        if isinstance(node, _UNSUPPORTED):
+            raise _Unsupported(type(node).__name__)
+        if isinstance(node, nodes.Expr):
+            self.expression(node)
+        elif isinstance(node, nodes.If):
+            self.expression(node.test, boolean=True)
+            for child in node.body + node.elif_ + node.else_:
+                self.visit(child)
+        elif isinstance(node, nodes.For):
+            self.loop(node)
+        else:
+            for child in node.iter_child_nodes():
+                self.visit(child)
+
+    def loop(self, node: nodes.For) -> None:
+        if node.recursive:
+            raise _Unsupported("recursive loop")
+        items = self.path(node.iter)
+        # Names bound to "" refer to values that are not context paths
+        scope: Dict[str, Tuple[str, ...]] = {"loop": ("",)}
+        if isinstance(node.target, nodes.Name) and items is not None:
+            self.mark(items, whole=False)
+            scope[node.target.name] = items + (_ITEMS,)
+        else:
+            self.expression(node.iter)
+            for target in node.target.find_all(nodes.Name):
+                scope[target.name] = ("",)
+        self.scopes.append(scope)
+        try:
+            if node.test is not None:
+                self.expression(node.test, boolean=True)
+            for child in node.body:
+                self.visit(child)
+        finally:
+            self.scopes.pop()
+        for child in node.else_:
+            self.visit(child)
+
+
+def _to_include(tree: Dict[str, Any]) -> Dict[str, Any]:
+    include: Dict[str, Any] = {}
+    for segment, value in tree.items():
+        if segment is _PRESENT or segment == "":
+            continue
+        key = "__all__" if segment == _ITEMS else segment
+        if value is True:
+            include[key] = True
+            continue
+        children = _to_include(value)
+        # Present but never read into: keep it whole so truth tests still hold
+        include[key] = children if children else True
+    return include
+
+
+def analyze(source: str, environment: Optional[Environment] = None) -> Optional[Dict[str, Any]]:
+    """
+    Include specification of the context paths a template source reads,
+    or None when the template has to be given the whole context.
+    """
+    environment = environment or Environment()
+    collector = _UsageCollector()
+    try:
+        collector.visit(environment.parse(source))
+    except _Unsupported:
+        return None
+    return _to_include(collector.usage)
+
+
+def template_include(template: Template) -> Optional[Dict[str, Any]]:
+    """
+    Cached include specification of a loaded template. A changed template
+    is reloaded as a new Template object and analyzed again.
+    """
+    try:
+        return _include_cache[template]
+    except KeyError:
+        pass
+    environment = template.environment
+    include = None
+    if environment.loader is not None and template.name is not None:
+        source, _, _ = environment.loader.get_source(environment, template.name)
+        include = analyze(source, environment)
+    _include_cache[template] = include
+    return include
+
+
+def _nested_model(annotation: Any) -> Optional[type]:
+    """The model held by a field annotation such as ``list[Degree] | None``"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def _is_container(annotation: Any) -> bool:
+    """Whether a field annotation can hold lists, mappings or models"""
+    if annotation in (list, tuple, set, dict) or _nested_model(annotation) is not None:
+        return True
+    origin = getattr(annotation, "__origin__", None)
+    return origin in (list, tuple, set, dict) or any(map(_is_container, get_args(annotation)))
+
+
+def _narrow(include: Any, model: Optional[type]) -> Any:
+    """
+    Collapse the parts of an include specification that select every field
+    of their model, or leave out only scalar fields, to True. Filtering has a
+    per-value cost in Pydantic, so only subtrees that drop lists or nested
+    models are kept.
+    """
+    if include is True or model is None:
+        return True
+    if "__all__" in include:
+        items = _narrow(include["__all__"], model)
+        return True if items is True else {"__all__": items}
+    narrowed = {}
+    for name, field in model.model_fields.items():
+        if name in include:
+            narrowed[name] = _narrow(include[name], _nested_model(field.annotation))
+    dropped = [
+        field.annotation for name, field in model.model_fields.items() if name not in include
+    ]
+    # Leaving out a few scalars saves less than filtering every instance costs
+    if all(v is True for v in narrowed.values()) and not any(map(_is_container, dropped)):
+        return True
+    return narrowed
+
+
+def model_include(template: Template, model: type) -> Optional[Dict[str, Any]]:
+    """
+    Include specification for rendering instances of ``model`` with a
+    template, or None when the template reads every field of the model.
+    """
+    per_model = _model_include_cache.get(template)
+    if per_model is None:
+        per_model = _model_include_cache[template] = {}
+    try:
+        return per_model[model]
+    except KeyError:
+        pass
+    include = template_include(template)
+    if include is not None:
+        include = _narrow(include, model)
+        if include is True:
+            include = None
+    per_model[model] = include
+    return include
@@ -0,0 +1,92 @@
+"""Per-request stage timings.
+
+A ``Timings`` collector records how long each generation stage took for a
+single document. The breakdown is reported to clients through the
+``Server-Timing`` header and the ``timings`` response field, printed by the
+CLI with ``--timings``, and observed into the Prometheus stage histogram.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator
+
+from resumegen.metrics import STAGE_SECONDS
+
+_current_timings: ContextVar["Timings | None"] = ContextVar(
+    "resumegen_timings", default=None
+)
+
+
+class Timings:
+    """
+    Stage breakdown for one document, in milliseconds.
+
+    Nested stages are recorded exclusively: time spent in an inner stage
+    (e.g. a cache lookup during rendering) is not counted twice.
+    """
+
+    def __init__(self, document_type: str = "document"):
+        self.document_type = document_type
+        self.stages: Dict[str, float] = {}
+        self._children: list[float] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage and add its exclusive duration to the breakdown."""
+        self._children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            exclusive = elapsed - self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.stages[name] = self.stages.get(name, 0.0) + exclusive * 1000
+            STAGE_SECONDS.observe(
+                exclusive, stage=name, document_type=self.document_type
+            )
+
+    @contextmanager
+    def activate(self) -> Iterator["Timings"]:
+        """Make this collector the target of module-level ``stage()`` calls."""
+        token = _current_timings.set(self)
+        try:
+            yield self
+        finally:
+            _current_timings.reset(token)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.stages.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(duration, 3) for name, duration in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Format the breakdown as a ``Server-Timing`` header value."""
+        return server_timing_header([self])
+
+
+def server_timing_header(timings: Iterable[Timings]) -> str:
+    """Combine one or more collectors into a ``Server-Timing`` header value."""
+    totals: Dict[str, float] = {}
+    for collector in timings:
+        for name, duration in collector.stages.items():
+            totals[name] = totals.get(name, 0.0) + duration
+    return ", ".join(f"{name};dur={duration:.2f}" for name, duration in totals.items())
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage into the active ``Timings`` collector, if there is one.
+    Outside of an active collector this is a no-op.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.stage(name):
+        yield
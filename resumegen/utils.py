@@ -1,92 +1,124 @@
 """Utility functions for resume generation."""
 
-from typing import Dict, Any, Optional
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Any
 from resumegen.models.personal_info import PersonalInfo
 from resumegen.models.resume import Resume
 from resumegen.models.cover_letter import CoverLetter
 
+# Validated PersonalInfo objects kept for reuse, keyed by their input content
+PERSONAL_INFO_CACHE_SIZE = int(os.getenv("RESUMEGEN_PERSONAL_INFO_CACHE_SIZE", "256"))
+
+
+@lru_cache(maxsize=PERSONAL_INFO_CACHE_SIZE)
+def _validate_personal_info_json(canonical_json: str) -> PersonalInfo:
+    return PersonalInfo.model_validate_json(canonical_json)
+
+
+def validate_personal_info(
+    personal_info_data: Dict[str, Any] | PersonalInfo,
+) -> PersonalInfo:
+    """
+    Validate personal information, reusing the result for identical content.
+
+    The same candidate's details usually come with every document of a batch,
+    so validated objects are kept in a small LRU cache, keyed by the
+    content's canonical JSON (independent of key order). Each call returns
+    its own shallow copy: assigning its fields does not affect other
+    documents, but nested values are shared and must not be changed in place.
+
+    Args:
+        personal_info_data: Personal information dictionary, or an already
+            validated PersonalInfo (returned as is)
+
+    Returns:
+        Validated PersonalInfo object
+
+    Raises:
+        ValidationError: If the data is not a valid personal information object
+    """
+    if isinstance(personal_info_data, PersonalInfo):
+        return personal_info_data
+    if not isinstance(personal_info_data, dict):
+        # Reported by Pydantic like any other invalid input
+        return PersonalInfo.model_validate(personal_info_data)
+    try:
+        canonical_json = json.dumps(personal_info_data, sort_keys=True)
+    except (TypeError, ValueError):
+        # Not JSON data (e.g. date objects): validate without caching
+        return PersonalInfo.model_validate(personal_info_data)
+    return _validate_personal_info_json(canonical_json).model_copy()
+
+
+def _with_personal_info(
+    data: Dict[str, Any],
+    personal_info_data: Dict[str, Any] | PersonalInfo | None,
+    data_name: str,
+) -> Dict[str, Any]:
+    """
+    Document data with its personal information replaced by the validated
+    PersonalInfo. A shallow merge is cheaper for Pydantic to validate than a
+    non-copying mapping view.
+    """
+    if personal_info_data is None:
+        if 'personal_information' not in data:
+            raise ValueError(
+                "Personal information not found. Please provide either personal_info_data "
+                f"parameter or include 'personal_information' in the {data_name}."
+            )
+        personal_info_data = data['personal_information']
+
+    # Model fields accept the validated instance without validating it again
+    return {**data, 'personal_information': validate_personal_info(personal_info_data)}
+
 
 def create_resume_with_personal_info(
-    resume_data: Dict[str, Any], 
-    personal_info_data: Optional[Dict[str, Any]] = None
+    resume_data: Dict[str, Any],
+    personal_info_data: Dict[str, Any] | PersonalInfo | None = None
 ) -> Resume:
     """
     Create a Resume object with proper personal information handling.
-    
+
+    Each part of the input is validated exactly once; personal information
+    given here takes precedence over any embedded in resume_data.
+
     Args:
         resume_data: Resume data dictionary
-        personal_info_data: Optional personal information dictionary
-        
+        personal_info_data: Optional personal information dictionary or PersonalInfo
+
     Returns:
         Resume object with personal information
-        
+
     Raises:
         ValueError: If no personal information is available
     """
-    # If personal info is provided directly, use it and remove from resume_data
-    if personal_info_data is not None:
-        # Validate the personal info
-        PersonalInfo(**personal_info_data)
-        
-        # Remove personal_information from resume_data to avoid conflict
-        resume_data_copy = resume_data.copy()
-        if 'personal_information' in resume_data_copy:
-            del resume_data_copy['personal_information']
-        
-        return Resume(**resume_data_copy, personal_information=personal_info_data)
-    
-    # If no personal info provided, check if it exists in resume data
-    elif 'personal_information' in resume_data:
-        # Validate the embedded personal info
-        PersonalInfo(**resume_data['personal_information'])
-        return Resume(**resume_data)
-    
-    # No personal information available anywhere
-    else:
-        raise ValueError(
-            "Personal information not found. Please provide either personal_info_data "
-            "parameter or include 'personal_information' in the resume_data."
-        )
+    return Resume.model_validate(
+        _with_personal_info(resume_data, personal_info_data, "resume_data")
+    )
 
 
 def create_cover_letter_with_personal_info(
-    cover_letter_data: Dict[str, Any], 
-    personal_info_data: Optional[Dict[str, Any]] = None
+    cover_letter_data: Dict[str, Any],
+    personal_info_data: Dict[str, Any] | PersonalInfo | None = None
 ) -> CoverLetter:
     """
     Create a CoverLetter object with proper personal information handling.
-    
+
+    Each part of the input is validated exactly once; personal information
+    given here takes precedence over any embedded in cover_letter_data.
+
     Args:
         cover_letter_data: Cover letter data dictionary
-        personal_info_data: Optional personal information dictionary
-        
+        personal_info_data: Optional personal information dictionary or PersonalInfo
+
     Returns:
         CoverLetter object with personal information
-        
+
     Raises:
         ValueError: If no personal information is available
     """
-    # If personal info is provided directly, use it and remove from cover_letter_data
-    if personal_info_data is not None:
-        # Validate the personal info
-        PersonalInfo(**personal_info_data)
-        
-        # Remove personal_information from cover_letter_data to avoid conflict
-        cover_letter_data_copy = cover_letter_data.copy()
-        if 'personal_information' in cover_letter_data_copy:
-            del cover_letter_data_copy['personal_information']
-        
-        return CoverLetter(**cover_letter_data_copy, personal_information=personal_info_data)
-    
-    # If no personal info provided, check if it exists in cover letter data
-    elif 'personal_information' in cover_letter_data:
-        # Validate the embedded personal info
-        PersonalInfo(**cover_letter_data['personal_information'])
-        return CoverLetter(**cover_letter_data)
-    
-    # No personal information available anywhere
-    else:
-        raise ValueError(
-            "Personal information not found. Please provide either personal_info_data "
-            "parameter or include 'personal_information' in the cover_letter_data."
-        )
\ No newline at end of file
+    return CoverLetter.model_validate(
+        _with_personal_info(cover_letter_data, personal_info_data, "cover_letter_data")
+    )
@@ -0,0 +1,415 @@
+"""Tailored variants of one base document.
+
+A variant set is a base resume (or cover letter) plus a list of overlays,
+each either an RFC 7396 merge patch ("merge") or an RFC 6902 JSON Patch
+("patch"). The base is validated once; each overlay only copies and
+revalidates the top-level fields it touches, and every other field is
+shared with the validated base model.
+
+Variants file format::
+
+    {
+      "base": "resume.json",              # path (relative to this file) or inline object
+      "personal_info": "personal_info.json",  # optional, path or inline object
+      "type": "resume",                   # optional, detected from the base
+      "variants": [
+        {"name": "backend", "merge": {"professional_summary": "...", "publications": null}},
+        {"name": "frontend", "patch": [{"op": "remove", "path": "/work_experience/2"}]}
+      ]
+    }
+"""
+
+import copy
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+from resumegen.batch import detect_document_type
+from resumegen.cache import PdfFiles
+from resumegen.storage import check_output_name, load_json, save_html
+
+_MISSING = object()
+
+
+class VariantError(ValueError):
+    """An overlay could not be applied or produced an invalid document."""
+
+    def __init__(self, name: str, message: str):
+        super().__init__(f"Variant '{name}': {message}")
+        self.name = name
+
+
+@dataclass
+class Variant:
+    """
+    One overlay on the base document. `merge` is applied before `patch`.
+    """
+
+    name: str
+    merge: Optional[Dict[str, Any]] = None
+    patch: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass
+class VariantSet:
+    base: Dict[str, Any]
+    variants: List[Variant] = field(default_factory=list)
+    personal_info: Optional[Dict[str, Any]] = None
+    document_type: Optional[str] = None
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    Apply an RFC 7396 merge patch. `target` is not modified; untouched
+    subtrees of the result are shared with it.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def _split_pointer(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {pointer!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit():
+        raise ValueError(f"Invalid list index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"List index out of range: {index}")
+    return index
+
+
+def _resolve(document: Any, parts: List[str]) -> Any:
+    for part in parts:
+        if isinstance(document, dict):
+            if part not in document:
+                raise ValueError(f"Path not found: /{'/'.join(parts)}")
+            document = document[part]
+        elif isinstance(document, list):
+            document = document[_index(document, part)]
+        else:
+            raise ValueError(f"Path not found: /{'/'.join(parts)}")
+    return document
+
+
+def _add(document: Any, parts: List[str], value: Any) -> Any:
+    if not parts:
+        return value
+    parent = _resolve(document, parts[:-1])
+    if isinstance(parent, dict):
+        parent[parts[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, parts[-1], allow_end=True), value)
+    else:
+        raise ValueError(f"Cannot add to a scalar at /{'/'.join(parts[:-1])}")
+    return document
+
+
+def _remove(document: Any, parts: List[str]) -> Any:
+    if not parts:
+        raise ValueError("Cannot remove the whole document")
+    parent = _resolve(document, parts[:-1])
+    if isinstance(parent, dict):
+        if parts[-1] not in parent:
+            raise ValueError(f"Path not found: /{'/'.join(parts)}")
+        return parent.pop(parts[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, parts[-1]))
+    raise ValueError(f"Path not found: /{'/'.join(parts)}")
+
+
+def json_patch(document: Any, operations: List[Dict[str, Any]]) -> Any:
+    """
+    Apply an RFC 6902 JSON Patch (add, remove, replace, move, copy, test).
+    The document is modified in place; the (possibly new) root is returned.
+    """
+    for operation in operations:
+        op = operation.get("op")
+        parts = _split_pointer(operation.get("path", ""))
+        if op == "add":
+            document = _add(document, parts, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(document, parts)
+        elif op == "replace":
+            _resolve(document, parts)
+            if parts:
+                _remove(document, parts)
+            document = _add(document, parts, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            source = _split_pointer(operation["from"])
+            if op == "move":
+                value = _remove(document, source)
+            else:
+                value = copy.deepcopy(_resolve(document, source))
+            document = _add(document, parts, value)
+        elif op == "test":
+            if _resolve(document, parts) != operation.get("value"):
+                raise ValueError(f"Test failed at {operation.get('path')!r}")
+        else:
+            raise ValueError(f"Unsupported patch operation: {op!r}")
+    return document
+
+
+def _patched_fields(operations: List[Dict[str, Any]]) -> Optional[set[str]]:
+    """
+    Top-level fields a JSON Patch touches, or None if it replaces the whole document.
+    """
+    fields = set()
+    for operation in operations:
+        for pointer in (operation.get("path", ""), operation.get("from")):
+            if pointer is None:
+                continue
+            parts = _split_pointer(pointer)
+            if not parts:
+                return None
+            fields.add(parts[0])
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+class VariantBuilder:
+    """
+    Validates a base document once and derives variant models from overlays.
+
+    Args:
+        base_data: Base resume or cover letter data.
+        personal_info: Personal information; otherwise it must be embedded in the base.
+        document_type: "resume" or "cover_letter". Detected from the base when not given.
+    """
+
+    def __init__(
+        self,
+        base_data: Dict[str, Any],
+        personal_info: Optional[Dict[str, Any]] = None,
+        document_type: Optional[str] = None,
+    ):
+        from resumegen.utils import (
+            create_cover_letter_with_personal_info,
+            create_resume_with_personal_info,
+        )
+
+        self.document_type = document_type or detect_document_type(base_data)
+        if self.document_type == "cover_letter":
+            self.base = create_cover_letter_with_personal_info(base_data, personal_info)
+        else:
+            self.base = create_resume_with_personal_info(base_data, personal_info)
+        self.model = type(self.base)
+        # Plain data the overlays apply to, with personal information merged in
+        self.data = dict(base_data)
+        if personal_info is not None:
+            self.data["personal_information"] = personal_info
+
+    @classmethod
+    def from_document(cls, base: BaseModel, document_type: str) -> "VariantBuilder":
+        """Builder over a base document that is already validated, such as an API request's"""
+        builder = cls.__new__(cls)
+        builder.document_type = document_type
+        builder.base = base
+        builder.model = type(base)
+        builder.data = base.model_dump()
+        return builder
+
+    def build(self, variant: Variant) -> BaseModel:
+        """
+        Apply one overlay and return the variant model.
+
+        Raises:
+            VariantError: If the overlay cannot be applied or the result is invalid.
+        """
+        try:
+            data = self.data
+            touched: Optional[set[str]] = set()
+            if variant.merge:
+                data = merge_patch(data, variant.merge)
+                touched.update(variant.merge)
+            if variant.patch:
+                fields = _patched_fields(variant.patch)
+                if fields is None:
+                    data = json_patch(copy.deepcopy(data), variant.patch)
+                    touched = None
+                else:
+                    # Only the subtrees the patch touches are copied
+                    data = dict(data)
+                    for name in fields:
+                        if name in data:
+                            data[name] = copy.deepcopy(data[name])
+                    data = json_patch(data, variant.patch)
+                    touched.update(fields)
+            return self._validate(data, touched)
+        except VariantError:
+            raise
+        except Exception as e:
+            raise VariantError(variant.name, str(e)) from e
+
+    def _validate(self, data: Any, touched: Optional[set[str]]) -> BaseModel:
+        if touched is None or not isinstance(data, dict) or not touched <= set(self.model.model_fields):
+            # Whole-document or unknown-field changes: validate from scratch
+            return self.model.model_validate(data)
+        update = {}
+        for name in touched:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                model_field = self.model.model_fields[name]
+                if model_field.is_required():
+                    raise ValueError(f"Field required: {name}")
+                update[name] = model_field.get_default(call_default_factory=True)
+            else:
+                update[name] = _field_adapter(self.model, name).validate_python(value)
+        return self.base.model_copy(update=update)
+
+
+def _load_part(value: Any, base_dir: Path) -> Any:
+    if isinstance(value, str):
+        return load_json(base_dir / value)
+    return value
+
+
+def load_variant_set(path: Path | str, info_path: Path | str | None = None) -> VariantSet:
+    """
+    Read a variants file. Relative paths are resolved against its directory;
+    `info_path` overrides the personal information given in the file.
+    """
+    path = Path(path)
+    data = load_json(path)
+    if not isinstance(data, dict) or "base" not in data or "variants" not in data:
+        raise ValueError(f"{path} is not a variants file: expected 'base' and 'variants'")
+
+    variants = []
+    for entry in data["variants"]:
+        if "name" not in entry:
+            raise ValueError(f"Variant without a name in {path}")
+        check_output_name(entry["name"])
+        variants.append(Variant(name=entry["name"], merge=entry.get("merge"), patch=entry.get("patch")))
+    names = [variant.name for variant in variants]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate variant names in {path}: {', '.join(duplicates)}")
+
+    personal_info = (
+        load_json(Path(info_path)) if info_path else _load_part(data.get("personal_info"), path.parent)
+    )
+    return VariantSet(
+        base=_load_part(data["base"], path.parent),
+        variants=variants,
+        personal_info=personal_info,
+        document_type=data.get("type"),
+    )
+
+
+@dataclass
+class VariantResult:
+    name: str
+    out_html: Path
+    out_pdf: Path
+    error: Optional[str] = None
+    stage: Optional[str] = None  # Stage that failed: overlay, render, save or pdf
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _convert_pdf(
+    backend, result: VariantResult, html_content: str, files: PdfFiles
+) -> VariantResult:
+    try:
+        files.write(html_content, result.out_pdf, lambda path: backend.render(html_content, path))
+    except Exception as e:
+        result.error = str(e)
+        result.stage = "pdf"
+    return result
+
+
+def run_variants(
+    variant_set: VariantSet,
+    out_dir: Path | str,
+    generate_pdfs: bool = True,
+    pdf_concurrency: int = 4,
+    on_result: Optional[Callable[[VariantResult], None]] = None,
+) -> List[VariantResult]:
+    """
+    Render every variant into `out_dir` as `<name>.html` and `<name>.pdf`.
+
+    The base is validated once (an invalid base raises); overlay and render
+    failures are collected per variant. PDFs go through one shared backend
+    while the remaining variants are still rendering.
+
+    Args:
+        variant_set: Base document and overlays.
+        out_dir: Directory for the generated files.
+        generate_pdfs: Convert rendered HTML to PDF.
+        pdf_concurrency: Maximum concurrent PDF conversions.
+        on_result: Called with each finished result.
+    """
+    from resumegen.jinja_render import render_cover_letter, render_resume
+    from resumegen.pdf_service import open_pdf_backend
+
+    builder = VariantBuilder(variant_set.base, variant_set.personal_info, variant_set.document_type)
+    render = render_cover_letter if builder.document_type == "cover_letter" else render_resume
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    results: List[VariantResult] = []
+
+    def finish(result: VariantResult) -> None:
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    backend = open_pdf_backend(pdf_concurrency) if generate_pdfs and variant_set.variants else None
+    pdf_pool = ThreadPoolExecutor(max_workers=pdf_concurrency) if backend is not None else None
+    files = PdfFiles.from_env() if backend is not None else None
+    try:
+        conversions = []
+        for variant in variant_set.variants:
+            result = VariantResult(
+                name=variant.name,
+                out_html=out_dir / f"{variant.name}.html",
+                out_pdf=out_dir / f"{variant.name}.pdf",
+            )
+            try:
+                result.stage = "overlay"
+                document = builder.build(variant)
+                result.stage = "render"
+                html_content = render(document)
+                result.stage = "save"
+                save_html(html_content, result.out_html)
+            except Exception as e:
+                result.error = str(e)
+                finish(result)
+                continue
+            result.stage = None
+            if pdf_pool is not None:
+                conversions.append(pdf_pool.submit(_convert_pdf, backend, result, html_content, files))
+            else:
+                finish(result)
+        for future in as_completed(conversions):
+            finish(future.result())
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.shutdown(cancel_futures=True)
+        if backend is not None:
+            backend.close()
+    return results
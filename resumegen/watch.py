@@ -0,0 +1,253 @@
+"""Watch mode: regenerate documents as their inputs change.
+
+Polls the input JSON files, personal information, templates, stylesheet and
+the local assets inlined into the output.
+After a debounce window, only the documents that depend on a changed file are
+re-rendered. The HTML is rewritten right away; the PDF backend is called only
+when the rendered HTML actually changed. Templates and the PDF backend stay
+warm between rebuilds.
+"""
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from resumegen.batch import (
+    BatchJob,
+    BatchResult,
+    detect_document_type,
+    discover_jobs,
+    render_job,
+)
+from resumegen.build_cache import (
+    BuildManifest,
+    asset_files,
+    build_fingerprint,
+    template_paths,
+)
+from resumegen.cache import PdfFiles
+from resumegen.storage import load_json
+
+FileState = tuple[int, int]
+
+
+def _file_state(path: Path) -> Optional[FileState]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Watcher:
+    """
+    Incrementally rebuild the documents found in `source` (see `discover_jobs`).
+
+    Args:
+        source: Directory, glob pattern or manifest of input files. Rescanned on
+            every poll, so new inputs are picked up.
+        out_dir: Output directory (see `discover_jobs`).
+        info_path: Personal information shared by all documents.
+        generate_pdfs: Convert changed HTML to PDF.
+        debounce: Seconds without further changes before a rebuild starts.
+        poll_interval: Seconds between file checks.
+        pdf_concurrency: Maximum concurrent PDF conversions.
+        backend: PDF backend to use; by default one is opened on first use and kept open.
+        on_result: Called with each rebuilt document's result.
+    """
+
+    def __init__(
+        self,
+        source: Path | str,
+        out_dir: Path | str | None = None,
+        info_path: Path | str | None = None,
+        generate_pdfs: bool = True,
+        debounce: float = 0.3,
+        poll_interval: float = 0.5,
+        pdf_concurrency: int = 2,
+        backend=None,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ):
+        self.source = source
+        self.out_dir = out_dir
+        self.info_path = info_path
+        self.generate_pdfs = generate_pdfs
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.pdf_concurrency = pdf_concurrency
+        self.on_result = on_result
+        self._backend = backend
+        self._owns_backend = backend is None
+        self._files: Optional[PdfFiles] = None
+        self._jobs: Dict[Path, BatchJob] = {}
+        self._states: Dict[Path, Optional[FileState]] = {}
+        self._html_hashes: Dict[Path, str] = {}
+        self._document_types: Dict[Path, tuple[Optional[FileState], str]] = {}
+
+    def _document_type(self, job: BatchJob) -> str:
+        if job.document_type is not None:
+            return job.document_type
+        state = _file_state(job.input_path)
+        cached = self._document_types.get(job.input_path)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        try:
+            document_type = detect_document_type(load_json(job.input_path))
+        except Exception:
+            document_type = "resume"
+        self._document_types[job.input_path] = (state, document_type)
+        return document_type
+
+    def dependencies(self, job: BatchJob) -> List[Path]:
+        """
+        Files a job's output depends on.
+        """
+        document_type = self._document_type(job)
+        template_path, style_path = template_paths(document_type)
+        paths = [job.input_path, template_path, style_path]
+        if job.info_path is not None:
+            paths.append(job.info_path)
+        paths += asset_files(document_type, job.input_path, job.info_path)
+        return paths
+
+    def check(self) -> List[BatchJob]:
+        """
+        Rescan the source and return the jobs that are new or have a changed dependency.
+        """
+        jobs = {job.out_html: job for job in discover_jobs(self.source, self.out_dir, self.info_path)}
+        states: Dict[Path, Optional[FileState]] = {}
+        changed = []
+        for key, job in jobs.items():
+            dependencies = self.dependencies(job)
+            for path in dependencies:
+                if path not in states:
+                    states[path] = _file_state(path)
+            if key not in self._jobs or any(
+                states[path] != self._states.get(path) for path in dependencies
+            ):
+                changed.append(job)
+        self._jobs = jobs
+        self._states = states
+        return changed
+
+    def _get_backend(self):
+        if self._backend is None:
+            from resumegen.pdf_service import open_pdf_backend
+
+            self._backend = open_pdf_backend(self.pdf_concurrency)
+        return self._backend
+
+    def _get_files(self) -> PdfFiles:
+        if self._files is None:
+            self._files = PdfFiles.from_env()
+        return self._files
+
+    def _convert(self, result: BatchResult, html_content: str) -> None:
+        try:
+            backend = self._get_backend()
+            self._get_files().write(
+                html_content, result.job.out_pdf, lambda path: backend.render(html_content, path)
+            )
+        except Exception as e:
+            if self._owns_backend and self._backend is not None:
+                # The worker may have died: restart it on the next rebuild
+                self._backend.close()
+                self._backend = None
+            result.error = str(e)
+            result.stage = "pdf"
+
+    def build(self, jobs: Iterable[BatchJob]) -> List[BatchResult]:
+        """
+        Re-render jobs in-process and convert those whose HTML changed.
+        """
+        results = []
+        conversions = []
+        with ThreadPoolExecutor(max_workers=self.pdf_concurrency) as pool:
+            for job in jobs:
+                result, html_content = render_job(job)
+                results.append(result)
+                if not result.ok:
+                    continue
+                html_hash = hashlib.sha256(html_content.encode("utf-8")).hexdigest()
+                html_changed = self._html_hashes.get(job.out_html) != html_hash
+                self._html_hashes[job.out_html] = html_hash
+                if self.generate_pdfs and (html_changed or not job.out_pdf.exists()):
+                    conversions.append((result, pool.submit(self._convert, result, html_content)))
+                else:
+                    result.skipped = self.generate_pdfs
+            for result, future in conversions:
+                future.result()
+                if not result.ok:
+                    # Convert again on the next event even if the HTML is unchanged
+                    self._html_hashes.pop(result.job.out_html, None)
+
+        self._record(results)
+        if self.on_result is not None:
+            for result in results:
+                self.on_result(result)
+        return results
+
+    def _outputs(self, job: BatchJob) -> List[Path]:
+        return [job.out_html, job.out_pdf] if self.generate_pdfs else [job.out_html]
+
+    def _out_of_date(self, jobs: List[BatchJob]) -> List[BatchJob]:
+        """
+        Drop jobs the build manifest reports as up to date.
+        """
+        manifests: Dict[Path, BuildManifest] = {}
+        stale = []
+        for job in jobs:
+            if job.out_html.parent not in manifests:
+                manifests[job.out_html.parent] = BuildManifest(job.out_html.parent)
+            fingerprint = build_fingerprint(self._document_type(job), job.input_path, job.info_path)
+            if not manifests[job.out_html.parent].is_up_to_date(self._outputs(job), fingerprint):
+                stale.append(job)
+        return stale
+
+    def _record(self, results: List[BatchResult]) -> None:
+        """
+        Keep the build manifest current so a later CLI run skips these documents.
+        """
+        manifests: Dict[Path, BuildManifest] = {}
+        for result in results:
+            if not result.ok:
+                continue
+            job = result.job
+            if job.out_html.parent not in manifests:
+                manifests[job.out_html.parent] = BuildManifest(job.out_html.parent)
+            manifests[job.out_html.parent].record(
+                self._outputs(job),
+                build_fingerprint(result.document_type, job.input_path, job.info_path),
+            )
+        for manifest in manifests.values():
+            manifest.save()
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """
+        Build everything once, then rebuild affected documents until `stop` is set.
+        """
+        stop = stop or threading.Event()
+        pending: Dict[Path, BatchJob] = {}
+        last_change = 0.0
+        try:
+            # Initial build: only what changed since the last (watch or CLI) run
+            self.build(self._out_of_date(self.check()))
+            while not stop.wait(self.poll_interval):
+                changed = self.check()
+                if changed:
+                    pending.update((job.out_html, job) for job in changed)
+                    last_change = time.monotonic()
+                if pending and time.monotonic() - last_change >= self.debounce:
+                    jobs = list(pending.values())
+                    pending.clear()
+                    self.build(jobs)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._owns_backend and self._backend is not None:
+            self._backend.close()
+            self._backend = None
@@ -0,0 +1,189 @@
+"""
+Test suite for output sinks and archive downloads
+"""
+
+import io
+import json
+import shutil
+import tarfile
+import zipfile
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from resumegen.api import app as api_app
+from resumegen.batch import discover_jobs, run_batch
+from resumegen.cli import app
+from resumegen.storage import DirectorySink, TarSink, ZipSink, open_sink
+
+
+class BytesBackend:
+    """PDF backend stand-in returning fake PDF bytes"""
+
+    def render(self, html_content, pdf_path=None):
+        assert pdf_path is None
+        return b"%PDF-" + str(len(html_content)).encode()
+
+    def close(self):
+        pass
+
+
+class NonSeekableStream(io.RawIOBase):
+    """Write-only stream without tell()/seek(), like a socket or pipe"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+
+@pytest.fixture
+def batch_dir(output_dir, test_data_dir):
+    source = output_dir / "inputs"
+    source.mkdir()
+    shutil.copy(test_data_dir / "resume_example.json", source / "alice.json")
+    shutil.copy(test_data_dir / "cover_letter_example.json", source / "alice_letter.json")
+    shutil.copy(test_data_dir / "personal_info_example.json", source / "personal_info.json")
+    return source
+
+
+@pytest.mark.cli
+class TestOutputSinks:
+    """Tests for directory and archive sinks"""
+
+    def test_directory_sink(self, output_dir):
+        with DirectorySink(output_dir / "out") as sink:
+            sink.write("nested/a.html", "<p>a</p>")
+
+        assert (output_dir / "out" / "nested" / "a.html").read_text() == "<p>a</p>"
+
+    def test_zip_sink_on_non_seekable_stream(self):
+        stream = NonSeekableStream()
+        with ZipSink(stream) as sink:
+            sink.write("a.html", "<p>a</p>")
+            sink.write("a.pdf", b"%PDF-1")
+
+        archive = zipfile.ZipFile(io.BytesIO(bytes(stream.data)))
+        assert archive.read("a.html") == b"<p>a</p>"
+        assert archive.getinfo("a.pdf").compress_type == zipfile.ZIP_STORED
+
+    def test_tar_sink(self, output_dir):
+        with open_sink(output_dir / "out.tar.gz") as sink:
+            assert isinstance(sink, TarSink)
+            sink.write("a.html", "<p>a</p>")
+
+        with tarfile.open(output_dir / "out.tar.gz") as archive:
+            assert archive.extractfile("a.html").read() == b"<p>a</p>"
+
+    def test_rejects_escaping_names(self):
+        with ZipSink(io.BytesIO()) as sink:
+            with pytest.raises(ValueError, match="Invalid artifact name"):
+                sink.write("../a.html", "x")
+
+
+@pytest.mark.cli
+class TestBatchToArchive:
+    """Tests for writing batch outputs straight into an archive"""
+
+    def test_run_batch_into_zip(self, batch_dir, output_dir, monkeypatch):
+        monkeypatch.setattr("resumegen.pdf_service.open_pdf_backend", lambda concurrency: BytesBackend())
+        archive_path = output_dir / "documents.zip"
+
+        with ZipSink(archive_path) as sink:
+            results = run_batch(discover_jobs(batch_dir), workers=1, sink=sink)
+
+        assert all(result.ok for result in results)
+        names = sorted(zipfile.ZipFile(archive_path).namelist())
+        assert names == ["alice.html", "alice.pdf", "alice_letter.html", "alice_letter.pdf"]
+        assert not (batch_dir / "output").exists()
+
+    def test_cli_archive(self, batch_dir, output_dir):
+        archive_path = output_dir / "documents.tar.gz"
+
+        result = CliRunner().invoke(
+            app,
+            ["generate-batch", str(batch_dir), "--archive", str(archive_path), "--no-pdf", "--workers", "1"],
+        )
+
+        assert result.exit_code == 0, result.output
+        with tarfile.open(archive_path) as archive:
+            assert sorted(archive.getnames()) == ["alice.html", "alice_letter.html"]
+
+
+class TestArchiveApi:
+    """Tests for the /generate-archive streaming download"""
+
+    def test_zip_download_with_errors(self, resume_data, cover_letter_data, personal_info_data):
+        request = {
+            "output_format": "html",
+            "documents": [
+                {"resume_data": resume_data, "personal_info": personal_info_data, "name": "alice"},
+                {"cover_letter_data": cover_letter_data, "personal_info": personal_info_data},
+                {"resume_data": {"education": "not a list"}, "personal_info": personal_info_data},
+            ],
+        }
+
+        response = TestClient(api_app).post("/generate-archive", json=request)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert sorted(archive.namelist()) == ["alice.html", "cover_letter-2.html", "errors.json"]
+        assert list(json.loads(archive.read("errors.json"))) == ["resume-3"]
+
+    def test_render_slot_released_before_writing(
+        self, resume_data, personal_info_data, monkeypatch
+    ):
+        from resumegen import api
+
+        events = []
+
+        @contextmanager
+        def render_slot():
+            events.append("acquire")
+            yield
+            events.append("release")
+
+        def build_pdf(html_content, document_type):
+            return b"%PDF-fake"
+
+        write = ZipSink.write
+        monkeypatch.setattr(api, "_render_slot_from_thread", render_slot)
+        monkeypatch.setattr(api, "_build_pdf", build_pdf)
+        monkeypatch.setattr(
+            ZipSink, "write", lambda sink, name, data: events.append(name) or write(sink, name, data)
+        )
+        document = {"resume_data": resume_data, "personal_info": personal_info_data}
+        request = {
+            "output_format": "both",
+            "documents": [dict(document, name="alice"), dict(document, name="bob")],
+        }
+
+        response = TestClient(api_app).post("/generate-archive", json=request)
+
+        assert zipfile.ZipFile(io.BytesIO(response.content)).read("bob.pdf") == b"%PDF-fake"
+        assert events == [
+            "acquire", "release", "alice.html", "alice.pdf",
+            "acquire", "release", "bob.html", "bob.pdf",
+        ]
+
+    def test_invalid_requests(self, resume_data, personal_info_data):
+        client = TestClient(api_app)
+        document = {"resume_data": resume_data, "personal_info": personal_info_data}
+
+        assert client.post(
+            "/generate-archive", json={"documents": [document], "archive_format": "rar"}
+        ).status_code == 422
+        assert client.post(
+            "/generate-archive", json={"documents": [{"personal_info": personal_info_data}]}
+        ).status_code == 422
+        assert client.post(
+            "/generate-archive", json={"documents": [dict(document, name="a"), dict(document, name="a")]}
+        ).status_code == 422
@@ -0,0 +1,212 @@
+"""
+Test suite for the artifact store
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from resumegen import api
+from resumegen.artifacts import ArtifactStore
+from resumegen.cache import PdfFiles
+
+# Above the default pid_max, so no process can have it
+DEAD_PID = 2**22 + 1
+
+
+def _age(path: Path, seconds: float) -> None:
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.mark.cli
+class TestArtifactStore:
+    """Tests for storage, eviction and cleanup"""
+
+    def test_round_trip(self, output_dir):
+        store = ArtifactStore(output_dir)
+        key = store.add(b"%PDF-1.7")
+
+        assert store.get(key) == b"%PDF-1.7"
+        assert bytes(store.read(key)) == b"%PDF-1.7"
+        assert store.path(key).read_bytes() == b"%PDF-1.7"
+        assert store.get(store.key("missing")) is None
+        with pytest.raises(ValueError, match="Invalid artifact key"):
+            store.get("../../etc/passwd")
+
+    def test_least_recently_used_evicted_over_cap(self, output_dir):
+        store = ArtifactStore(output_dir, max_bytes=250)
+        keys = [store.key(str(i)) for i in range(3)]
+        for age, key in zip((30, 20), keys):
+            _age(store.put(key, b"x" * 100), age)
+        # Reading the oldest makes the second one least recently used
+        store.get(keys[0])
+
+        store.put(keys[2], b"x" * 100)
+
+        assert [store.path(key) is not None for key in keys] == [True, False, True]
+        assert store.size() == 200
+
+    def test_replaced_artifact_counted_once(self, output_dir):
+        store = ArtifactStore(output_dir, max_bytes=250)
+        kept, key = store.key("kept"), store.key("replaced")
+        store.put(kept, b"x" * 100)
+
+        for _ in range(3):
+            with store.scratch() as scratch:
+                (scratch / "out.pdf").write_bytes(b"y" * 100)
+                store.put_file(key, scratch / "out.pdf")
+            store.put(key, b"y" * 100)
+
+        assert store._size == store.size() == 200
+        assert store.get(kept) is not None
+
+    def test_expired_artifacts_removed(self, output_dir):
+        store = ArtifactStore(output_dir, ttl=60)
+        old, new = store.key("old"), store.key("new")
+        _age(store.put(old, b"old"), 120)
+        store.put(new, b"new")
+
+        assert ArtifactStore(output_dir, ttl=60).path(old) is None
+        assert store.get(new) == b"new"
+
+    def test_leftovers_of_dead_processes_removed_on_open(self, output_dir):
+        store = ArtifactStore(output_dir)
+        dead_tmp = output_dir / ".tmp" / f"{DEAD_PID}-abc"
+        live_tmp = output_dir / ".tmp" / f"{os.getpid()}-abc"
+        slow_tmp = output_dir / ".tmp" / f"{os.getpid()}-slow"
+        stale_tmp = output_dir / ".tmp" / f"{os.getpid()}-old"
+        dead_scratch = output_dir / "scratch" / f"{DEAD_PID}-abc"
+        for path in (dead_tmp, live_tmp, slow_tmp, stale_tmp):
+            path.write_bytes(b"partial")
+        # A slow job of a running process keeps its file; a week-old one is from a reused pid
+        _age(slow_tmp, 2 * 3600)
+        _age(stale_tmp, 8 * 24 * 3600)
+        dead_scratch.mkdir()
+        (dead_scratch / "resume.html").write_text("<html>")
+        store.put(store.key("kept"), b"kept")
+
+        ArtifactStore(output_dir)
+
+        assert not dead_tmp.exists() and not stale_tmp.exists() and not dead_scratch.exists()
+        assert live_tmp.exists() and slow_tmp.exists()
+        assert store.get(store.key("kept")) == b"kept"
+
+    def test_scratch_removed_on_error_and_files_moved_in(self, output_dir):
+        store = ArtifactStore(output_dir)
+        with store.scratch() as scratch:
+            pdf = scratch / "resume.pdf"
+            pdf.write_bytes(b"%PDF")
+            path = store.put_file(store.key("resume"), pdf)
+        with pytest.raises(RuntimeError), store.scratch() as failed:
+            raise RuntimeError("render failed")
+
+        assert not scratch.exists() and not failed.exists()
+        assert path.read_bytes() == b"%PDF"
+
+
+@pytest.mark.cli
+class TestApiScratchFiles:
+    """Tests for the API's PDF jobs running in store scratch directories"""
+
+    def test_pdf_job_cleans_up_and_fills_cache(self, output_dir, monkeypatch):
+        store = ArtifactStore(output_dir)
+        calls = []
+
+        def generate_pdf(html_path, pdf_path):
+            calls.append(html_path)
+            Path(pdf_path).write_bytes(b"%PDF " + Path(html_path).read_bytes())
+
+        monkeypatch.setattr(api, "generate_pdf", generate_pdf)
+        monkeypatch.setattr(api, "_pdf_stores", lambda: (store, store))
+
+        assert api._build_pdf("<html>", "resume") == b"%PDF <html>"
+        cached = api._build_pdf("<html>", "resume")
+
+        assert isinstance(cached, memoryview) and cached == b"%PDF <html>"
+
+        assert len(calls) == 1
+        assert list((output_dir / "scratch").iterdir()) == []
+        assert store.size() == len(b"%PDF <html>")
+
+    def test_stores_not_opened_on_import(self, output_dir):
+        env = dict(os.environ, RESUMEGEN_ARTIFACT_DIR=str(output_dir / "store"), RESUMEGEN_CACHE_DIR="")
+
+        subprocess.run([sys.executable, "-c", "import resumegen.api"], env=env, check=True)
+
+        assert not (output_dir / "store").exists()
+
+    def test_scratch_removed_when_pdf_generation_fails(self, output_dir, monkeypatch):
+        def generate_pdf(html_path, pdf_path):
+            raise RuntimeError("PDF generation failed")
+
+        monkeypatch.setattr(api, "generate_pdf", generate_pdf)
+        monkeypatch.setattr(api, "_pdf_stores", lambda: (None, ArtifactStore(output_dir)))
+
+        with pytest.raises(RuntimeError):
+            api._build_pdf("<html>", "resume")
+
+        assert list((output_dir / "scratch").iterdir()) == []
+
+
+@pytest.mark.cli
+class TestCliPdfFiles:
+    """Tests for CLI and batch PDF jobs sharing the store and the result cache"""
+
+    def test_conversions_share_the_result_cache(self, output_dir):
+        store = ArtifactStore(output_dir / "cache")
+        files = PdfFiles(store, store)
+        calls = []
+
+        def convert(path):
+            calls.append(path.parent)
+            path.write_bytes(b"%PDF one")
+
+        files.write("<html>", output_dir / "out" / "a.pdf", convert)
+        files.write("<html>", output_dir / "out" / "b.pdf", convert)
+
+        assert len(calls) == 1 and calls[0].parent == output_dir / "cache" / "scratch"
+        assert (output_dir / "out" / "b.pdf").read_bytes() == b"%PDF one"
+        assert bytes(files.render("<html>", lambda: b"not called")) == b"%PDF one"
+        assert list((output_dir / "cache" / "scratch").iterdir()) == []
+
+    def test_failed_conversion_leaves_no_output(self, output_dir):
+        store = ArtifactStore(output_dir / "artifacts")
+
+        def convert(path):
+            path.write_bytes(b"%PD")
+            raise RuntimeError("Chromium crashed")
+
+        with pytest.raises(RuntimeError):
+            PdfFiles(None, store).write("<html>", output_dir / "a.pdf", convert)
+
+        assert not (output_dir / "a.pdf").exists()
+        assert list((output_dir / "artifacts" / "scratch").iterdir()) == []
+
+    def test_cli_reuses_pdfs_cached_by_other_jobs(self, output_dir, test_data_dir, monkeypatch):
+        from resumegen import cli
+
+        calls = []
+
+        def generate_pdf(html_path, pdf_path):
+            calls.append(pdf_path)
+            Path(pdf_path).write_bytes(b"%PDF-fake")
+
+        monkeypatch.setattr("resumegen.pdf_service.generate_pdf", generate_pdf)
+        monkeypatch.setenv("RESUMEGEN_CACHE_DIR", str(output_dir / "cache"))
+        kwargs = dict(
+            resume_path=str(test_data_dir / "resume_example.json"),
+            info_path=str(test_data_dir / "personal_info_example.json"),
+        )
+
+        for name in ("a", "b"):
+            cli.generate_resume(
+                **kwargs, out_html=str(output_dir / f"{name}.html"), out_pdf=str(output_dir / f"{name}.pdf")
+            )
+
+        assert len(calls) == 1
+        assert (output_dir / "b.pdf").read_bytes() == b"%PDF-fake"
@@ -0,0 +1,103 @@
+"""
+Test suite for asset inlining and the PDF wait condition
+"""
+
+import base64
+import shutil
+
+import pytest
+
+from resumegen import assets
+from resumegen.assets import asset_dirs, data_uri, inline_assets, wait_condition
+from resumegen.jinja_render import TEMPLATE_DIR, render_resume
+from resumegen.utils import create_resume_with_personal_info
+
+FONT = b"wOF2 font bytes"
+IMAGE = b"\x89PNG image bytes"
+
+
+def _data(media_type: str, content: bytes) -> str:
+    return f"data:{media_type};base64,{base64.b64encode(content).decode()}"
+
+
+@pytest.fixture
+def theme_dir(output_dir):
+    theme = output_dir / "theme"
+    (theme / "assets" / "fonts").mkdir(parents=True)
+    (theme / "assets" / "fonts" / "Inter.woff2").write_bytes(FONT)
+    (theme / "assets" / "logo.png").write_bytes(IMAGE)
+    (theme / "assets" / "fonts.css").write_text(
+        '@font-face { font-family: Inter; src: url("fonts/Inter.woff2") format("woff2"); }'
+    )
+    (output_dir / "secret.png").write_bytes(b"outside the theme")
+    return theme
+
+
+@pytest.mark.cli
+class TestInlineAssets:
+    """Tests for rewriting references to inline copies"""
+
+    def test_local_references_inlined(self, theme_dir):
+        html = (
+            '<link rel="stylesheet" href="assets/fonts.css">'
+            "<style>body { background: url('assets/logo.png') }</style>"
+            '<img alt="logo" src="assets/logo.png"><div style="background: url(assets/logo.png)"></div>'
+        )
+
+        inlined = inline_assets(html, asset_dirs(theme_dir))
+
+        font, image = _data("font/woff2", FONT), _data("image/png", IMAGE)
+        assert inlined == (
+            f'<style>@font-face {{ font-family: Inter; src: url({font}) format("woff2"); }}</style>'
+            f"<style>body {{ background: url({image}) }}</style>"
+            f'<img alt="logo" src="{image}"><div style="background: url({image})"></div>'
+        )
+        assert wait_condition(inlined) == "load"
+
+    def test_remote_reference_served_from_asset_dir(self, theme_dir):
+        shutil.copy(theme_dir / "assets" / "fonts" / "Inter.woff2", theme_dir / "assets")
+        html = "<style>@font-face { src: url(https://fonts.example.com/s/Inter.woff2) }</style>"
+        missing = "<img src='https://images.example.com/photo.jpg'>"
+
+        assert wait_condition(html) == "networkidle0"
+        assert inline_assets(html, asset_dirs(theme_dir)) == (
+            f"<style>@font-face {{ src: url({_data('font/woff2', FONT)}) }}</style>"
+        )
+        assert inline_assets(missing, asset_dirs(theme_dir)) == missing
+        assert wait_condition(missing) == "networkidle0"
+
+    def test_references_outside_asset_dirs_are_kept(self, theme_dir, output_dir):
+        html = (
+            f'<img src="../secret.png"><img src="{output_dir / "secret.png"}">'
+            '<img src="file:///etc/passwd"><img src="assets/missing.png">'
+        )
+
+        assert inline_assets(html, asset_dirs(theme_dir)) == html
+
+    def test_remote_names_cannot_leave_asset_dirs(self, theme_dir, output_dir, monkeypatch):
+        html = "<img src='https://images.example.com/..%2F..%2Fsecret.png'>"
+        writes = []
+        monkeypatch.setattr(assets, "FETCH_ASSETS", True)
+        monkeypatch.setattr(assets, "_fetch", lambda url: writes.append(assets._remote_name(url)))
+
+        assert inline_assets(html, asset_dirs(theme_dir / "assets")) == html
+        assert writes and "/" not in writes[0] and writes[0].endswith(".png")
+
+    def test_identical_files_share_one_encoding(self, theme_dir):
+        copy = theme_dir / "assets" / "copy.png"
+        copy.write_bytes(IMAGE)
+
+        assert data_uri(copy) is data_uri(theme_dir / "assets" / "logo.png")
+
+    def test_render_inlines_theme_fonts(self, theme_dir, resume_data, personal_info_data):
+        for name in ("style.css", "resume_template.html.j2"):
+            shutil.copy(TEMPLATE_DIR / name, theme_dir / name)
+        with open(theme_dir / "style.css", "a") as f:
+            f.write('\n@import "assets/fonts.css";\nh1 { font-family: Inter }\n')
+        resume = create_resume_with_personal_info(resume_data, personal_info_data)
+
+        html = render_resume(resume, wd=theme_dir)
+
+        assert "assets/" not in html
+        assert f"src: url({_data('font/woff2', FONT)})" in html
+        assert wait_condition(render_resume(resume)) == "load"
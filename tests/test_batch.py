@@ -0,0 +1,261 @@
+"""
+Test suite for parallel batch generation
+
+PDF conversion is exercised against a fake worker script speaking the
+`index.js --serve` protocol, so Chromium is not required.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from resumegen.batch import detect_document_type, discover_jobs, run_batch
+from resumegen.build_cache import BuildManifest, build_fingerprint
+from resumegen.cli import app
+from resumegen.pdf_service import NodePdfWorker
+
+FAKE_WORKER = """
+const fs = require("fs");
+const readline = require("readline");
+const input = readline.createInterface({ input: process.stdin });
+input.on("line", (line) => {
+  const job = JSON.parse(line);
+  if (job.html.includes("FAIL")) {
+    process.stdout.write(JSON.stringify({ id: job.id, ok: false, error: "boom" }) + "\\n");
+    return;
+  }
+  const pdf = Buffer.from("%PDF-" + job.html.length);
+  if (job.path) fs.writeFileSync(job.path, pdf);
+  const reply = { id: job.id, ok: true };
+  if (!job.path) reply.pdf = pdf.toString("base64");
+  process.stdout.write(JSON.stringify(reply) + "\\n");
+});
+"""
+
+
+@pytest.fixture
+def batch_dir(output_dir, test_data_dir):
+    source = output_dir / "inputs"
+    source.mkdir()
+    shutil.copy(test_data_dir / "resume_example.json", source / "alice.json")
+    shutil.copy(test_data_dir / "cover_letter_example.json", source / "alice_letter.json")
+    shutil.copy(test_data_dir / "personal_info_example.json", source / "personal_info.json")
+    return source
+
+
+@pytest.mark.cli
+class TestBatchDiscovery:
+    """Tests for job discovery"""
+
+    def test_directory(self, batch_dir):
+        jobs = discover_jobs(batch_dir)
+
+        assert [job.input_path.name for job in jobs] == ["alice.json", "alice_letter.json"]
+        assert all(job.info_path == (batch_dir / "personal_info.json").resolve() for job in jobs)
+        assert jobs[0].out_pdf == (batch_dir / "output" / "alice.pdf").resolve()
+
+    def test_glob(self, batch_dir, output_dir):
+        jobs = discover_jobs(str(batch_dir / "*letter*.json"), out_dir=output_dir / "out")
+
+        assert [job.input_path.name for job in jobs] == ["alice_letter.json"]
+        assert jobs[0].out_html == (output_dir / "out" / "alice_letter.html").resolve()
+
+    def test_manifest(self, batch_dir):
+        manifest = batch_dir / "manifest.json"
+        manifest.write_text(
+            json.dumps({"jobs": [{"input": "alice.json", "type": "resume", "output": "cv"}]})
+        )
+
+        jobs = discover_jobs(manifest)
+
+        assert len(jobs) == 1
+        assert jobs[0].document_type == "resume"
+        assert jobs[0].out_pdf.name == "cv.pdf"
+
+    def test_manifest_output_must_be_a_file_name(self, batch_dir):
+        manifest = batch_dir / "manifest.json"
+        manifest.write_text(json.dumps([{"input": "alice.json", "output": "../../x"}]))
+
+        with pytest.raises(ValueError, match="Invalid output name"):
+            discover_jobs(manifest)
+
+    def test_detect_document_type(self, resume_data, cover_letter_data):
+        assert detect_document_type(resume_data) == "resume"
+        assert detect_document_type(cover_letter_data) == "cover_letter"
+
+
+@pytest.mark.cli
+class TestBatchRun:
+    """Tests for batch execution"""
+
+    def test_html_only_with_failure_summary(self, batch_dir):
+        (batch_dir / "broken.json").write_text('{"education": "not a list"}')
+        jobs = discover_jobs(batch_dir)
+
+        results = run_batch(jobs, workers=2, generate_pdfs=False)
+
+        by_name = {result.job.input_path.name: result for result in results}
+        assert by_name["alice.json"].ok and by_name["alice.json"].job.out_html.exists()
+        assert by_name["alice_letter.json"].document_type == "cover_letter"
+        assert not by_name["broken.json"].ok
+        assert by_name["broken.json"].stage == "validation"
+
+    def test_cli_generate_batch(self, batch_dir):
+        result = CliRunner().invoke(app, ["generate-batch", str(batch_dir), "--no-pdf"])
+
+        assert result.exit_code == 0, result.output
+        assert (batch_dir / "output" / "alice_letter.html").exists()
+
+
+@pytest.mark.cli
+class TestNodePdfWorker:
+    """Tests for the persistent PDF worker protocol"""
+
+    @pytest.fixture
+    def worker(self, output_dir):
+        if shutil.which("node") is None:
+            pytest.skip("Node.js not available")
+        script = output_dir / "fake_worker.js"
+        script.write_text(FAKE_WORKER)
+        with NodePdfWorker(script, concurrency=2) as worker:
+            yield worker
+
+    def test_bytes_and_path_modes(self, worker, output_dir):
+        assert worker.render("<html></html>") == b"%PDF-13"
+
+        pdf_path = output_dir / "doc.pdf"
+        assert worker.render("<html>x</html>", pdf_path) is None
+        assert pdf_path.read_bytes() == b"%PDF-14"
+
+    def test_concurrent_jobs_and_errors(self, worker):
+        futures = [worker.submit("<p>" + "x" * i + "</p>") for i in range(10)]
+        assert [f.result(timeout=10) for f in futures] == [
+            f"%PDF-{7 + i}".encode() for i in range(10)
+        ]
+
+        with pytest.raises(RuntimeError, match="boom"):
+            worker.render("FAIL")
+
+
+@pytest.mark.cli
+class TestBoundedPipeline:
+    """Tests for limiting the documents rendered ahead of PDF conversion"""
+
+    def test_renders_wait_for_conversions(self, batch_dir, monkeypatch):
+        from resumegen import batch
+
+        for i in range(10):
+            shutil.copy(batch_dir / "alice.json", batch_dir / f"copy{i}.json")
+        rendered, lag = [], []
+        render_job = batch.render_job
+
+        def counting_render_job(*args):
+            rendered.append(args[0])
+            return render_job(*args)
+
+        class Backend:
+            converted = 0
+
+            def render(self, html_content, pdf_path=None):
+                lag.append(len(rendered) - self.converted)
+                self.converted += 1
+                Path(pdf_path).write_bytes(b"%PDF-fake")
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr(batch, "render_job", counting_render_job)
+        monkeypatch.setattr("resumegen.pdf_service.open_pdf_backend", lambda concurrency: Backend())
+
+        results = run_batch(discover_jobs(batch_dir), workers=1, pdf_concurrency=1)
+
+        assert len(results) == 12 and all(result.ok for result in results)
+        assert max(lag) <= 2 * 1 + 1
+
+
+@pytest.mark.cli
+class TestIncrementalBuilds:
+    """Tests for the build manifest"""
+
+    def test_unchanged_documents_are_skipped(self, batch_dir):
+        jobs = discover_jobs(batch_dir)
+        first = run_batch(jobs, workers=1, generate_pdfs=False)
+        assert all(result.ok and not result.skipped for result in first)
+        assert (batch_dir / "output" / ".resumegen-manifest.json").exists()
+
+        second = run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False)
+        assert all(result.skipped for result in second)
+
+        forced = run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False, force=True)
+        assert not any(result.skipped for result in forced)
+
+    def test_changed_input_or_missing_output_rebuilds(self, batch_dir):
+        run_batch(discover_jobs(batch_dir), workers=2, generate_pdfs=False)
+
+        letter = batch_dir / "alice_letter.json"
+        data = json.loads(letter.read_text())
+        data["position"] = "Staff Engineer"
+        letter.write_text(json.dumps(data))
+        (batch_dir / "output" / "alice.html").unlink()
+
+        results = run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False)
+
+        assert not any(result.skipped for result in results)
+
+    def test_pdf_outputs_are_part_of_the_build(self, batch_dir):
+        run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False)
+        manifest = BuildManifest(batch_dir / "output")
+        job = discover_jobs(batch_dir)[0]
+        fingerprint = build_fingerprint("resume", job.input_path, job.info_path)
+
+        assert manifest.is_up_to_date([job.out_html], fingerprint)
+        assert not manifest.is_up_to_date([job.out_html, job.out_pdf], fingerprint)
+
+    def test_changed_inlined_asset_rebuilds(self, batch_dir, output_dir, monkeypatch):
+        from resumegen import assets
+
+        asset_dir = output_dir / "assets"
+        asset_dir.mkdir()
+        (asset_dir / "photo.png").write_bytes(b"\x89PNG one")
+        monkeypatch.setattr(assets, "ASSET_DIR", str(asset_dir))
+        info = batch_dir / "personal_info.json"
+        data = json.loads(info.read_text())
+        data["website"] = "photo.png"
+        info.write_text(json.dumps(data))
+        run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False)
+
+        (asset_dir / "photo.png").write_bytes(b"\x89PNG two")
+        results = run_batch(discover_jobs(batch_dir), workers=1, generate_pdfs=False)
+
+        assert not any(result.skipped for result in results)
+
+    def test_single_document_command_skips_when_up_to_date(
+        self, batch_dir, monkeypatch, capsys
+    ):
+        from resumegen import cli
+
+        calls = []
+
+        def fake_generate_pdf(html_path, pdf_path):
+            calls.append(pdf_path)
+            Path(pdf_path).write_bytes(b"%PDF-fake")
+
+        monkeypatch.setattr("resumegen.pdf_service.generate_pdf", fake_generate_pdf)
+        kwargs = dict(
+            resume_path=str(batch_dir / "alice.json"),
+            info_path=str(batch_dir / "personal_info.json"),
+            out_html=str(batch_dir / "out" / "alice.html"),
+            out_pdf=str(batch_dir / "out" / "alice.pdf"),
+        )
+        (batch_dir / "out").mkdir()
+
+        cli.generate_resume(**kwargs)
+        cli.generate_resume(**kwargs)
+        assert len(calls) == 1
+        assert "up to date" in capsys.readouterr().out
+
+        cli.generate_resume(**kwargs, force=True)
+        assert len(calls) == 2
@@ -0,0 +1,57 @@
+"""
+Test suite for the benchmark harness (not the performance numbers themselves)
+"""
+
+import json
+
+import pytest
+from typer.testing import CliRunner
+
+from benchmarks.__main__ import app
+from benchmarks.runner import compare, has_regressions, measure, run_suites
+from benchmarks.workloads import scaled_cover_letter, scaled_resume
+
+
+@pytest.mark.cli
+class TestBenchmarkHarness:
+    """Tests for workloads, measurement and baseline comparison"""
+
+    def test_scaled_inputs(self):
+        resume = scaled_resume(50)
+
+        assert len(resume["work_experience"]) == 50
+        assert len({json.dumps(entry) for entry in resume["work_experience"]}) == 50
+        assert len(scaled_cover_letter(12)["body_paragraphs"]) == 12
+
+    def test_measure(self):
+        result = measure(lambda: sum(range(100)), min_time=0, min_rounds=7)
+
+        assert result["rounds"] == 7
+        assert result["min_ms"] <= result["median_ms"] <= result["p99_ms"]
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"median_ms": 1.0}, "b": {"median_ms": 1.0}, "c": {"median_ms": 1.0}}}
+        current = {"results": {"a": {"median_ms": 1.5}, "b": {"median_ms": 0.5}, "d": {"median_ms": 1.0}}}
+
+        rows = {row["name"]: row["status"] for row in compare(baseline, current, threshold=0.1)}
+
+        assert rows == {"a": "regression", "b": "improvement", "c": "missing", "d": "missing"}
+        assert has_regressions(compare(baseline, current))
+        assert not has_regressions(compare(baseline, baseline))
+
+    def test_run_and_compare_cli(self, output_dir):
+        report = run_suites(["validation", "render"], ["example"], min_time=0)
+        assert "render.resume[example]" in report["results"]
+
+        baseline = output_dir / "baseline.json"
+        current = output_dir / "current.json"
+        slower = json.loads(json.dumps(report))
+        for result in slower["results"].values():
+            result["median_ms"] *= 3
+        baseline.write_text(json.dumps(report))
+        current.write_text(json.dumps(slower))
+
+        result = CliRunner().invoke(app, ["compare", str(baseline), str(current)])
+
+        assert result.exit_code == 1
+        assert "regression" in result.output
@@ -0,0 +1,56 @@
+"""
+Test suite for compact render-only records
+"""
+
+import sys
+
+import pytest
+
+from resumegen.jinja_render import render_cover_letter, render_resume
+from resumegen.models.compact import compact, expand, is_compact
+from resumegen.models.resume import Resume
+from resumegen.utils import (
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+)
+
+
+@pytest.fixture
+def resume(resume_data, personal_info_data):
+    return create_resume_with_personal_info(resume_data, personal_info_data)
+
+
+@pytest.mark.cli
+class TestCompactRecords:
+    """Tests for converting models to compact records and rendering them"""
+
+    def test_records_are_slotted_and_read_only(self, resume):
+        record = compact(resume)
+
+        assert is_compact(record)
+        assert not hasattr(record, "__dict__")
+        assert isinstance(record.education, tuple)
+        assert is_compact(record.education[0])
+        with pytest.raises(AttributeError):
+            record.education = ()
+
+    def test_round_trip(self, resume):
+        restored = expand(compact(resume))
+
+        assert type(restored) is Resume
+        assert restored == resume
+        assert isinstance(restored.education, list)
+
+    def test_repeated_strings_are_shared(self, resume):
+        first, second = compact(resume), compact(Resume.model_validate_json(resume.model_dump_json()))
+
+        assert first.personal_information.email is second.personal_information.email
+        assert sys.getsizeof(first) < sys.getsizeof(resume.__dict__)
+
+    def test_renders_identically(self, resume, cover_letter_data, personal_info_data):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+
+        assert render_resume(compact(resume)) == render_resume(resume)
+        assert render_cover_letter(compact(letter), date="01-01-2025") == render_cover_letter(
+            letter, date="01-01-2025"
+        )
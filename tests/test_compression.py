@@ -0,0 +1,69 @@
+"""
+Test suite for negotiated API response compression
+
+Runs the API in-process, so no Docker services are required.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from resumegen.api import app
+from resumegen.compression import negotiate_encoding
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestNegotiation:
+    """Tests for Accept-Encoding negotiation"""
+
+    @pytest.mark.parametrize(
+        "header, brotli_available, expected",
+        [
+            ("gzip, deflate, br", True, "br"),
+            ("gzip, deflate, br", False, "gzip"),
+            ("br;q=0.5, gzip;q=0.8", True, "gzip"),
+            ("gzip;q=0", False, None),
+            ("identity", True, None),
+            ("*", False, "gzip"),
+            ("", True, None),
+        ],
+    )
+    def test_negotiate_encoding(self, header, brotli_available, expected):
+        assert negotiate_encoding(header, brotli_available) == expected
+
+
+class TestCompressionMiddleware:
+    """Tests for compressed API responses"""
+
+    def test_large_json_response_is_gzipped(self, client, api_request_resume):
+        request_data = dict(api_request_resume, output_format="html")
+
+        response = client.post(
+            "/generate-resume", json=request_data, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        # httpx decodes transparently; the payload must survive the round trip
+        assert "<html" in response.json()["html_content"]
+        assert int(response.headers["content-length"]) < len(response.content)
+
+    def test_identity_when_not_accepted(self, client, api_request_resume):
+        request_data = dict(api_request_resume, output_format="html")
+
+        response = client.post(
+            "/generate-resume", json=request_data, headers={"Accept-Encoding": "identity"}
+        )
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_small_response_not_compressed(self, client):
+        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
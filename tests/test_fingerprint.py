@@ -0,0 +1,84 @@
+"""
+Test suite for document fingerprints and structural diffs
+"""
+
+import pytest
+
+from resumegen.models.cover_letter import CoverLetter
+from resumegen.models.resume import Resume
+from resumegen.utils import (
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+)
+
+
+@pytest.fixture
+def resume(resume_data, personal_info_data):
+    return create_resume_with_personal_info(resume_data, personal_info_data)
+
+
+def _copy(document):
+    return type(document).model_validate_json(document.model_dump_json())
+
+
+@pytest.mark.cli
+class TestFingerprints:
+    """Tests for canonical, memoized fingerprints"""
+
+    def test_equal_content_equal_fingerprint(self, resume):
+        other = _copy(resume)
+
+        assert other is not resume
+        assert other.fingerprint() == resume.fingerprint()
+        assert other.section_fingerprints() == resume.section_fingerprints()
+        assert len(resume.item_fingerprints("education")) == len(resume.education)
+        assert resume.item_fingerprints("personal_information") is None
+
+    def test_documents_of_different_kinds_differ(self, resume, cover_letter_data, personal_info_data):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+
+        assert letter.fingerprint() != resume.fingerprint()
+        assert letter.personal_information.fingerprint() == resume.personal_information.fingerprint()
+        with pytest.raises(TypeError, match="Cannot diff"):
+            resume.diff(letter)
+
+    def test_assignment_invalidates(self, resume):
+        before = resume.fingerprint()
+
+        resume.professional_summary = "Something else entirely"
+
+        assert resume.fingerprint() != before
+
+    def test_copy_keeps_untouched_sections(self, resume):
+        resume.section_fingerprints()
+
+        updated = resume.model_copy(update={"projects": []})
+
+        assert set(updated._fingerprints) == set(Resume.model_fields) - {"projects"}
+        assert updated.diff(resume) == {"projects": list(range(len(resume.projects)))}
+
+
+@pytest.mark.cli
+class TestDiff:
+    """Tests for structural diffs by section and item index"""
+
+    def test_changed_added_and_scalar_sections(self, resume):
+        other = _copy(resume)
+        other.education[0].degree = "Changed"
+        other.invalidate_fingerprints()
+        other.work_experience = other.work_experience + [other.work_experience[0]]
+        other.professional_summary = "New summary"
+
+        assert resume.diff(other) == {
+            "professional_summary": None,
+            "education": [0],
+            "work_experience": [len(resume.work_experience)],
+        }
+        assert resume.diff(_copy(resume)) == {}
+
+    def test_cover_letter_paragraphs(self, cover_letter_data, personal_info_data):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+        other = letter.model_copy(update={"body_paragraphs": ["Different"] + letter.body_paragraphs[1:]})
+
+        assert isinstance(other, CoverLetter)
+        assert letter.diff(other) == {"body_paragraphs": [0]}
@@ -0,0 +1,94 @@
+"""
+Import-time regression benchmark
+
+Guards the startup budget of `import resumegen` and `resumegen --help`.
+Budgets can be scaled for slow machines with RESUMEGEN_IMPORT_BUDGET_SCALE.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+BUDGET_SCALE = float(os.getenv("RESUMEGEN_IMPORT_BUDGET_SCALE", "1.0"))
+
+# Cumulative import time budgets in milliseconds, as reported by -X importtime
+IMPORT_BUDGETS_MS = {
+    "resumegen": 25,
+    "resumegen.cli": 150,
+}
+# Wall-clock budget for a full `resumegen --help` process
+CLI_HELP_BUDGET_MS = 1500
+
+# Modules that must not be loaded by a bare `import resumegen`
+HEAVY_MODULES = ["typer", "rich", "jinja2", "pydantic", "requests", "fastapi"]
+
+
+def cumulative_import_ms(module: str) -> float:
+    """Return the cumulative import time of a module in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise AssertionError(f"No import time reported for {module}")
+
+
+@pytest.mark.cli
+class TestImportTime:
+    """Startup cost regression tests"""
+
+    def test_package_import_is_lazy(self):
+        code = (
+            "import sys, resumegen; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "", f"Eagerly imported: {result.stdout}"
+
+    def test_lazy_attributes_resolve(self):
+        import resumegen
+        from resumegen.cli import generate_resume
+
+        assert resumegen.generate_resume is generate_resume
+        assert resumegen.models.Resume.__name__ == "Resume"
+
+    def test_every_submodule_resolves(self):
+        code = (
+            "import resumegen; "
+            "print(resumegen.watch.__name__, 'batch' in dir(resumegen), 'server' in dir(resumegen))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["resumegen.watch", "True", "True"]
+
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+    def test_import_budget(self, module):
+        # Take the best of a few runs to filter out scheduler noise
+        elapsed = min(cumulative_import_ms(module) for _ in range(3))
+        budget = IMPORT_BUDGETS_MS[module] * BUDGET_SCALE
+        assert elapsed <= budget, f"import {module} took {elapsed:.1f}ms (budget {budget:.0f}ms)"
+
+    def test_cli_help_budget(self):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "-m", "resumegen.cli", "--help"],
+                capture_output=True,
+                check=True,
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        elapsed = min(timings)
+        budget = CLI_HELP_BUDGET_MS * BUDGET_SCALE
+        assert elapsed <= budget, f"resumegen --help took {elapsed:.0f}ms (budget {budget:.0f}ms)"
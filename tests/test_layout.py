@@ -0,0 +1,142 @@
+"""
+Test suite for page-count estimation and fit-to-N-pages layout
+"""
+
+import io
+import re
+
+import pytest
+
+from resumegen.jinja_render import TEMPLATE_DIR, _load_style, render_resume
+from resumegen.layout import (
+    FIT_MARGIN,
+    FitSettings,
+    count_pdf_pages,
+    estimate_pages,
+    fit_to_pages,
+    parse_stylesheet,
+)
+from resumegen.utils import (
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+)
+
+
+def _pdf(pages: int) -> bytes:
+    return b"%PDF-1.4 << /Type /Pages /Count 1 >>" + b" << /Type /Page >>" * pages
+
+
+@pytest.fixture
+def long_resume(resume_data, personal_info_data):
+    data = dict(resume_data, projects=resume_data["projects"] * 8)
+    return create_resume_with_personal_info(data, personal_info_data)
+
+
+@pytest.mark.cli
+class TestEstimator:
+    """Tests for the browser-free page-count estimate"""
+
+    def test_print_rules_and_page_margins(self):
+        sheet = parse_stylesheet(
+            "p { margin: 0 } @media screen { p { margin: 50px } }"
+            " @media print { p { font-size: 9pt } @page { margin: 10mm 5mm } }"
+        )
+
+        assert sheet.page_margins == pytest.approx((37.8, 18.9, 37.8, 18.9), abs=0.1)
+        declarations = [rule.declarations for rule in sheet.rules if rule.key[1] == 1]
+        assert declarations == [{"margin": "0"}, {"font-size": "9pt"}]
+
+    def test_estimate_grows_with_content(self, resume_data, personal_info_data, long_resume):
+        css = _load_style(TEMPLATE_DIR / "style.css")
+        resume = create_resume_with_personal_info(resume_data, personal_info_data)
+
+        short = estimate_pages(render_resume(resume), css)
+        long = estimate_pages(render_resume(long_resume), css)
+
+        assert 0 < short < long
+        assert long > 1
+
+    def test_avoid_break_moves_block_to_next_page(self):
+        # 20 lines of text after 800px of a 1123px page
+        html = '<body><div class="a"></div><div class="b">' + "abcd " * 600 + "</div></body>"
+        css = (
+            "body { margin: 0 } @page { margin: 0 } .a { padding-bottom: 800px }"
+            " .b { font-size: 10px; line-height: 20px }"
+        )
+
+        assert estimate_pages(html, css) == pytest.approx(1 + 77 / 1123, abs=0.01)
+        assert estimate_pages(html, css + " .b { page-break-inside: avoid }") == pytest.approx(
+            1 + 400 / 1123, abs=0.01
+        )
+
+    def test_count_pdf_pages(self):
+        assert count_pdf_pages(_pdf(3)) == 3
+
+    def test_count_pages_of_incrementally_updated_pdf(self):
+        pypdf = pytest.importorskip("pypdf")
+        writer = pypdf.PdfWriter()
+        for _ in range(2):
+            writer.add_blank_page(100, 100)
+        original = io.BytesIO()
+        writer.write(original)
+        # The update appends a second revision of the first page object
+        updated = pypdf.PdfWriter(io.BytesIO(original.getvalue()), incremental=True)
+        updated.pages[0].rotate(90)
+        pdf = io.BytesIO()
+        updated.write(pdf)
+
+        assert count_pdf_pages(pdf.getvalue()) == 2
+
+
+@pytest.mark.cli
+class TestFitToPages:
+    """Tests for the fit search and its confirmation renders"""
+
+    def test_fitting_document_is_unchanged(self, cover_letter_data, personal_info_data):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+
+        fit = fit_to_pages(letter, 1)
+
+        assert fit.settings.is_default
+        assert fit.pdf is None and fit.fits is None
+
+    def test_tightens_only_as_far_as_needed(self, long_resume):
+        fit = fit_to_pages(long_resume, 2)
+
+        assert not fit.settings.is_default
+        assert fit.settings != FitSettings.at(1.0)
+        assert 1.5 < fit.estimated_pages <= 2 - FIT_MARGIN
+        assert f"zoom: {fit.settings.zoom:.4g}" in fit.html
+
+    def test_prunes_sections_in_order(self, long_resume):
+        fit = fit_to_pages(long_resume, 1, prune=["publications", "projects", "achievements"])
+
+        assert fit.pruned == ["publications", "projects"]
+        assert fit.estimated_pages <= 1
+        assert "<h2>Projects</h2>" not in fit.html
+        assert "<h2>Achievements</h2>" in fit.html
+
+    def test_confirmation_overflow_retries_with_less_room(self, long_resume):
+        pages = iter([3, 2])
+        rendered = []
+
+        def render_pdf(html):
+            rendered.append(html)
+            return _pdf(next(pages))
+
+        fit = fit_to_pages(long_resume, 2, render_pdf)
+
+        assert fit.fits and fit.pages == 2 and fit.pdf_renders == 2
+        assert fit.html == rendered[-1]
+        first, second = (float(re.search(r"zoom: ([\d.]+)", html).group(1)) for html in rendered)
+        assert second < first
+
+    def test_invalid_requests(self, long_resume, cover_letter_data, personal_info_data):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+
+        with pytest.raises(ValueError, match="optional sections"):
+            fit_to_pages(long_resume, 1, prune=["education"])
+        with pytest.raises(ValueError, match="Cover letters"):
+            fit_to_pages(letter, 1, prune=["projects"])
+        with pytest.raises(ValueError, match="at least 1"):
+            fit_to_pages(long_resume, 0)
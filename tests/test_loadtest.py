@@ -0,0 +1,98 @@
+"""
+Test suite for the synthetic workload generator and load-test harness
+
+Everything runs in-process against a stub PDF service, so neither Chromium
+nor the Docker services are needed.
+"""
+
+import json
+
+import pytest
+import requests
+from typer.testing import CliRunner
+
+from resumegen.cli import app
+from resumegen.loadtest import (
+    STUB_PDF,
+    PayloadGenerator,
+    SizeDistribution,
+    StubPdfService,
+    loadtest,
+    parse_mix,
+)
+from resumegen.utils import (
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+)
+
+
+@pytest.mark.cli
+class TestWorkloadGenerator:
+    """Tests for schema-driven payload generation"""
+
+    def test_size_distributions(self):
+        generator = PayloadGenerator(seed=1)
+
+        assert SizeDistribution.parse("4").sample(generator.rng) == 4
+        assert all(2 <= SizeDistribution.parse("2-5").sample(generator.rng) <= 5 for _ in range(50))
+        assert all(0 <= SizeDistribution.parse("exp:3").sample(generator.rng) <= 60 for _ in range(50))
+        with pytest.raises(ValueError, match="Invalid size distribution"):
+            SizeDistribution.parse("5-2")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_payloads_are_valid(self, seed):
+        generator = PayloadGenerator(seed=seed, entries="3", optional_probability=1.0)
+        info = generator.personal_info()
+
+        resume = create_resume_with_personal_info(generator.resume(), info)
+        letter = create_cover_letter_with_personal_info(generator.cover_letter(), info)
+
+        assert len(resume.work_experience) == 3
+        assert len(letter.body_paragraphs) == 3
+        assert "@" in resume.personal_information.email
+
+    def test_seeded_payloads_are_reproducible(self):
+        assert PayloadGenerator(seed=7).resume() == PayloadGenerator(seed=7).resume()
+
+    def test_parse_mix(self):
+        assert parse_mix("resume=3,cover_letter=1") == {"resume": 0.75, "cover_letter": 0.25}
+        with pytest.raises(ValueError, match="Unknown document type"):
+            parse_mix("invoice=1")
+
+
+@pytest.mark.cli
+class TestLoadTest:
+    """Tests for the stub PDF service and the load driver"""
+
+    def test_stub_pdf_service(self):
+        with StubPdfService(latency=0) as stub:
+            response = requests.post(f"{stub.url}/generate-pdf", json={"html": "<p></p>"})
+        assert response.content == STUB_PDF
+
+        with StubPdfService(latency=0, error_rate=1.0) as stub:
+            response = requests.post(f"{stub.url}/generate-pdf", json={"html": "<p></p>"})
+        assert response.status_code == 500
+
+    def test_closed_loop_with_stub_pdf(self):
+        report = loadtest(requests=12, concurrency=3, output_format="both", pdf_latency=0, seed=1)
+
+        assert report.requests == 12
+        assert report.statuses == {200: 12}
+        assert sum(report.histogram().values()) == 12
+
+    def test_open_loop_rate(self):
+        report = loadtest(duration=0.5, rate=40, concurrency=4, seed=2)
+
+        assert report.requests > 0
+        assert report.as_dict()["error_rate"] == 0.0
+
+    def test_cli_report(self, output_dir):
+        output = output_dir / "report.json"
+
+        result = CliRunner().invoke(
+            app, ["loadtest", "--requests", "6", "--concurrency", "2", "--output", str(output)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "throughput" in result.output
+        assert json.loads(output.read_text())["requests"] == 6
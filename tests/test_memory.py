@@ -0,0 +1,112 @@
+"""
+Test suite for tracemalloc-based memory instrumentation
+"""
+
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from resumegen import memory, profiling
+from resumegen.api import app as api_app
+from resumegen.cli import app
+from resumegen.metrics import REQUEST_PEAK_MEMORY
+from resumegen.memory import RequestTracker, format_bytes, measure
+
+
+@pytest.fixture
+def trace_memory(monkeypatch):
+    monkeypatch.setattr(memory, "TRACE_MEMORY", True)
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    was_tracing = tracemalloc.is_tracing()
+    yield
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+@pytest.mark.cli
+class TestMeasure:
+    """Tests for measuring the memory of a block"""
+
+    def test_measure_peak_and_retained(self):
+        kept = []
+        with measure() as usage:
+            temporary = bytearray(4_000_000)
+            del temporary
+            kept.append(bytearray(1_000_000))
+
+        assert usage.peak_bytes >= 4_000_000
+        assert 1_000_000 <= usage.retained_bytes < 4_000_000
+        assert usage.peak_rss_bytes > 0
+        assert not tracemalloc.is_tracing()
+
+    def test_overlapping_requests_share_the_peak(self):
+        tracker = RequestTracker()
+        try:
+            with tracker.track() as outer:
+                with tracker.track() as inner:
+                    data = bytearray(2_000_000)
+                    del data
+        finally:
+            tracemalloc.stop()
+
+        assert inner.peak_bytes >= 2_000_000
+        assert outer.peak_bytes >= 2_000_000
+
+    def test_format_bytes(self):
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(3 * 1024 * 1024) == "3.0 MiB"
+        assert format_bytes(None) == "n/a"
+
+    def test_cli_memory_report(self, output_dir, test_data_dir):
+        result = CliRunner().invoke(
+            app,
+            [
+                "generate-batch",
+                str(test_data_dir / "resume_example.json"),
+                "--info-path",
+                str(test_data_dir / "personal_info_example.json"),
+                "--out-dir",
+                str(output_dir / "out"),
+                "--no-pdf",
+                "--workers",
+                "1",
+                "--memory",
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Memory per document" in result.output
+        assert "resume_example.json" in result.output
+
+
+class TestApiMemory:
+    """Tests for per-request memory metrics and the allocation debug endpoint"""
+
+    def test_request_peak_recorded(self, api_request_resume, trace_memory):
+        before = REQUEST_PEAK_MEMORY.count(endpoint="/generate-resume", document_type="resume")
+        client = TestClient(api_app)
+
+        response = client.post("/generate-resume", json=dict(api_request_resume, output_format="html"))
+
+        assert response.status_code == 200
+        assert REQUEST_PEAK_MEMORY.count(endpoint="/generate-resume", document_type="resume") == before + 1
+
+        report = client.get("/debug/memory?limit=5", headers={"X-Profile-Token": "secret"})
+        assert report.status_code == 200
+        body = report.json()
+        assert body["current_bytes"] > 0
+        assert 0 < len(body["top"]) <= 5
+        assert {"site", "size_bytes", "blocks"} <= set(body["top"][0])
+
+    def test_debug_endpoint_requires_token(self, trace_memory):
+        assert TestClient(api_app).get("/debug/memory").status_code == 404
+
+    def test_disabled_by_default(self, api_request_resume, monkeypatch):
+        monkeypatch.setattr(memory, "TRACE_MEMORY", False)
+        before = REQUEST_PEAK_MEMORY.count(endpoint="/generate-resume", document_type="resume")
+
+        TestClient(api_app).post("/generate-resume", json=dict(api_request_resume, output_format="html"))
+
+        assert REQUEST_PEAK_MEMORY.count(endpoint="/generate-resume", document_type="resume") == before
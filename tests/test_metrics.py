@@ -0,0 +1,181 @@
+"""
+Test suite for API instrumentation: Prometheus metrics and Server-Timing
+
+Runs the API in-process, so no Docker services are required.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from resumegen.api import app
+from resumegen.metrics import Counter, Gauge, Histogram, Registry, STAGE_SECONDS
+
+# Above the default pid_max, so no process can have it
+DEAD_PID = 2**22 + 1
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+class TestMetricsRegistry:
+    """Tests for the metric primitives"""
+
+    def test_counter_and_histogram_exposition(self):
+        registry = Registry()
+        counter = registry.register(Counter("demo_total", "Demo counter.", ("kind",)))
+        histogram = registry.register(
+            Histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0))
+        )
+
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+        histogram.observe(0.5)
+
+        text = registry.render()
+        assert "# TYPE demo_total counter" in text
+        assert 'demo_total{kind="a"} 3' in text
+        assert 'demo_seconds_bucket{le="0.1"} 0' in text
+        assert 'demo_seconds_bucket{le="1"} 1' in text
+        assert 'demo_seconds_bucket{le="+Inf"} 1' in text
+        assert "demo_seconds_count 1" in text
+
+    def test_wrong_labels_rejected(self):
+        counter = Counter("labels_total", "Labelled counter.", ("kind",))
+        with pytest.raises(ValueError):
+            counter.inc(other="x")
+
+
+class TestMultiprocessMetrics:
+    """Tests for aggregating the metrics of several worker processes"""
+
+    @staticmethod
+    def worker(directory):
+        registry = Registry(directory)
+        counter = registry.register(Counter("jobs_total", "Jobs.", ("kind",)))
+        gauge = registry.register(Gauge("busy", "Busy workers."))
+        histogram = registry.register(Histogram("job_seconds", "Job latency.", buckets=(1.0,)))
+        return registry, counter, gauge, histogram
+
+    def test_workers_summed_and_exited_gauges_dropped(self, output_dir):
+        exited, counter, gauge, histogram = self.worker(output_dir)
+        counter.inc(2, kind="a")
+        gauge.set(5)
+        histogram.observe(0.5)
+        exited.flush()
+        [snapshot] = output_dir.glob("*.json")
+        snapshot.rename(output_dir / f"{DEAD_PID}-exited.json")
+
+        registry, counter, gauge, histogram = self.worker(output_dir)
+        counter.inc(kind="a")
+        gauge.set(1)
+        histogram.observe(2.0)
+        text = registry.render()
+
+        assert 'jobs_total{kind="a"} 3' in text
+        assert "busy 1" in text
+        assert 'job_seconds_bucket{le="1"} 1' in text and "job_seconds_count 2" in text
+        assert "job_seconds_sum 2.5" in text
+
+    def test_exited_workers_folded_into_aggregate(self, output_dir):
+        for run in range(3):
+            exited, counter, gauge, histogram = self.worker(output_dir)
+            counter.inc(kind="a")
+            gauge.set(5)
+            histogram.observe(0.5)
+            exited.flush()
+            [snapshot] = [path for path in output_dir.glob("*.json") if path.name != "aggregate.json"]
+            snapshot.rename(output_dir / f"{DEAD_PID}-exited{run}.json")
+            registry = self.worker(output_dir)[0]
+            registry.render()
+            registry._own_snapshot_path().unlink()
+
+        registry, counter, _, _ = self.worker(output_dir)
+        counter.inc(kind="a")
+        first, second = registry.render(), registry.render()
+
+        assert first == second
+        assert 'jobs_total{kind="a"} 4' in first and "job_seconds_count 3" in first
+        assert "busy 0" in first
+        assert {path.name for path in output_dir.glob("*.json")} == {
+            "aggregate.json",
+            registry._own_snapshot_path().name,
+        }
+
+    def test_exiting_worker_retires_its_snapshot(self, output_dir):
+        exiting, counter, _, _ = self.worker(output_dir)
+        counter.inc(2, kind="a")
+
+        exiting.retire()
+
+        assert [path.name for path in output_dir.glob("*.json")] == ["aggregate.json"]
+        assert 'jobs_total{kind="a"} 2' in self.worker(output_dir)[0].render()
+
+    def test_forked_worker_starts_from_zero(self, output_dir):
+        registry, counter, _, _ = self.worker(output_dir)
+        counter.inc(4, kind="a")
+        registry.flush()
+
+        registry.after_fork_in_child()
+
+        assert counter.get(kind="a") == 0
+        assert 'jobs_total{kind="a"} 4' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """Tests for the /metrics endpoint"""
+
+    def test_metrics_endpoint_format(self, client):
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE resumegen_stage_duration_seconds histogram" in response.text
+        assert "resumegen_queue_depth 0" in response.text
+
+    def test_generation_records_stages(self, client, api_request_resume):
+        before = STAGE_SECONDS.count(stage="render", document_type="resume")
+        request_data = dict(api_request_resume, output_format="html")
+
+        for _ in range(2):
+            response = client.post("/generate-resume", json=request_data)
+            assert response.status_code == 200
+
+        assert STAGE_SECONDS.count(stage="render", document_type="resume") == before + 2
+        text = client.get("/metrics").text
+        assert (
+            'resumegen_requests_total{endpoint="/generate-resume",'
+            'document_type="resume",status="200"}' in text
+        )
+        assert 'resumegen_stage_duration_seconds_count{stage="validation",document_type="resume"}' in text
+        assert 'resumegen_cache_requests_total{cache="template",result="hit"}' in text
+        assert 'resumegen_response_size_bytes_count{document_type="resume"}' in text
+
+
+class TestServerTiming:
+    """Tests for per-request stage timings"""
+
+    def test_server_timing_header(self, client, api_request_resume):
+        request_data = dict(api_request_resume, output_format="html")
+
+        response = client.post("/generate-resume", json=request_data)
+
+        assert response.status_code == 200
+        header = response.headers["server-timing"]
+        assert "validation;dur=" in header
+        assert "render;dur=" in header
+        assert "cache;dur=" in header
+        assert response.json()["timings"] is None
+
+    def test_timings_field(self, client, api_request_cover_letter):
+        request_data = dict(
+            api_request_cover_letter, output_format="html", include_timings=True
+        )
+
+        response = client.post("/generate-cover-letter", json=request_data)
+
+        assert response.status_code == 200
+        timings = response.json()["timings"]
+        assert set(timings) >= {"validation", "render", "cache"}
+        assert all(duration >= 0 for duration in timings.values())
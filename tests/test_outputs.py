@@ -0,0 +1,174 @@
+"""
+Test suite for multi-target output formats
+"""
+
+import base64
+import io
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from resumegen import api
+from resumegen.api import app as api_app
+from resumegen.artifacts import ArtifactStore
+from resumegen.outputs import is_legacy, parse_targets
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Fake one-session backend: records each call's jobs and echoes them as content"""
+    calls = []
+
+    def generate_outputs(html_content, jobs):
+        calls.append(jobs)
+        return {
+            job["name"]: f"{job['type']} {job.get('options', {}).get('format', '')}".encode()
+            for job in jobs
+        }
+
+    monkeypatch.setattr(api, "generate_outputs", generate_outputs)
+    monkeypatch.setattr(api, "_pdf_stores", lambda: (None, None))
+    return calls
+
+
+@pytest.mark.cli
+class TestTargets:
+    """Tests for parsing output_format"""
+
+    def test_legacy_formats(self):
+        assert [t.name for t in parse_targets("both")] == ["html", "pdf"]
+        assert is_legacy("both") and is_legacy("PDF")
+        assert not is_legacy(["pdf"]) and not is_legacy("pdf:letter")
+
+    def test_paper_sizes_and_thumbnails(self):
+        targets = parse_targets(["PDF:Letter", "pdf", "thumbnail:600", "pdf"])
+
+        assert [(t.name, t.kind, t.paper) for t in targets] == [
+            ("pdf:letter", "pdf", "letter"),
+            ("pdf", "pdf", "a4"),
+            ("thumbnail:600", "thumbnail", "letter"),
+        ]
+        viewport = targets[2].browser_job()["viewport"]
+        assert (viewport["width"], viewport["height"]) == (816, 1056)
+        assert viewport["width"] * viewport["deviceScaleFactor"] == pytest.approx(600)
+
+    @pytest.mark.parametrize(
+        "output_format, message",
+        [
+            (["pdf:b5"], "Unknown paper size"),
+            (["thumbnail:0"], "Thumbnail width"),
+            (["docx"], "Unknown output target"),
+            ([], "at least one target"),
+            ([1], "must be strings"),
+        ],
+    )
+    def test_invalid_targets(self, output_format, message):
+        with pytest.raises(ValueError, match=message):
+            parse_targets(output_format)
+
+
+@pytest.mark.cli
+class TestApiTargets:
+    """Tests for producing every target from one render and one backend session"""
+
+    def test_all_targets_in_one_session(self, api_request_resume, backend):
+        request = dict(api_request_resume, output_format=["html", "pdf:letter", "pdf", "pdf:a4", "thumbnail"])
+
+        response = TestClient(api_app).post("/generate-resume", json=request)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["html_content"] is None and body["pdf_content"] is None
+        outputs = body["outputs"]
+        assert list(outputs) == ["html", "pdf:letter", "pdf", "pdf:a4", "thumbnail"]
+        assert outputs["html"].startswith("<!DOCTYPE html>")
+        decoded = {name: base64.b64decode(outputs[name]) for name in list(outputs)[1:]}
+        assert decoded == {
+            "pdf:letter": b"pdf letter",
+            "pdf": b"pdf a4",
+            "pdf:a4": b"pdf a4",
+            "thumbnail": b"screenshot ",
+        }
+        # "pdf" and "pdf:a4" are the same output and rendered once
+        assert [[job["name"] for job in jobs] for jobs in backend] == [["pdf:letter", "pdf", "thumbnail"]]
+
+    def test_cached_targets_not_rendered_again(self, api_request_resume, backend, output_dir, monkeypatch):
+        store = ArtifactStore(output_dir)
+        monkeypatch.setattr(api, "_pdf_stores", lambda: (store, store))
+        client = TestClient(api_app)
+
+        first = client.post("/generate-resume", json=dict(api_request_resume, output_format=["pdf:letter"]))
+        second = client.post(
+            "/generate-resume", json=dict(api_request_resume, output_format=["pdf:letter", "pdf"])
+        )
+
+        assert first.json()["outputs"]["pdf:letter"] == second.json()["outputs"]["pdf:letter"]
+        assert [[job["name"] for job in jobs] for jobs in backend] == [["pdf:letter"], ["pdf"]]
+
+    def test_unknown_target_rejected(self, api_request_resume):
+        request = dict(api_request_resume, output_format=["pdf:b5"])
+
+        response = TestClient(api_app).post("/generate-resume", json=request)
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][-1] == "output_format"
+
+    def test_archive_members_per_target(self, resume_data, personal_info_data, backend):
+        request = {
+            "output_format": ["html", "pdf", "pdf:letter", "thumbnail"],
+            "documents": [{"resume_data": resume_data, "personal_info": personal_info_data, "name": "alice"}],
+        }
+
+        response = TestClient(api_app).post("/generate-archive", json=request)
+
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert sorted(archive.namelist()) == [
+            "alice-letter.pdf",
+            "alice-thumbnail.png",
+            "alice.html",
+            "alice.pdf",
+        ]
+        assert archive.read("alice-letter.pdf") == b"pdf letter"
+
+
+class FakeBackend:
+    """Long-lived backend that fails while `running` is False"""
+
+    def __init__(self, opened):
+        opened.append(self)
+        self.running = True
+        self.closed = False
+
+    def render_outputs(self, html_content, targets):
+        if not self.running:
+            raise RuntimeError("PDF worker exited unexpectedly")
+        return {target["name"]: b"pdf" for target in targets}
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.cli
+class TestSharedBackend:
+    """Tests for reusing one PDF backend across API requests"""
+
+    def test_backend_opened_once_and_replaced_when_dead(self, api_request_resume, monkeypatch):
+        opened = []
+        monkeypatch.setattr(api, "open_pdf_backend", lambda concurrency: FakeBackend(opened))
+        monkeypatch.setattr(api, "_pdf_stores", lambda: (None, None))
+        monkeypatch.setattr(api, "_pdf_backend", None)
+        request = dict(api_request_resume, output_format=["pdf", "thumbnail"])
+
+        with TestClient(api_app) as client:
+            for _ in range(3):
+                assert client.post("/generate-resume", json=request).status_code == 200
+            assert len(opened) == 1
+
+            opened[0].running = False
+            assert client.post("/generate-resume", json=request).status_code == 500
+            assert client.post("/generate-resume", json=request).status_code == 200
+            assert len(opened) == 2 and opened[0].closed
+
+        # Shut down with the app
+        assert opened[1].closed and api._pdf_backend is None
@@ -0,0 +1,102 @@
+"""
+Test suite for PDF post-processing
+"""
+
+import base64
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+from resumegen import api
+from resumegen.api import app as api_app
+from resumegen.pdf_optimize import OPTIMIZATIONS, optimize_pdf, parse_optimizations
+
+pypdf = pytest.importorskip("pypdf")
+from pypdf.generic import DecodedStreamObject  # noqa: E402
+
+CONTENT = b"BT /F1 12 Tf 72 720 Td (Resume) Tj ET\n" * 200
+
+
+def _uncompressed_pdf(pages: int = 3) -> bytes:
+    """A PDF with an identical unfiltered stream per page and an info dictionary"""
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        page = writer.add_blank_page(595, 842)
+        stream = DecodedStreamObject()
+        stream.set_data(CONTENT)
+        page[pypdf.generic.NameObject("/Contents")] = writer._add_object(stream)
+    writer.add_metadata({"/Producer": "Skia/PDF", "/Creator": "Chromium"})
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+@pytest.mark.cli
+class TestOptimizations:
+    """Tests for selecting optimizations"""
+
+    def test_parse(self):
+        assert parse_optimizations("all") == OPTIMIZATIONS
+        assert parse_optimizations(" Metadata, compress ") == ("compress", "metadata")
+        assert parse_optimizations(["none"]) == ()
+        assert parse_optimizations(None) == ()
+
+    def test_unknown_optimization(self):
+        with pytest.raises(ValueError, match="Unknown PDF optimization: subset"):
+            parse_optimizations("compress,subset")
+
+
+@pytest.mark.cli
+class TestOptimizePdf:
+    """Tests for the pypdf post-processing pass"""
+
+    def test_all_optimizations_shrink_the_pdf(self):
+        pdf = _uncompressed_pdf()
+
+        result = optimize_pdf(pdf)
+
+        assert result.original_bytes == len(pdf)
+        assert 0 < result.saved_bytes == len(pdf) - len(result.pdf)
+        reader = pypdf.PdfReader(io.BytesIO(result.pdf))
+        assert len(reader.pages) == 3
+        assert reader.pages[2].get_contents().get_data() == CONTENT
+        assert not reader.metadata
+
+    @pytest.mark.parametrize("optimization", OPTIMIZATIONS)
+    def test_each_optimization_saves_bytes(self, optimization):
+        assert optimize_pdf(_uncompressed_pdf(), [optimization]).saved_bytes > 0
+
+    def test_result_that_is_not_smaller_is_discarded(self):
+        # A second pass drops the free entries deduplication leaves behind
+        pdf = optimize_pdf(optimize_pdf(_uncompressed_pdf()).pdf).pdf
+
+        result = optimize_pdf(pdf, ["compress"])
+
+        assert result.pdf is pdf
+        assert result.saved_bytes == 0
+
+
+@pytest.mark.cli
+class TestApiOptimization:
+    """Tests for the pdf_optimize request field"""
+
+    def test_pdf_bytes_saved_reported(self, api_request_resume, monkeypatch):
+        pdf = _uncompressed_pdf()
+        monkeypatch.setattr(api, "_build_pdf", lambda html, document_type: pdf)
+        request = dict(api_request_resume, output_format="pdf", pdf_optimize=["all"])
+
+        response = TestClient(api_app).post("/generate-resume", json=request)
+
+        assert response.status_code == 200
+        body = response.json()
+        optimized = base64.b64decode(body["pdf_content"])
+        assert body["pdf_bytes_saved"] == len(pdf) - len(optimized) > 0
+
+    def test_unknown_optimization_rejected(self, api_request_resume):
+        request = dict(api_request_resume, pdf_optimize=["subset"])
+
+        response = TestClient(api_app).post("/generate-resume", json=request)
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][-1] == "pdf_optimize"
@@ -0,0 +1,117 @@
+"""
+Test suite for CLI and per-request API CPU profiling
+"""
+
+import marshal
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from resumegen import profiling
+from resumegen.api import app as api_app
+from resumegen.cli import app
+from resumegen.profiling import Profiler, profile_to
+
+
+def _work():
+    return sum(i * i for i in range(2000))
+
+
+@pytest.fixture
+def profile_token(output_dir, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", output_dir / "profiles")
+    return "secret"
+
+
+@pytest.mark.cli
+class TestProfiler:
+    """Tests for the pstats and folded-stack profilers"""
+
+    def test_pstats_output(self, output_dir):
+        path = output_dir / "run.prof"
+        with profile_to(path):
+            _work()
+
+        stats = marshal.loads(path.read_bytes())
+        assert any(function == "_work" for _, _, function in stats)
+
+    def test_folded_output(self, output_dir):
+        path = output_dir / "run.folded"
+        with profile_to(path):
+            _work()
+
+        lines = path.read_text().splitlines()
+        assert lines
+        stack, micros = lines[0].rsplit(" ", 1)
+        assert int(micros) >= 0
+        assert any("test_profiling._work" in line for line in lines)
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown profile format"):
+            Profiler("svg")
+
+    def test_cli_profile(self, output_dir, test_data_dir):
+        path = output_dir / "resume.folded"
+        result = CliRunner().invoke(
+            app,
+            [
+                "generate-batch",
+                str(test_data_dir / "resume_example.json"),
+                "--info-path",
+                str(test_data_dir / "personal_info_example.json"),
+                "--out-dir",
+                str(output_dir / "out"),
+                "--no-pdf",
+                "--profile",
+                str(path),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "render_resume" in path.read_text()
+
+
+class TestApiProfiling:
+    """Tests for token-protected per-request profiling"""
+
+    def test_disabled_without_token(self, api_request_resume, monkeypatch):
+        monkeypatch.setattr(profiling, "PROFILE_TOKEN", None)
+        response = TestClient(api_app).post(
+            "/generate-resume",
+            json=dict(api_request_resume, output_format="html"),
+            headers={"X-Profile-Token": "anything"},
+        )
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    def test_profile_request_and_download(self, api_request_resume, profile_token):
+        client = TestClient(api_app)
+        response = client.post(
+            "/generate-resume",
+            json=dict(api_request_resume, output_format="html"),
+            headers={"X-Profile-Token": profile_token, "X-Profile-Format": "folded"},
+        )
+
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        assert response.headers["x-profile-url"] == f"/debug/profiles/{profile_id}"
+
+        download = client.get(
+            f"/debug/profiles/{profile_id}", headers={"X-Profile-Token": profile_token}
+        )
+        assert download.status_code == 200
+        assert "_parse_request" in download.text
+        assert "render_resume" in download.text
+        assert client.get(f"/debug/profiles/{profile_id}").status_code == 404
+
+    def test_wrong_token(self, api_request_resume, profile_token):
+        response = TestClient(api_app).post(
+            "/generate-resume",
+            json=api_request_resume,
+            headers={"X-Profile-Token": "wrong"},
+        )
+
+        assert response.status_code == 403
@@ -0,0 +1,96 @@
+"""
+Test suite for typed API request models validated from the raw request body
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from resumegen.api import ArchiveRequest, BothRequest, InvalidPart, ResumeRequest, app
+from resumegen.models.resume import Resume
+
+
+class TestTypedRequests:
+    """Tests for one-pass request validation and the documented request schema"""
+
+    def test_document_reuses_validated_parts(self, api_request_resume):
+        request = ResumeRequest.model_validate(api_request_resume)
+
+        resume = request.document()
+
+        assert type(resume) is Resume
+        assert resume.personal_information is request.personal_info
+        assert resume.education == request.resume_data.education
+
+    def test_embedded_personal_information_is_ignored(self, api_request_resume):
+        body = dict(api_request_resume, output_format="html")
+        body["resume_data"] = dict(body["resume_data"], personal_information={"name": 1})
+
+        response = TestClient(app).post("/generate-resume", json=body)
+
+        assert response.status_code == 200
+        assert api_request_resume["personal_info"]["surname"] in response.json()["html_content"]
+
+    def test_error_statuses(self, api_request_cover_letter):
+        client = TestClient(app)
+
+        invalid = client.post("/generate-resume", json={"resume_data": {}, "personal_info": {}})
+        assert invalid.status_code == 500
+        assert "validation errors" in invalid.json()["detail"]
+
+        assert client.post("/generate-resume", json={"resume_data": {}}).status_code == 422
+        assert client.post("/generate-resume", content=b"{not json").status_code == 422
+        body = dict(api_request_cover_letter, cover_letter_data={"company": "Acme"})
+        assert client.post("/generate-cover-letter", json=body).status_code == 500
+
+    def test_openapi_schema(self):
+        schema = TestClient(app).get("/openapi.json").json()
+
+        body = schema["paths"]["/generate-resume"]["post"]["requestBody"]
+        assert body["content"]["application/json"]["schema"]["$ref"] == "#/components/schemas/ResumeRequest"
+        components = schema["components"]["schemas"]
+        assert components["ResumeRequest"]["properties"]["personal_info"]["$ref"] == "#/components/schemas/PersonalInfo"
+        assert "work_experience" in components["ResumeData"]["properties"]
+
+    def test_both_request_validated_once(self, api_request_resume, api_request_cover_letter):
+        body = {
+            "resume_data": api_request_resume["resume_data"],
+            "cover_letter_data": api_request_cover_letter["cover_letter_data"],
+            "personal_info": api_request_resume["personal_info"],
+            "output_format": "html",
+        }
+        request = BothRequest.model_validate(body)
+
+        assert request.resume_request().document().personal_information is request.personal_info
+        assert request.cover_letter_request().cover_letter_data is request.cover_letter_data
+
+        response = TestClient(app).post("/generate-both", json=body)
+        assert response.status_code == 200
+        result = response.json()
+        assert result["resume"]["html_content"] and result["cover_letter"]["html_content"]
+        assert result["resume"]["pdf_content"] is None
+
+        missing = TestClient(app).post("/generate-both", json={"resume_data": body["resume_data"]})
+        assert missing.status_code == 422
+
+    def test_typed_schemas_for_every_generation_endpoint(self):
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+
+        for path, model in [("/generate-both", "BothRequest"), ("/generate-variants", "VariantsRequest")]:
+            schema = paths[path]["post"]["requestBody"]["content"]["application/json"]["schema"]
+            assert schema["$ref"] == f"#/components/schemas/{model}"
+
+    def test_archive_documents_validated_with_the_request(self, api_request_resume):
+        valid = {"resume_data": api_request_resume["resume_data"], "personal_info": api_request_resume["personal_info"]}
+        invalid = dict(valid, resume_data={"education": "not a list"})
+
+        request = ArchiveRequest.model_validate({"documents": [valid, invalid]})
+
+        resume = request.documents[0].document()
+        assert resume.personal_information is request.documents[0].personal_info
+        assert isinstance(request.documents[1].resume_data, InvalidPart)
+        with pytest.raises(ValidationError):
+            request.documents[1].document()
+        paths = TestClient(app).get("/openapi.json").json()["paths"]
+        schema = paths["/generate-archive"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+        assert schema["$ref"] == "#/components/schemas/ArchiveRequest"
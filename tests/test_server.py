@@ -0,0 +1,83 @@
+"""
+Test suite for the multi-worker serving mode and the shared result cache
+"""
+
+import os
+import sys
+
+import pytest
+
+from resumegen import server
+from resumegen.cache import ResultCache
+
+
+class TestResultCache:
+    """Tests for the disk-backed result cache"""
+
+    def test_round_trip(self, output_dir):
+        cache = ResultCache(output_dir / "cache")
+        key = cache.key("subprocess", "<html></html>")
+
+        assert cache.get(key) is None
+        cache.put(key, b"%PDF-1.7")
+
+        assert cache.get(key) == b"%PDF-1.7"
+        # Shared by a second instance, as in another worker process
+        assert ResultCache(output_dir / "cache").get(key) == b"%PDF-1.7"
+
+    def test_no_partial_files_left(self, output_dir):
+        cache = ResultCache(output_dir)
+        cache.put(cache.key("a"), b"data")
+
+        leftovers = [p for p in output_dir.rglob(".tmp-*")]
+        assert leftovers == []
+
+    def test_key_depends_on_every_part(self):
+        assert ResultCache.key("ab", "c") != ResultCache.key("a", "bc")
+
+
+class TestServe:
+    """Tests for the production server configuration"""
+
+    def test_uvicorn_fallback(self, monkeypatch, output_dir):
+        calls = {}
+        monkeypatch.setitem(sys.modules, "gunicorn.app.base", None)
+        monkeypatch.setattr("uvicorn.run", lambda app, **kwargs: calls.update(app=app, **kwargs))
+        # Restored afterwards: serve() sets it for the workers it starts
+        monkeypatch.setenv("RESUMEGEN_CACHE_DIR", "")
+        monkeypatch.setenv("RESUMEGEN_METRICS_DIR", str(output_dir / "metrics"))
+        monkeypatch.setattr(
+            "resumegen.metrics.enable_multiprocess", calls.setdefault("metrics", []).append
+        )
+        (output_dir / "metrics").mkdir()
+        (output_dir / "metrics" / "123-previous.json").write_text("{}")
+
+        server.serve(port=9000, workers=3, max_requests=50, cache_dir=output_dir)
+
+        assert calls["app"] == "resumegen.api:app"
+        assert calls["workers"] == 3
+        assert calls["limit_max_requests"] == 50
+        # Staggered per worker, and hung workers are restarted, as under gunicorn
+        assert calls["limit_max_requests_jitter"] == 100
+        assert calls["timeout_worker_healthcheck"] == calls["timeout_graceful_shutdown"] == 120
+        assert calls["port"] == 9000
+        assert os.environ["RESUMEGEN_CACHE_DIR"] == str(output_dir)
+        # Workers aggregate their metrics in a directory emptied at startup
+        assert calls["metrics"] == [output_dir / "metrics"]
+        assert list((output_dir / "metrics").iterdir()) == []
+
+    def test_uvicorn_without_jitter_support(self, monkeypatch, capsys):
+        import uvicorn
+
+        class OldConfig:
+            def __init__(self, app, limit_max_requests=None, timeout_graceful_shutdown=None):
+                pass
+
+        monkeypatch.setattr(uvicorn, "Config", OldConfig)
+
+        options = server._uvicorn_options(50, 10, 30)
+
+        assert 50 <= options["limit_max_requests"] <= 60
+        assert "limit_max_requests_jitter" not in options and "timeout_worker_healthcheck" not in options
+        errors = capsys.readouterr().err
+        assert "--max-requests-jitter" in errors and "--timeout" in errors
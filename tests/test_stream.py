@@ -0,0 +1,116 @@
+"""
+Test suite for streaming generation from JSON Lines input
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from resumegen.cli import app
+from resumegen.storage import iter_jsonl
+from resumegen.stream import stream_jsonl
+
+
+class RecordingBackend:
+    """PDF backend stand-in that writes a marker file per document"""
+
+    def __init__(self):
+        self.rendered = []
+        self.closed = False
+
+    def render(self, html_content, pdf_path=None):
+        self.rendered.append(pdf_path)
+        Path(pdf_path).write_bytes(b"%PDF-fake")
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def jsonl_file(output_dir, resume_data, cover_letter_data, personal_info_data):
+    path = output_dir / "export.jsonl"
+    lines = [
+        json.dumps({"resume_data": resume_data, "personal_info": personal_info_data, "output": "alice"}),
+        "",
+        "{not json",
+        json.dumps({"cover_letter_data": cover_letter_data, "personal_info": personal_info_data}),
+        json.dumps({"education": "not a list", "personal_information": personal_info_data}),
+        json.dumps(dict(resume_data, personal_information=personal_info_data)),
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.cli
+class TestStreamJsonl:
+    """Tests for the JSON Lines pipeline"""
+
+    def test_iter_jsonl_skips_blank_lines(self):
+        lines = list(iter_jsonl(io.StringIO('{"a": 1}\n\n{"b": 2}\n')))
+
+        assert [line for line, _ in lines] == [1, 3]
+
+    def test_iter_jsonl_rejects_other_files(self, output_dir):
+        with pytest.raises(ValueError, match="JSON Lines"):
+            list(iter_jsonl(output_dir / "data.json"))
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_per_line_errors_do_not_abort(self, jsonl_file, output_dir, workers):
+        out_dir = output_dir / "out"
+
+        results = {
+            result.line: result
+            for result in stream_jsonl(
+                jsonl_file, out_dir, workers=workers, generate_pdfs=False, max_in_flight=2
+            )
+        }
+
+        assert sorted(results) == [1, 3, 4, 5, 6]
+        assert results[1].ok and (out_dir / "alice.html").exists()
+        assert results[3].stage == "parse"
+        assert results[4].document_type == "cover_letter"
+        assert (out_dir / "export-4.html").exists()
+        assert results[5].stage == "validation"
+        assert results[6].ok and results[6].document_type == "resume"
+
+    def test_output_names_cannot_leave_out_dir(self, output_dir, resume_data, personal_info_data):
+        source = io.StringIO(
+            json.dumps({"resume_data": resume_data, "personal_info": personal_info_data, "output": "../../x"})
+            + "\n"
+        )
+
+        [result] = stream_jsonl(source, output_dir / "out", workers=1, generate_pdfs=False)
+
+        assert result.stage == "parse" and "Invalid output name" in result.error
+        assert not (output_dir / "x.html").exists() and not (output_dir.parent / "x.html").exists()
+
+    def test_pdfs_written_through_shared_backend(self, jsonl_file, output_dir, monkeypatch):
+        backend = RecordingBackend()
+        monkeypatch.setattr("resumegen.pdf_service.open_pdf_backend", lambda concurrency: backend)
+        out_dir = output_dir / "out"
+
+        results = list(stream_jsonl(jsonl_file, out_dir, workers=1, pdf_concurrency=2))
+
+        assert sorted(path.name for path in backend.rendered) == [
+            "alice.pdf",
+            "export-4.pdf",
+            "export-6.pdf",
+        ]
+        assert sum(result.ok for result in results) == 3
+        assert backend.closed
+
+    def test_cli_generate_batch_jsonl(self, jsonl_file, output_dir):
+        out_dir = output_dir / "cli"
+
+        result = CliRunner().invoke(
+            app,
+            ["generate-batch", str(jsonl_file), "--out-dir", str(out_dir), "--workers", "1", "--no-pdf"],
+        )
+
+        assert result.exit_code == 1
+        assert "Generated 3 of 5 documents" in result.output
+        assert "line 3" in result.output
+        assert (out_dir / "alice.html").exists()
@@ -0,0 +1,101 @@
+"""
+Test suite for template context analysis
+"""
+
+import os
+import shutil
+
+import pytest
+
+from resumegen import jinja_render
+from resumegen.jinja_render import TEMPLATE_DIR, render_cover_letter, render_resume
+from resumegen.models.resume import Resume
+from resumegen.template_usage import analyze, model_include, template_include
+from resumegen.utils import (
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+)
+
+SPARSE_TEMPLATE = """<h1>{{ personal_information.name }}</h1>
+{% for job in work_experience %}<p>{{ job.company }}{% if loop.last %}.{% endif %}</p>{% endfor %}
+<style>{{ style_css }}</style>"""
+
+
+@pytest.fixture
+def resume(resume_data, personal_info_data):
+    return create_resume_with_personal_info(resume_data, personal_info_data)
+
+
+@pytest.fixture
+def theme_dir(output_dir):
+    theme = output_dir / "theme"
+    theme.mkdir(exist_ok=True)
+    shutil.copy(TEMPLATE_DIR / "style.css", theme / "style.css")
+    (theme / "sparse.html.j2").write_text(SPARSE_TEMPLATE)
+    return theme
+
+
+@pytest.mark.cli
+class TestTemplateUsage:
+    """Tests for the context paths read by templates"""
+
+    def test_paths_follow_loops(self):
+        include = analyze(
+            "{% if summary %}{{ summary }}{% endif %}"
+            "{% for job in jobs if job.visible %}{{ job.company|upper }}"
+            "{% for skill in job.skills %}{{ skill.name }}{% endfor %}{% endfor %}"
+            "{% for key, value in extra.items() %}{{ value }}{% endfor %}"
+        )
+
+        assert include == {
+            "summary": True,
+            "jobs": {
+                "__all__": {
+                    "visible": True,
+                    "company": True,
+                    "skills": {"__all__": {"name": True}},
+                }
+            },
+            "extra": True,
+        }
+
+    def test_unsupported_constructs_use_full_context(self):
+        assert analyze("{% set name = personal_information.name %}{{ name }}") is None
+        assert analyze('{% include "footer.html.j2" %}') is None
+
+    def test_bundled_templates_render_unchanged(self, resume, cover_letter_data, personal_info_data, monkeypatch):
+        letter = create_cover_letter_with_personal_info(cover_letter_data, personal_info_data)
+        resume_html = render_resume(resume)
+        letter_html = render_cover_letter(letter, date="01-01-2026")
+
+        monkeypatch.setattr(jinja_render, "model_include", lambda template, model: None)
+
+        assert render_resume(resume) == resume_html
+        assert render_cover_letter(letter, date="01-01-2026") == letter_html
+
+    def test_sparse_template_trims_context(self, resume, theme_dir):
+        template = jinja_render._get_template(theme_dir, "sparse.html.j2")
+
+        assert model_include(template, Resume) == {
+            "personal_information": True,
+            "work_experience": True,
+        }
+        context = jinja_render._template_context(resume, template)
+        assert set(context) == {"personal_information", "work_experience"}
+
+        html = render_resume(resume, wd=theme_dir, template_name="sparse.html.j2")
+        assert resume.work_experience[-1].company + ".</p>" in html
+
+    def test_changed_template_is_analyzed_again(self, theme_dir):
+        template = jinja_render._get_template(theme_dir, "sparse.html.j2")
+        assert "education" not in template_include(template)
+
+        path = theme_dir / "sparse.html.j2"
+        path.write_text(SPARSE_TEMPLATE + "{% for degree in education %}{{ degree.institution }}{% endfor %}")
+        # FileSystemLoader checks the mtime; make sure the change is seen
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        reloaded = jinja_render._get_template(theme_dir, "sparse.html.j2")
+
+        assert reloaded is not template
+        assert template_include(reloaded)["education"] == {"__all__": {"institution": True}}
@@ -0,0 +1,74 @@
+"""
+Test suite for document validation helpers
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from resumegen.models.personal_info import PersonalInfo
+from resumegen.utils import (
+    _validate_personal_info_json,
+    create_cover_letter_with_personal_info,
+    create_resume_with_personal_info,
+    validate_personal_info,
+)
+
+
+@pytest.mark.cli
+class TestValidation:
+    """Tests for single-pass validation and the PersonalInfo cache"""
+
+    def test_personal_info_validated_once(self, resume_data, cover_letter_data, personal_info_data):
+        _validate_personal_info_json.cache_clear()
+
+        resume = create_resume_with_personal_info(resume_data, dict(personal_info_data))
+        letter = create_cover_letter_with_personal_info(cover_letter_data, dict(personal_info_data))
+
+        assert _validate_personal_info_json.cache_info().misses == 1
+        assert resume.personal_information == letter.personal_information
+        assert resume.personal_information.email == personal_info_data["email"]
+
+    def test_cache_independent_of_key_order(self, personal_info_data):
+        _validate_personal_info_json.cache_clear()
+        reordered = dict(reversed(list(personal_info_data.items())))
+        nested = dict(personal_info_data, links=[{"url": "https://example.com"}])
+
+        assert validate_personal_info(reordered) == validate_personal_info(dict(personal_info_data))
+        assert validate_personal_info(nested) == validate_personal_info(dict(nested))
+        assert _validate_personal_info_json.cache_info().misses == 2
+
+    def test_cached_info_not_shared_between_documents(self, resume_data, personal_info_data):
+        first = create_resume_with_personal_info(resume_data, dict(personal_info_data))
+        first.personal_information.name = "Changed"
+
+        second = create_resume_with_personal_info(resume_data, dict(personal_info_data))
+
+        assert second.personal_information.name == personal_info_data["name"]
+
+    def test_validated_instance_passed_through(self, resume_data, personal_info_data):
+        info = PersonalInfo.model_validate(personal_info_data)
+
+        assert create_resume_with_personal_info(resume_data, info).personal_information is info
+
+    def test_explicit_info_overrides_embedded(self, resume_data, personal_info_data):
+        data = dict(resume_data, personal_information=dict(personal_info_data, name="Embedded"))
+
+        resume = create_resume_with_personal_info(data, personal_info_data)
+
+        assert resume.personal_information.name == personal_info_data["name"]
+        assert data["personal_information"]["name"] == "Embedded"
+
+    def test_embedded_info(self, resume_data, personal_info_data):
+        resume = create_resume_with_personal_info(dict(resume_data, personal_information=personal_info_data))
+
+        assert resume.personal_information.surname == personal_info_data["surname"]
+
+    def test_errors(self, resume_data, personal_info_data):
+        with pytest.raises(ValueError, match="Personal information not found"):
+            create_resume_with_personal_info(resume_data)
+        with pytest.raises(ValidationError):
+            validate_personal_info({"name": "Only a name"})
+        with pytest.raises(ValidationError):
+            validate_personal_info(dict(personal_info_data, email=["not", "a", "string"]))
+        with pytest.raises(ValidationError):
+            validate_personal_info(["not", "a", "dict"])
@@ -0,0 +1,194 @@
+"""
+Test suite for variant generation from a base resume plus overlays
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from typer.testing import CliRunner
+
+from resumegen.api import app as api_app
+from resumegen.cli import app
+from resumegen.variants import (
+    Variant,
+    VariantBuilder,
+    VariantError,
+    json_patch,
+    load_variant_set,
+    merge_patch,
+)
+
+
+@pytest.mark.cli
+class TestOverlays:
+    """Tests for merge patches and JSON Patch"""
+
+    def test_merge_patch(self):
+        target = {"a": {"b": 1, "c": 2}, "d": [1, 2], "e": "x"}
+
+        result = merge_patch(target, {"a": {"b": None, "f": 3}, "d": [3], "e": None})
+
+        assert result == {"a": {"c": 2, "f": 3}, "d": [3]}
+        assert target == {"a": {"b": 1, "c": 2}, "d": [1, 2], "e": "x"}
+
+    def test_json_patch(self):
+        document = {"items": [1, 2, 3], "name": "a", "meta": {"k": "v"}}
+
+        result = json_patch(
+            document,
+            [
+                {"op": "test", "path": "/name", "value": "a"},
+                {"op": "remove", "path": "/items/1"},
+                {"op": "add", "path": "/items/-", "value": 4},
+                {"op": "replace", "path": "/name", "value": "b"},
+                {"op": "move", "from": "/meta/k", "path": "/key"},
+            ],
+        )
+
+        assert result == {"items": [1, 3, 4], "name": "b", "meta": {}, "key": "v"}
+
+    def test_json_patch_failed_test(self):
+        with pytest.raises(ValueError, match="Test failed"):
+            json_patch({"name": "a"}, [{"op": "test", "path": "/name", "value": "b"}])
+
+
+@pytest.mark.cli
+class TestVariantBuilder:
+    """Tests for deriving variant models from a validated base"""
+
+    def test_untouched_fields_shared_with_base(self, resume_data, personal_info_data):
+        builder = VariantBuilder(resume_data, personal_info_data)
+
+        variant = builder.build(
+            Variant(
+                "backend",
+                merge={"professional_summary": "Backend engineer", "publications": None},
+                patch=[{"op": "remove", "path": "/work_experience/0"}],
+            )
+        )
+
+        assert variant.professional_summary == "Backend engineer"
+        assert variant.publications is None
+        assert len(variant.work_experience) == len(builder.base.work_experience) - 1
+        assert variant.education is builder.base.education
+        assert len(builder.base.work_experience) == len(resume_data["work_experience"])
+
+    def test_invalid_overlay(self, resume_data, personal_info_data):
+        builder = VariantBuilder(resume_data, personal_info_data)
+
+        with pytest.raises(VariantError, match="Variant 'broken'"):
+            builder.build(Variant("broken", merge={"work_experience": [{"company": "X"}]}))
+
+    def test_whole_document_patch(self, resume_data, personal_info_data):
+        builder = VariantBuilder(resume_data, personal_info_data)
+        replacement = dict(resume_data, personal_information=personal_info_data, projects=None)
+
+        variant = builder.build(Variant("full", patch=[{"op": "replace", "path": "", "value": replacement}]))
+
+        assert variant.projects is None
+
+
+@pytest.fixture
+def variants_file(output_dir, resume_data, personal_info_data):
+    (output_dir / "resume.json").write_text(json.dumps(resume_data))
+    (output_dir / "personal_info.json").write_text(json.dumps(personal_info_data))
+    path = output_dir / "variants.json"
+    path.write_text(
+        json.dumps(
+            {
+                "base": "resume.json",
+                "personal_info": "personal_info.json",
+                "variants": [
+                    {"name": "backend", "merge": {"professional_summary": "Backend engineer"}},
+                    {"name": "short", "patch": [{"op": "remove", "path": "/projects"}]},
+                    {"name": "broken", "patch": [{"op": "remove", "path": "/missing"}]},
+                ],
+            }
+        )
+    )
+    return path
+
+
+@pytest.mark.cli
+class TestVariantsCli:
+    """Tests for the generate-variants command"""
+
+    def test_load_variant_set(self, variants_file, personal_info_data):
+        variant_set = load_variant_set(variants_file)
+
+        assert [variant.name for variant in variant_set.variants] == ["backend", "short", "broken"]
+        assert variant_set.personal_info == personal_info_data
+
+    def test_variant_name_outside_out_dir(self, variants_file, output_dir):
+        data = json.loads(variants_file.read_text())
+        data["variants"].append({"name": "../x", "merge": {}})
+        variants_file.write_text(json.dumps(data))
+
+        with pytest.raises(ValueError, match="Invalid output name"):
+            load_variant_set(variants_file)
+        assert not (output_dir / "x.html").exists()
+
+    def test_generate_variants(self, variants_file, output_dir):
+        out_dir = output_dir / "variants"
+
+        result = CliRunner().invoke(
+            app,
+            ["generate-variants", str(variants_file), "--out-dir", str(out_dir), "--no-pdf"],
+        )
+
+        assert result.exit_code == 1
+        assert "Generated 2 of 3 variants" in result.output
+        assert "broken" in result.output
+        assert "Backend engineer" in (out_dir / "backend.html").read_text()
+        assert (out_dir / "short.html").exists()
+        assert not (out_dir / "broken.html").exists()
+
+
+class TestVariantsApi:
+    """Tests for the /generate-variants endpoint"""
+
+    def test_generate_variants(self, api_request_resume):
+        request = {
+            "resume_data": api_request_resume["resume_data"],
+            "personal_info": api_request_resume["personal_info"],
+            "output_format": "html",
+            "include_timings": True,
+            "variants": [
+                {"name": "backend", "merge": {"professional_summary": "Backend engineer"}},
+                {"name": "short", "patch": [{"op": "remove", "path": "/projects"}]},
+            ],
+        }
+
+        response = TestClient(api_app).post("/generate-variants", json=request)
+
+        assert response.status_code == 200
+        variants = response.json()["variants"]
+        assert list(variants) == ["backend", "short"]
+        assert "Backend engineer" in variants["backend"]["html_content"]
+        assert variants["short"]["pdf_content"] is None
+        assert "overlay" in variants["short"]["timings"]
+        assert "render;dur=" in response.headers["server-timing"]
+
+    def test_duplicate_names(self, api_request_resume):
+        request = {
+            "resume_data": api_request_resume["resume_data"],
+            "personal_info": api_request_resume["personal_info"],
+            "variants": [{"name": "a"}, {"name": "a"}],
+        }
+
+        response = TestClient(api_app).post("/generate-variants", json=request)
+
+        assert response.status_code == 422
+
+    def test_invalid_name(self, api_request_resume):
+        request = {
+            "resume_data": api_request_resume["resume_data"],
+            "personal_info": api_request_resume["personal_info"],
+            "variants": [{"name": "../x"}],
+        }
+
+        response = TestClient(api_app).post("/generate-variants", json=request)
+
+        assert response.status_code == 422
+        assert "Invalid output name" in response.json()["detail"]
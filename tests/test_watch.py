@@ -0,0 +1,141 @@
+"""
+Test suite for watch mode
+"""
+
+import json
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from resumegen.watch import Watcher
+
+
+class RecordingBackend:
+    """PDF backend that records conversions instead of launching Chromium"""
+
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, html_content, pdf_path=None):
+        self.rendered.append(Path(pdf_path).name)
+        Path(pdf_path).write_bytes(b"%PDF-fake")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def watch_dir(output_dir, test_data_dir):
+    source = output_dir / "inputs"
+    source.mkdir()
+    shutil.copy(test_data_dir / "resume_example.json", source / "alice.json")
+    shutil.copy(test_data_dir / "resume_example.json", source / "bob.json")
+    shutil.copy(test_data_dir / "personal_info_example.json", source / "personal_info.json")
+    return source
+
+
+def touch_json(path: Path, **changes):
+    data = json.loads(path.read_text())
+    data.update(changes)
+    path.write_text(json.dumps(data))
+
+
+@pytest.mark.cli
+class TestWatcher:
+    """Tests for incremental regeneration"""
+
+    def test_only_affected_documents_rebuilt(self, watch_dir):
+        backend = RecordingBackend()
+        watcher = Watcher(watch_dir, backend=backend)
+
+        watcher.build(watcher.check())
+        assert sorted(backend.rendered) == ["alice.pdf", "bob.pdf"]
+        assert watcher.check() == []
+
+        touch_json(watch_dir / "alice.json", professional_summary="Changed summary")
+        changed = watcher.check()
+        assert [job.input_path.name for job in changed] == ["alice.json"]
+
+        backend.rendered.clear()
+        watcher.build(changed)
+        assert backend.rendered == ["alice.pdf"]
+        assert "Changed summary" in (watch_dir / "output" / "alice.html").read_text()
+
+    def test_shared_dependency_affects_all(self, watch_dir):
+        watcher = Watcher(watch_dir, backend=RecordingBackend())
+        watcher.build(watcher.check())
+
+        touch_json(watch_dir / "personal_info.json", city="Berlin")
+
+        assert len(watcher.check()) == 2
+
+    def test_inlined_asset_is_a_dependency(self, watch_dir, output_dir, monkeypatch):
+        from resumegen import assets
+
+        (output_dir / "photo.png").write_bytes(b"\x89PNG one")
+        monkeypatch.setattr(assets, "ASSET_DIR", str(output_dir))
+        touch_json(watch_dir / "alice.json", professional_summary="photo.png")
+        watcher = Watcher(watch_dir, backend=RecordingBackend())
+        watcher.build(watcher.check())
+
+        (output_dir / "photo.png").write_bytes(b"\x89PNG changed")
+
+        assert [job.input_path.name for job in watcher.check()] == ["alice.json"]
+
+    def test_pdf_skipped_when_html_unchanged(self, watch_dir):
+        backend = RecordingBackend()
+        watcher = Watcher(watch_dir, backend=backend)
+        watcher.build(watcher.check())
+        backend.rendered.clear()
+
+        # Reformat the JSON without changing its content
+        path = watch_dir / "bob.json"
+        path.write_text(json.dumps(json.loads(path.read_text()), indent=4))
+        results = watcher.build(watcher.check())
+
+        assert backend.rendered == []
+        assert [result.skipped for result in results] == [True]
+
+    def test_failed_pdf_converted_again(self, watch_dir):
+        backend = RecordingBackend()
+        watcher = Watcher(watch_dir, backend=backend)
+        watcher.build(watcher.check())
+        backend.rendered.clear()
+        touch_json(watch_dir / "bob.json", professional_summary="Changed summary")
+        render = backend.render
+
+        def fail(html_content, pdf_path=None):
+            backend.render = render
+            raise RuntimeError("renderer crashed")
+
+        backend.render = fail
+        assert [result.error for result in watcher.build(watcher.check())] == ["renderer crashed"]
+
+        # Reformatting the input renders the same HTML: the stale PDF is replaced this time
+        path = watch_dir / "bob.json"
+        path.write_text(json.dumps(json.loads(path.read_text()), indent=4))
+        results = watcher.build(watcher.check())
+
+        assert backend.rendered == ["bob.pdf"]
+        assert [result.ok for result in results] == [True]
+
+    def test_new_input_is_picked_up(self, watch_dir, test_data_dir):
+        watcher = Watcher(watch_dir, generate_pdfs=False)
+        watcher.build(watcher.check())
+
+        shutil.copy(test_data_dir / "cover_letter_example.json", watch_dir / "letter.json")
+
+        assert [job.input_path.name for job in watcher.check()] == ["letter.json"]
+
+    def test_run_skips_up_to_date_then_stops(self, watch_dir):
+        backend = RecordingBackend()
+        Watcher(watch_dir, backend=backend).build(Watcher(watch_dir).check())
+        backend.rendered.clear()
+
+        stop = threading.Event()
+        stop.set()
+        Watcher(watch_dir, backend=backend).run(stop)
+
+        assert backend.rendered == []